@@ -0,0 +1,230 @@
+"""
+Load test the game service read endpoints with many keep-alive clients.
+
+Compares the Flask development server, which runs the sync Blueprint in a
+thread per connection and closes connections after every response, with
+uvicorn serving the asyncio variant.
+
+Usage:
+    python -m benchmarks.bench_asgi --games 20000 --connections 1000
+"""
+
+import argparse
+import asyncio
+import csv
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from benchmarks.bench_server import HOST, wait_for_port
+from services.common.arg_parser import configure_logging
+
+logger = logging.getLogger(__name__)
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+REQUEST_TIMEOUT = 10
+
+
+def write_dataset(path: str, games: int) -> None:
+    """
+    Write a games dataset with the columns of the BoardGameGeek dataset.
+
+    Args:
+        path (str): The path of the CSV file.
+        games (int): The number of games.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as dataset_file:
+        writer = csv.writer(dataset_file)
+        writer.writerow(["BGGId", "Name"])
+        writer.writerows(
+            [game_id, f"Game {game_id}"] for game_id in range(1, games + 1)
+        )
+
+
+async def read_response(reader: asyncio.StreamReader) -> Tuple[int, bool]:
+    """
+    Read one HTTP response with a Content-Length header.
+
+    Args:
+        reader (asyncio.StreamReader): The stream of the connection.
+
+    Returns:
+        Tuple[int, bool]: The status code and whether the server keeps the
+            connection open.
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    length = 0
+    keep_alive = True
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+        elif name.lower() == "connection":
+            keep_alive = value.strip().lower() != "close"
+    await reader.readexactly(length)
+    return int(lines[0].split(" ")[1]), keep_alive
+
+
+async def request(
+    connection: Optional[Connection], port: int, path: str
+) -> Tuple[int, Optional[Connection]]:
+    """
+    Send one request, opening a new connection if there is none.
+
+    Args:
+        connection (Optional[Connection]): The open connection, if any.
+        port (int): The port of the game service.
+        path (str): The requested path.
+
+    Returns:
+        Tuple[int, Optional[Connection]]: The status code and the connection,
+            or None if the server closed it.
+    """
+    if connection is None:
+        connection = await asyncio.open_connection(HOST, port)
+    reader, writer = connection
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode())
+    status, keep_alive = await read_response(reader)
+    if not keep_alive:
+        writer.close()
+        connection = None
+    return status, connection
+
+
+async def run_client(
+    port: int, games: int, deadline: float, generator: random.Random
+) -> Tuple[List[float], int]:
+    """
+    Request games and pages of games, keeping the connection open if allowed.
+
+    Args:
+        port (int): The port of the game service.
+        games (int): The number of games in the catalog.
+        deadline (float): The time.perf_counter() value to stop at.
+        generator (random.Random): Chooses the requested games and pages.
+
+    Returns:
+        Tuple[List[float], int]: The latencies of the successful requests in
+            seconds and the number of failed requests.
+    """
+    latencies = []
+    failures = 0
+    connection = None
+    while time.perf_counter() < deadline:
+        if generator.random() < 0.5:
+            path = f"/games/{generator.randint(1, games)}"
+        else:
+            path = f"/games?page={generator.randint(1, 100)}&limit=10"
+        start = time.perf_counter()
+        try:
+            status, connection = await asyncio.wait_for(
+                request(connection, port, path), REQUEST_TIMEOUT
+            )
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            failures += 1
+            if connection is not None:
+                connection[1].close()
+            connection = None
+            continue
+        if status == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            failures += 1
+
+    if connection is not None:
+        connection[1].close()
+    return latencies, failures
+
+
+async def load_test(
+    port: int, games: int, connections: int, seconds: float
+) -> Tuple[List[float], int]:
+    """
+    Run many connections concurrently.
+
+    Args:
+        port (int): The port of the game service.
+        games (int): The number of games in the catalog.
+        connections (int): The number of concurrent connections.
+        seconds (float): The duration of the test.
+
+    Returns:
+        Tuple[List[float], int]: The latencies of all successful requests and
+            the number of failed requests.
+    """
+    deadline = time.perf_counter() + seconds
+    results = await asyncio.gather(
+        *(
+            run_client(port, games, deadline, random.Random(number))
+            for number in range(connections)
+        )
+    )
+    latencies = [latency for result in results for latency in result[0]]
+    return latencies, sum(result[1] for result in results)
+
+
+def main() -> None:
+    """Load test the game service with each server."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=20_000, help="Games.")
+    parser.add_argument(
+        "--connections", type=int, default=1000, help="Concurrent connections."
+    )
+    parser.add_argument("--seconds", type=float, default=10, help="Duration per run.")
+    parser.add_argument(
+        "--threads", type=int, default=8, help="Threads of uvicorn for Flask requests."
+    )
+    parser.add_argument("--port", type=int, default=5098, help="Port of the service.")
+    args = parser.parse_args()
+    configure_logging(verbose=False)
+    logger.info(f"Running on {os.cpu_count()} CPUs")
+
+    configurations = {
+        "flask (sync Blueprint)": ["--server", "flask"],
+        f"uvicorn (asyncio, {args.threads} threads)": [
+            "--server",
+            "uvicorn",
+            "--threads",
+            str(args.threads),
+        ],
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        dataset_path = os.path.join(directory, "games.csv")
+        write_dataset(dataset_path, args.games)
+        for name, server_args in configurations.items():
+            database_url = f"sqlite:///{os.path.join(directory, 'games.db')}"
+            command = [sys.executable, "-m", "services.game_service.app"]
+            command += ["--host", HOST, "--port", str(args.port)]
+            command += ["--games_dataset", dataset_path, "--database_url", database_url]
+            process = subprocess.Popen(
+                command + server_args,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_for_port(args.port, timeout=120)
+                latencies, failures = asyncio.run(
+                    load_test(args.port, args.games, args.connections, args.seconds)
+                )
+            finally:
+                process.terminate()
+                process.wait()
+
+            quantiles = statistics.quantiles(latencies, n=100)
+            logger.info(
+                f"{name}: {len(latencies) / args.seconds:.0f} requests/s, "
+                f"median {statistics.median(latencies) * 1e3:.1f} ms, "
+                f"p99 {quantiles[98] * 1e3:.1f} ms, {failures} failures"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Measure favorite lookups with and without the favorite_games indexes.
+
+Usage:
+    python -m benchmarks.bench_favorite_lookups --rows 1000000
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from services.common.arg_parser import configure_logging
+from services.user_service.app import create_app, setup_database
+from services.user_service.database.database import db
+
+logger = logging.getLogger(__name__)
+
+LEGACY_SCHEMA = (
+    "CREATE TABLE users (user_id INTEGER PRIMARY KEY, "
+    "username VARCHAR(80) NOT NULL UNIQUE)",
+    "CREATE TABLE favorite_games (favorite_id INTEGER PRIMARY KEY, "
+    "user_id INTEGER NOT NULL REFERENCES users (user_id), game_id INTEGER NOT NULL)",
+)
+
+
+def fill_legacy_database(
+    engine: Engine, rows: int, favorites_per_user: int, games: int
+) -> None:
+    """
+    Create the schema without indexes and insert random favorites.
+
+    Args:
+        engine (Engine): The engine of the database.
+        rows (int): The number of favorites.
+        favorites_per_user (int): The number of favorites of each user.
+        games (int): The number of distinct games.
+    """
+    users = rows // favorites_per_user
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.execute(text(statement))
+        connection.execute(
+            text("INSERT INTO users VALUES (:user_id, :username)"),
+            [
+                {"user_id": user_id, "username": f"user{user_id}"}
+                for user_id in range(1, users + 1)
+            ],
+        )
+        favorites = (
+            {"user_id": user_id, "game_id": game_id}
+            for user_id in range(1, users + 1)
+            for game_id in random.sample(range(1, games + 1), favorites_per_user)
+        )
+        insert = text(
+            "INSERT INTO favorite_games (user_id, game_id) VALUES (:user_id, :game_id)"
+        )
+        batch = []
+        for favorite in favorites:
+            batch.append(favorite)
+            if len(batch) == 100_000:
+                connection.execute(insert, batch)
+                batch = []
+        if batch:
+            connection.execute(insert, batch)
+
+
+def measure(name: str, lookup: Callable[[int], object], keys: List[int]) -> None:
+    """
+    Log the median and 99th percentile latency of a lookup.
+
+    Args:
+        name (str): The name of the lookup in the log.
+        lookup (Callable[[int], object]): Runs one lookup for a key.
+        keys (List[int]): The keys to look up.
+    """
+    latencies = []
+    for key in keys:
+        start = time.perf_counter()
+        lookup(key)
+        latencies.append(time.perf_counter() - start)
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    logger.info(
+        f"{name}: median {statistics.median(latencies) * 1e6:.0f} us, "
+        f"p99 {quantiles[98] * 1e6:.0f} us"
+    )
+
+
+def run_lookups(
+    engine: Engine, label: str, users: int, games: int, queries: int
+) -> None:
+    """
+    Measure the lookups of favorites by user, by game and of single favorites.
+
+    Args:
+        engine (Engine): The engine of the database.
+        label (str): The name of the schema in the log.
+        users (int): The number of users.
+        games (int): The number of games.
+        queries (int): The number of lookups of each kind.
+    """
+    user_ids = [random.randint(1, users) for _ in range(queries)]
+    game_ids = [random.randint(1, games) for _ in range(queries)]
+    with engine.connect() as connection:
+        measure(
+            f"{label} favorites of user",
+            lambda user_id: connection.execute(
+                text("SELECT game_id FROM favorite_games WHERE user_id = :id"),
+                {"id": user_id},
+            ).all(),
+            user_ids,
+        )
+        measure(
+            f"{label} users of game",
+            lambda game_id: connection.execute(
+                text("SELECT user_id FROM favorite_games WHERE game_id = :id"),
+                {"id": game_id},
+            ).all(),
+            game_ids,
+        )
+        measure(
+            f"{label} favorite exists",
+            lambda user_id: connection.execute(
+                text(
+                    "SELECT 1 FROM favorite_games "
+                    "WHERE user_id = :user_id AND game_id = :game_id"
+                ),
+                {"user_id": user_id, "game_id": 1},
+            ).first(),
+            user_ids,
+        )
+
+
+def main() -> None:
+    """Run the benchmark on a temporary SQLite database."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Favorites.")
+    parser.add_argument(
+        "--favorites_per_user", type=int, default=10, help="Favorites of each user."
+    )
+    parser.add_argument("--games", type=int, default=20_000, help="Distinct games.")
+    parser.add_argument(
+        "--queries", type=int, default=200, help="Lookups of each kind."
+    )
+    args = parser.parse_args()
+    configure_logging(verbose=False)
+
+    users = args.rows // args.favorites_per_user
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, "users.db")
+        database_url = f"sqlite:///{database_path}"
+
+        start = time.perf_counter()
+        engine = create_engine(database_url)
+        fill_legacy_database(engine, args.rows, args.favorites_per_user, args.games)
+        logger.info(
+            f"Inserted {args.rows} favorites of {users} users "
+            f"in {time.perf_counter() - start:.1f} s"
+        )
+        run_lookups(engine, "legacy", users, args.games, args.queries)
+        engine.dispose()
+
+        start = time.perf_counter()
+        app = create_app(database_url)
+        setup_database(app)
+        logger.info(f"Migrated the database in {time.perf_counter() - start:.1f} s")
+
+        engine = create_engine(database_url)
+        run_lookups(engine, "indexed", users, args.games, args.queries)
+        engine.dispose()
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Compare adding favorites with a commit per request and with group commit.
+
+Every client process adds random favorites over its own connection to the
+user service, which runs in a separate process on a file database. Each
+mode is measured with synchronous=FULL, where every commit waits for an
+fsync, and with the service default synchronous=NORMAL.
+
+Usage:
+    python -m benchmarks.bench_group_commit --clients 16 --seconds 5
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import multiprocessing
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+from sqlalchemy import insert
+
+from benchmarks.bench_server import HOST, wait_for_port
+from services.common.arg_parser import configure_logging
+from services.user_service.app import create_app, setup_database
+from services.user_service.database.database import db
+from services.user_service.database.models import User
+
+logger = logging.getLogger(__name__)
+
+
+def run_client(
+    port: int, users: int, seconds: float, seed: int
+) -> Tuple[List[float], int]:
+    """
+    Add random favorites for a while.
+
+    Args:
+        port (int): The port of the user service.
+        users (int): The number of users.
+        seconds (float): The duration of the run.
+        seed (int): Seeds the choice of users and games.
+
+    Returns:
+        Tuple[List[float], int]: The latencies of the answered requests in
+            seconds and the number of requests that failed with a 5xx status.
+    """
+    generator = random.Random(seed)
+    connection = http.client.HTTPConnection(HOST, port, timeout=30)
+    latencies = []
+    failures = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        body = json.dumps({"game_id": generator.randint(1, 1_000_000)})
+        start = time.perf_counter()
+        connection.request(
+            "POST",
+            f"/users/{generator.randint(1, users)}/favorites",
+            body,
+            {"Content-Type": "application/json"},
+        )
+        response = connection.getresponse()
+        response.read()
+        if response.status >= 500:
+            failures += 1
+        else:
+            latencies.append(time.perf_counter() - start)
+    connection.close()
+    return latencies, failures
+
+
+def measure(
+    name: str, server_args: List[str], database_url: str, args: argparse.Namespace
+) -> None:
+    """
+    Start the user service and add favorites with concurrent clients.
+
+    Args:
+        name (str): The name of the configuration in the log.
+        server_args (List[str]): Additional arguments of the user service.
+        database_url (str): The database of the user service.
+        args (argparse.Namespace): The parsed benchmark arguments.
+    """
+    command = [sys.executable, "-m", "services.user_service.app"]
+    command += ["--host", HOST, "--port", str(args.port)]
+    command += ["--database_url", database_url]
+    process = subprocess.Popen(
+        command + server_args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port(args.port)
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.starmap(
+                run_client,
+                [
+                    (args.port, args.users, args.seconds, seed)
+                    for seed in range(args.clients)
+                ],
+            )
+    finally:
+        process.terminate()
+        process.wait()
+
+    latencies = [latency for result in results for latency in result[0]]
+    failures = sum(result[1] for result in results)
+    quantiles = statistics.quantiles(latencies, n=100)
+    logger.info(
+        f"{name}: {len(latencies) / args.seconds:.0f} favorites/s, "
+        f"median {statistics.median(latencies) * 1e3:.1f} ms, "
+        f"p99 {quantiles[98] * 1e3:.1f} ms, {failures} failures"
+    )
+
+
+def main() -> None:
+    """Measure both commit modes with both synchronous settings."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000, help="Users.")
+    parser.add_argument(
+        "--clients", type=int, default=16, help="Concurrent client processes."
+    )
+    parser.add_argument("--seconds", type=float, default=5, help="Duration per run.")
+    parser.add_argument("--port", type=int, default=5096, help="Port of the service.")
+    args = parser.parse_args()
+    configure_logging(verbose=False)
+    logger.info(f"Running on {os.cpu_count()} CPUs")
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'users.db')}"
+        app = create_app(database_url)
+        setup_database(app)
+        with app.app_context():
+            db.session.execute(
+                insert(User),
+                [{"username": f"user{number}"} for number in range(args.users)],
+            )
+            db.session.commit()
+            db.engine.dispose()
+
+        for synchronous in ("full", "normal"):
+            for name, mode_args in (
+                ("commit per request", []),
+                ("group commit", ["--group_commit"]),
+            ):
+                measure(
+                    f"{name}, synchronous={synchronous}",
+                    mode_args + ["--sqlite_synchronous", synchronous],
+                    database_url,
+                    args,
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Measure the time to encode game list responses with each JSON provider.
+
+Responses shaped like a page of the game service, with games of realistic
+names, are encoded like jsonify does by Flask's default provider, the json
+provider and the orjson provider. The outputs are checked to be identical.
+For streamed responses the time until the first chunk of games is
+reported as well.
+
+Usage:
+    python -m benchmarks.bench_json --sizes 10 100 1000 10000
+"""
+
+import argparse
+import logging
+import os
+import time
+from typing import Callable, Dict, List
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+from services.common.arg_parser import configure_logging
+from services.common.json_provider import (
+    JSON_PROVIDERS,
+    STREAM_CHUNK_ITEMS,
+    configure_json_provider,
+)
+
+logger = logging.getLogger(__name__)
+
+NAMES = ["The Legend of Zelda", "Pokémon Red", "Ōkami", "Half-Life 2", "Tetris"]
+
+
+def build_response(size: int) -> Dict:
+    """
+    Build the data of a game list response.
+
+    Args:
+        size (int): The number of games.
+
+    Returns:
+        Dict: The response data.
+    """
+    games = [
+        {"id": number, "name": f"{NAMES[number % len(NAMES)]} {number}"}
+        for number in range(1, size + 1)
+    ]
+    return {"games": games, "page": 1, "total_pages": 1}
+
+
+def measure_seconds(function: Callable[[], object], seconds: float) -> float:
+    """
+    Call a function repeatedly and return the average duration of a call.
+
+    Args:
+        function (Callable[[], object]): The function to call.
+        seconds (float): The minimum duration of the measurement.
+
+    Returns:
+        float: Seconds per call.
+    """
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        function()
+        calls += 1
+    return (time.perf_counter() - start) / calls
+
+
+def read_first_games(response: Response) -> bytes:
+    """
+    Read a streamed response until its first chunk of games.
+
+    Args:
+        response (Response): The streamed response.
+
+    Returns:
+        bytes: The first chunk holding games.
+    """
+    return next(chunk for chunk in response.response if b'"id"' in chunk)
+
+
+def main() -> None:
+    """Encode responses of each size with each provider."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000, 10000],
+        help="Games per response.",
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=1, help="Duration per measurement."
+    )
+    args = parser.parse_args()
+    configure_logging(verbose=False)
+    logger.info(f"Running on {os.cpu_count()} CPUs")
+
+    # Providers only keep a weak reference to their app.
+    apps = {name: Flask(__name__) for name in ("flask",) + JSON_PROVIDERS}
+    providers: Dict[str, DefaultJSONProvider] = {
+        "flask": DefaultJSONProvider(apps["flask"])
+    }
+    for name in JSON_PROVIDERS:
+        configure_json_provider(apps[name], name, stream_min_items=0)
+        providers[name] = apps[name].json
+    streaming_app = Flask(__name__)
+    configure_json_provider(streaming_app, "orjson", stream_min_items=1)
+
+    for size in args.sizes:
+        data = build_response(size)
+        expected = providers["flask"].response(data).get_data()
+        results: List[str] = []
+        for name, provider in providers.items():
+            if provider.response(data).get_data() != expected:
+                raise AssertionError(f"{name} output differs for {size} games")
+            seconds = measure_seconds(
+                lambda: provider.response(data).get_data(), args.seconds
+            )
+            results.append(f"{name} {seconds * 1e6:.0f} µs")
+
+        streamed = streaming_app.json.response(data)
+        if b"".join(streamed.response) != expected:
+            raise AssertionError(f"streamed output differs for {size} games")
+        first_games = measure_seconds(
+            lambda: read_first_games(streaming_app.json.response(data)), args.seconds
+        )
+        results.append(
+            f"orjson streamed, first {STREAM_CHUNK_ITEMS} games "
+            f"{first_games * 1e6:.0f} µs"
+        )
+        logger.info(f"{size} games, {len(expected)} bytes: " + ", ".join(results))
+
+
+if __name__ == "__main__":
+    main()
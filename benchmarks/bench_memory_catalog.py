@@ -0,0 +1,202 @@
+"""
+Measure GET /games/<id> served from the database and from the in-memory catalog.
+
+Each way of reading a game is timed on a single thread in process: the
+service method, the ASGI app without a network connection, and the Flask
+app through its test client. Finally uvicorn is load tested over HTTP with
+the in-memory catalog. The service logs every request at INFO level, so the
+ASGI app is also timed with the service loggers set to WARNING.
+
+Usage:
+    python -m benchmarks.bench_memory_catalog --games 100000 --seconds 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+from benchmarks.bench_asgi import request, write_dataset
+from benchmarks.bench_server import HOST, wait_for_port
+from services.common.arg_parser import configure_logging
+from services.game_service.app import create_app, setup_database
+from services.game_service.asgi import GameServiceASGI
+from services.game_service.game_service import GameService, configure_game_cache
+from services.game_service.utils.memory_catalog import (
+    disable_memory_catalog,
+    enable_memory_catalog,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def measure_rate(name: str, read: Callable[[int], object], game_ids: List[int]) -> None:
+    """
+    Log how many reads per second a single thread performs.
+
+    Args:
+        name (str): The name of the read in the log.
+        read (Callable[[int], object]): Reads the game with the given ID.
+        game_ids (List[int]): The IDs read one after the other.
+    """
+    start = time.perf_counter()
+    for game_id in game_ids:
+        read(game_id)
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"{name}: {len(game_ids) / elapsed:,.0f} reads/s "
+        f"({elapsed / len(game_ids) * 1e6:.1f} us per read)"
+    )
+
+
+def call_asgi(asgi_app: GameServiceASGI, game_id: int) -> None:
+    """
+    Send GET /games/<id> to the ASGI app without a server.
+
+    Args:
+        asgi_app (GameServiceASGI): The ASGI app.
+        game_id (int): The ID of the requested game.
+    """
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "path": f"/games/{game_id}",
+        "query_string": b"",
+        "headers": [],
+    }
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        pass
+
+    coroutine = asgi_app(scope, receive, send)
+    try:
+        coroutine.send(None)
+    except StopIteration:
+        return
+    raise RuntimeError("The request was not answered without waiting")
+
+
+async def load_test(port: int, games: int, connections: int, seconds: float) -> int:
+    """
+    Request random games over keep-alive connections.
+
+    Args:
+        port (int): The port of the game service.
+        games (int): The number of games in the catalog.
+        connections (int): The number of concurrent connections.
+        seconds (float): The duration of the test.
+
+    Returns:
+        int: The number of successful requests.
+    """
+    deadline = time.perf_counter() + seconds
+
+    async def run_client(generator: random.Random) -> int:
+        successes = 0
+        connection = None
+        while time.perf_counter() < deadline:
+            path = f"/games/{generator.randint(1, games)}"
+            status, connection = await request(connection, port, path)
+            successes += status == 200
+        if connection is not None:
+            connection[1].close()
+        return successes
+
+    results = await asyncio.gather(
+        *(run_client(random.Random(number)) for number in range(connections))
+    )
+    return sum(results)
+
+
+def main() -> None:
+    """Compare the reads of a game with and without the in-memory catalog."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=100_000, help="Games.")
+    parser.add_argument("--reads", type=int, default=50_000, help="Reads per run.")
+    parser.add_argument(
+        "--connections", type=int, default=50, help="Concurrent HTTP connections."
+    )
+    parser.add_argument("--seconds", type=float, default=5, help="HTTP test duration.")
+    parser.add_argument("--port", type=int, default=5097, help="Port of the service.")
+    args = parser.parse_args()
+    configure_logging(verbose=False)
+    logger.info(f"Running on {os.cpu_count()} CPUs")
+
+    generator = random.Random(0)
+    game_ids = [generator.randint(1, args.games) for _ in range(args.reads)]
+    with tempfile.TemporaryDirectory() as directory:
+        dataset_path = os.path.join(directory, "games.csv")
+        database_url = f"sqlite:///{os.path.join(directory, 'games.db')}"
+        write_dataset(dataset_path, args.games)
+
+        app = create_app(database_url)
+        setup_database(app, dataset_path)
+        client = app.test_client()
+        service = GameService()
+        with app.app_context():
+            configure_game_cache(0, None)
+            measure_rate("database, no cache", service.get_game, game_ids)
+            configure_game_cache(args.games, None)
+            for game_id in game_ids:
+                service.get_game(game_id)
+            measure_rate("database, warm cache", service.get_game, game_ids)
+
+            enable_memory_catalog()
+            measure_rate("memory catalog", service.get_game, game_ids)
+
+        asgi_app = GameServiceASGI(app, database_url, threads=1)
+        measure_rate(
+            "memory catalog, ASGI app",
+            lambda game_id: call_asgi(asgi_app, game_id),
+            game_ids,
+        )
+        service_logger = logging.getLogger("services")
+        service_logger.setLevel(logging.WARNING)
+        measure_rate(
+            "memory catalog, ASGI app, no request logging",
+            lambda game_id: call_asgi(asgi_app, game_id),
+            game_ids,
+        )
+        service_logger.setLevel(logging.NOTSET)
+        measure_rate(
+            "memory catalog, Flask app",
+            lambda game_id: client.get(f"/games/{game_id}"),
+            game_ids[: args.reads // 10],
+        )
+        asgi_app.executor.shutdown()
+        disable_memory_catalog()
+
+        command = [sys.executable, "-m", "services.game_service.app"]
+        command += ["--host", HOST, "--port", str(args.port), "--server", "uvicorn"]
+        command += ["--games_dataset", dataset_path, "--database_url", database_url]
+        process = subprocess.Popen(
+            command + ["--memory_catalog"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_port(args.port, timeout=120)
+            successes = asyncio.run(
+                load_test(args.port, args.games, args.connections, args.seconds)
+            )
+        finally:
+            process.terminate()
+            process.wait()
+        logger.info(
+            f"memory catalog, uvicorn over HTTP: {successes / args.seconds:,.0f} "
+            f"requests/s with {args.connections} connections"
+        )
+
+
+if __name__ == "__main__":
+    main()
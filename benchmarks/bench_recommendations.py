@@ -0,0 +1,87 @@
+"""
+Measure building the recommender and serving recommendations.
+
+Usage:
+    python -m benchmarks.bench_recommendations --users 100000 --games 20000
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+import numpy as np
+
+from services.common.arg_parser import configure_logging
+from services.user_service.utils.recommender import ItemSimilarityRecommender
+
+logger = logging.getLogger(__name__)
+
+
+def random_favorites(
+    users: int, games: int, favorites_per_user: int, seed: int = 0
+) -> np.ndarray:
+    """
+    Draw favorites where game popularity follows a power law.
+
+    Args:
+        users (int): The number of users.
+        games (int): The number of games.
+        favorites_per_user (int): The mean number of favorites of a user.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        np.ndarray: Unique (user_id, game_id) rows.
+    """
+    generator = np.random.default_rng(seed)
+    popularity = 1 / np.arange(1, games + 1) ** 0.8
+    popularity /= popularity.sum()
+
+    counts = generator.poisson(favorites_per_user, users)
+    user_ids = np.repeat(np.arange(1, users + 1), counts)
+    game_ids = generator.choice(np.arange(1, games + 1), len(user_ids), p=popularity)
+    return np.unique(np.column_stack((user_ids, game_ids)), axis=0)
+
+
+def main() -> None:
+    """Build the recommender on random favorites and time recommendations."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000, help="Users.")
+    parser.add_argument("--games", type=int, default=20_000, help="Games.")
+    parser.add_argument(
+        "--favorites_per_user", type=int, default=20, help="Mean favorites per user."
+    )
+    parser.add_argument(
+        "--queries", type=int, default=1000, help="Recommendation requests."
+    )
+    args = parser.parse_args()
+    configure_logging(verbose=False)
+
+    favorites = random_favorites(args.users, args.games, args.favorites_per_user)
+    logger.info(f"Generated {len(favorites)} favorites")
+
+    start = time.perf_counter()
+    recommender = ItemSimilarityRecommender.from_favorites(
+        favorites[:, 0], favorites[:, 1]
+    )
+    logger.info(f"Built the recommender in {time.perf_counter() - start:.1f} s")
+
+    user_starts = np.searchsorted(favorites[:, 0], np.arange(1, args.users + 2))
+    generator = np.random.default_rng(1)
+    latencies = []
+    for user_id in generator.integers(1, args.users + 1, args.queries):
+        first, end = user_starts[user_id - 1], user_starts[user_id]
+        game_ids = favorites[first:end, 1]
+        start = time.perf_counter()
+        recommender.recommend(game_ids.tolist(), limit=10)
+        latencies.append(time.perf_counter() - start)
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    logger.info(
+        f"Recommendations: median {statistics.median(latencies) * 1e3:.2f} ms, "
+        f"p99 {quantiles[98] * 1e3:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
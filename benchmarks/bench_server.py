@@ -0,0 +1,157 @@
+"""
+Compare the throughput of the user service with the flask and gunicorn servers.
+
+Usage:
+    python -m benchmarks.bench_server --workers 4 --threads 4 --clients 16
+"""
+
+import argparse
+import http.client
+import logging
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+from services.common.arg_parser import configure_logging
+
+logger = logging.getLogger(__name__)
+
+HOST = "127.0.0.1"
+
+
+def wait_for_port(port: int, timeout: float = 30) -> None:
+    """
+    Wait until a server accepts connections.
+
+    Args:
+        port (int): The port of the server.
+        timeout (float): The maximum number of seconds to wait.
+
+    Raises:
+        TimeoutError: If the server does not accept connections in time.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Server on port {port} did not start")
+
+
+def run_client(port: int, path: str, seconds: float) -> List[float]:
+    """
+    Send requests over one keep-alive connection for a while.
+
+    Args:
+        port (int): The port of the server.
+        path (str): The requested path.
+        seconds (float): The duration of the run.
+
+    Returns:
+        List[float]: The latency of every request in seconds.
+    """
+    connection = http.client.HTTPConnection(HOST, port, timeout=10)
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        connection.request("GET", path)
+        connection.getresponse().read()
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+    return latencies
+
+
+def measure_server(
+    server_args: List[str], port: int, database_url: str, args: argparse.Namespace
+) -> Tuple[float, float]:
+    """
+    Start the user service and measure it with concurrent clients.
+
+    Args:
+        server_args (List[str]): The server arguments of the user service.
+        port (int): The port of the user service.
+        database_url (str): The database of the user service.
+        args (argparse.Namespace): The parsed benchmark arguments.
+
+    Returns:
+        Tuple[float, float]: Requests per second and the median latency in ms.
+    """
+    command = [sys.executable, "-m", "services.user_service.app"]
+    command += ["--host", HOST, "--port", str(port), "--database_url", database_url]
+    process = subprocess.Popen(
+        command + server_args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port(port)
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.starmap(
+                run_client, [(port, args.path, args.seconds)] * args.clients
+            )
+    finally:
+        process.terminate()
+        process.wait()
+
+    latencies = [latency for result in results for latency in result]
+    return len(latencies) / args.seconds, statistics.median(latencies) * 1e3
+
+
+def main() -> None:
+    """Measure the flask development server and gunicorn one after the other."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4, help="Gunicorn workers.")
+    parser.add_argument("--threads", type=int, default=4, help="Gunicorn threads.")
+    parser.add_argument(
+        "--clients", type=int, default=16, help="Concurrent client connections."
+    )
+    parser.add_argument("--seconds", type=float, default=10, help="Duration per run.")
+    parser.add_argument(
+        "--path", type=str, default="/users/search?prefix=u", help="Requested path."
+    )
+    parser.add_argument("--port", type=int, default=5099, help="Port of the service.")
+    args = parser.parse_args()
+    configure_logging(verbose=False)
+    logger.info(f"Running on {os.cpu_count()} CPUs")
+
+    configurations = {
+        "flask": ["--server", "flask"],
+        f"gunicorn {args.workers}x{args.threads}": [
+            "--server",
+            "gunicorn",
+            "--workers",
+            str(args.workers),
+            "--threads",
+            str(args.threads),
+        ],
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'users.db')}"
+        from services.user_service.app import create_app, setup_database
+        from services.user_service.user_service import UserService
+
+        app = create_app(database_url)
+        setup_database(app)
+        with app.app_context():
+            for number in range(100):
+                UserService().create_user(f"user{number}")
+
+        for name, server_args in configurations.items():
+            requests_per_second, median = measure_server(
+                server_args, args.port, database_url, args
+            )
+            logger.info(
+                f"{name}: {requests_per_second:.0f} requests/s, "
+                f"median {median:.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
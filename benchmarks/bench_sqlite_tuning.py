@@ -0,0 +1,192 @@
+"""
+Measure concurrent reads and writes of favorites with and without SQLite tuning.
+
+Reader threads list the favorites of random users while writer threads add
+favorites, all through the Flask app of the user service on one file
+database. The untuned run uses SQLite's defaults (rollback journal, full
+synchronous writes) and SQLAlchemy's default pool, the tuned run the
+defaults of the service (WAL, synchronous=NORMAL, memory mapping, a larger
+page cache and pre-ping).
+
+Usage:
+    python -m benchmarks.bench_sqlite_tuning --readers 8 --writers 2 --seconds 10
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import insert
+
+from services.common.arg_parser import configure_logging
+from services.common.config import (
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_PRE_PING,
+    DATABASE_POOL_RECYCLE,
+    DATABASE_POOL_SIZE,
+    SQLITE_BUSY_TIMEOUT,
+    SQLITE_CACHE_SIZE,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SYNCHRONOUS,
+)
+from services.common.engine import configure_database
+from services.user_service.app import create_app, setup_database
+from services.user_service.database.database import db
+from services.user_service.database.models import FavoriteGame, User
+
+logger = logging.getLogger(__name__)
+
+UNTUNED = argparse.Namespace(
+    pool_size=5,
+    max_overflow=10,
+    pool_recycle=-1,
+    pool_pre_ping=False,
+    sqlite_journal_mode="",
+    sqlite_synchronous="",
+    sqlite_mmap_size=0,
+    sqlite_cache_size=-2000,
+    sqlite_busy_timeout=5000,
+)
+TUNED = argparse.Namespace(
+    pool_size=DATABASE_POOL_SIZE,
+    max_overflow=DATABASE_MAX_OVERFLOW,
+    pool_recycle=DATABASE_POOL_RECYCLE,
+    pool_pre_ping=DATABASE_POOL_PRE_PING,
+    sqlite_journal_mode=SQLITE_JOURNAL_MODE,
+    sqlite_synchronous=SQLITE_SYNCHRONOUS,
+    sqlite_mmap_size=SQLITE_MMAP_SIZE,
+    sqlite_cache_size=SQLITE_CACHE_SIZE,
+    sqlite_busy_timeout=SQLITE_BUSY_TIMEOUT,
+)
+
+
+def run_worker(
+    app, write: bool, users: int, games: int, deadline: float, seed: int
+) -> Dict[str, List[float]]:
+    """
+    Send requests until the deadline.
+
+    Args:
+        app (Flask): The user service app.
+        write (bool): Add favorites instead of listing them.
+        users (int): The number of users.
+        games (int): The number of distinct games.
+        deadline (float): The time.perf_counter() value to stop at.
+        seed (int): Seeds the choice of users and games.
+
+    Returns:
+        Dict[str, List[float]]: The latencies of the successful requests and
+            the statuses of the failed ones.
+    """
+    generator = random.Random(seed)
+    client = app.test_client()
+    latencies = []
+    failures = []
+    while time.perf_counter() < deadline:
+        path = f"/users/{generator.randint(1, users)}/favorites"
+        start = time.perf_counter()
+        if write:
+            response = client.post(path, json={"game_id": generator.randint(1, games)})
+        else:
+            response = client.get(path)
+        if response.status_code in (200, 409):
+            latencies.append(time.perf_counter() - start)
+        else:
+            failures.append(response.status_code)
+    return {"latencies": latencies, "failures": failures}
+
+
+def measure(
+    name: str, database_args: argparse.Namespace, args: argparse.Namespace
+) -> None:
+    """
+    Fill a new database and run readers and writers against it concurrently.
+
+    Args:
+        name (str): The name of the configuration in the log.
+        database_args (argparse.Namespace): The engine and pragma arguments.
+        args (argparse.Namespace): The parsed benchmark arguments.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app(f"sqlite:///{os.path.join(directory, 'users.db')}")
+        configure_database(app, database_args)
+        setup_database(app)
+        generator = random.Random(0)
+        with app.app_context():
+            db.session.execute(
+                insert(User),
+                [{"username": f"user{number}"} for number in range(args.users)],
+            )
+            db.session.execute(
+                insert(FavoriteGame),
+                [
+                    {"user_id": user_id, "game_id": game_id}
+                    for user_id in range(1, args.users + 1)
+                    for game_id in generator.sample(range(1, args.games + 1), 10)
+                ],
+            )
+            db.session.commit()
+
+        deadline = time.perf_counter() + args.seconds
+        workers = args.readers + args.writers
+        results: List[Dict[str, List[float]]] = [{}] * workers
+
+        def run(number: int) -> None:
+            write = number < args.writers
+            results[number] = run_worker(
+                app, write, args.users, args.games, deadline, number
+            )
+
+        threads = [
+            threading.Thread(target=run, args=(number,)) for number in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with app.app_context():
+            db.engine.dispose()
+
+    writers = args.writers
+    for kind, kind_results in (
+        ("writes", results[:writers]),
+        ("reads", results[writers:]),
+    ):
+        latencies = [
+            latency for result in kind_results for latency in result["latencies"]
+        ]
+        failures = sum(len(result["failures"]) for result in kind_results)
+        quantiles = statistics.quantiles(latencies, n=100)
+        logger.info(
+            f"{name} {kind}: {len(latencies) / args.seconds:.0f}/s, "
+            f"median {statistics.median(latencies) * 1e3:.2f} ms, "
+            f"p99 {quantiles[98] * 1e3:.2f} ms, {failures} failures"
+        )
+
+
+def main() -> None:
+    """Run the mixed workload with the untuned and the tuned configuration."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000, help="Users.")
+    parser.add_argument("--games", type=int, default=20_000, help="Distinct games.")
+    parser.add_argument("--readers", type=int, default=8, help="Reader threads.")
+    parser.add_argument("--writers", type=int, default=2, help="Writer threads.")
+    parser.add_argument("--seconds", type=float, default=10, help="Duration per run.")
+    args = parser.parse_args()
+    configure_logging(verbose=False)
+    logging.getLogger("services").setLevel(logging.WARNING)
+    logger.info(f"Running on {os.cpu_count()} CPUs")
+
+    measure("untuned", UNTUNED, args)
+    measure("tuned", TUNED, args)
+
+
+if __name__ == "__main__":
+    main()
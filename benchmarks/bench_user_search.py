@@ -0,0 +1,137 @@
+"""
+Measure username lookups and prefix searches of users.
+
+Usage:
+    python -m benchmarks.bench_user_search --users 1000000
+"""
+
+import argparse
+import logging
+import os
+import random
+import string
+import tempfile
+import time
+
+from sqlalchemy import insert, text
+
+from benchmarks.bench_favorite_lookups import measure
+from services.common.arg_parser import configure_logging
+from services.user_service.app import create_app, setup_database
+from services.user_service.database.database import db
+from services.user_service.database.models import User
+from services.user_service.user_service import UserService
+
+logger = logging.getLogger(__name__)
+
+
+def random_username(generator: random.Random, user_id: int) -> str:
+    """
+    Create a unique username of mixed case letters.
+
+    Args:
+        generator (random.Random): The random generator.
+        user_id (int): The ID of the user, appended to make the name unique.
+
+    Returns:
+        str: The username.
+    """
+    length = generator.randint(4, 10)
+    letters = "".join(generator.choices(string.ascii_letters, k=length))
+    return f"{letters}{user_id}"
+
+
+def fill_users(users: int) -> None:
+    """
+    Insert users with random usernames.
+
+    Args:
+        users (int): The number of users.
+    """
+    generator = random.Random(0)
+    batch = []
+    for user_id in range(1, users + 1):
+        batch.append(
+            {"user_id": user_id, "username": random_username(generator, user_id)}
+        )
+        if len(batch) == 100_000:
+            db.session.execute(insert(User), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(User), batch)
+    db.session.commit()
+
+
+def follow_cursor(prefix: str, pages: int, limit: int) -> None:
+    """
+    Fetch consecutive pages of a prefix search.
+
+    Args:
+        prefix (str): The start of the usernames.
+        pages (int): The number of pages to fetch.
+        limit (int): The number of users per page.
+    """
+    cursor = ""
+    for _ in range(pages):
+        cursor = UserService().search_users(prefix, cursor, limit)["next_cursor"]
+        if cursor is None:
+            return
+
+
+def main() -> None:
+    """Run the benchmark on a temporary SQLite database."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000, help="Users.")
+    parser.add_argument(
+        "--queries", type=int, default=200, help="Lookups of each kind."
+    )
+    parser.add_argument("--limit", type=int, default=20, help="Users per page.")
+    args = parser.parse_args()
+    configure_logging(verbose=False)
+
+    generator = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, "users.db")
+        app = create_app(f"sqlite:///{database_path}")
+        setup_database(app)
+
+        with app.app_context():
+            start = time.perf_counter()
+            fill_users(args.users)
+            logger.info(
+                f"Inserted {args.users} users in {time.perf_counter() - start:.1f} s"
+            )
+
+            user_ids = [generator.randint(1, args.users) for _ in range(args.queries)]
+            usernames = [db.session.get(User, user_id).username for user_id in user_ids]
+            prefixes = [username[:3] for username in usernames]
+
+            measure("username lookup", UserService().get_user_by_username, usernames)
+            measure(
+                "prefix search, first page",
+                lambda prefix: UserService().search_users(prefix, "", args.limit),
+                prefixes,
+            )
+            measure(
+                "prefix search, 10 pages of a 2 letter prefix",
+                lambda prefix: follow_cursor(prefix[:2], 10, args.limit),
+                prefixes[: args.queries // 10],
+            )
+            measure(
+                "LIKE 'x%' without index, first page",
+                lambda prefix: db.session.execute(
+                    text(
+                        "SELECT user_id, username FROM users NOT INDEXED "
+                        "WHERE username LIKE :pattern "
+                        "ORDER BY lower(username), user_id LIMIT :limit"
+                    ),
+                    {"pattern": f"{prefix}%", "limit": args.limit},
+                ).all(),
+                prefixes[: args.queries // 10],
+            )
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
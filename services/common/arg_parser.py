@@ -1,15 +1,209 @@
 import argparse
 import logging
+from typing import Tuple
 
 from .config import (
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_PRE_PING,
+    DATABASE_POOL_RECYCLE,
+    DATABASE_POOL_SIZE,
+    GAME_SERVICE_CATALOG_POLL_SECONDS,
     GAME_SERVICE_DATABASE_URL,
     GAME_SERVICE_DATASET_PATH,
+    GAME_SERVICE_GAME_CACHE_SIZE,
+    GAME_SERVICE_GAME_CACHE_TTL,
     GAME_SERVICE_HOST,
+    GAME_SERVICE_MEMORY_CATALOG,
     GAME_SERVICE_PORT,
+    GAME_SERVICE_RESPONSE_CACHE_BYTES,
+    GAME_SERVICE_RESPONSE_CACHE_SIZE,
+    GAME_SERVICE_SEARCH_INDEX,
+    GAME_SERVICE_SERVER,
+    GAME_SERVICE_SNAPSHOT_PATH,
+    GAME_SERVICE_THREADS,
+    GAME_SERVICE_WORKERS,
+    JSON_PROVIDER,
+    JSON_STREAM_MIN_ITEMS,
+    SERVER_BACKLOG,
+    SERVER_KEEPALIVE,
+    SQLITE_BUSY_TIMEOUT,
+    SQLITE_CACHE_SIZE,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SYNCHRONOUS,
     USER_SERVICE_DATABASE_URL,
+    USER_SERVICE_GAME_SERVICE_TIMEOUT,
+    USER_SERVICE_GAME_SERVICE_URL,
+    USER_SERVICE_GROUP_COMMIT,
+    USER_SERVICE_GROUP_COMMIT_MAX_BATCH,
+    USER_SERVICE_GROUP_COMMIT_SECONDS,
     USER_SERVICE_HOST,
     USER_SERVICE_PORT,
+    USER_SERVICE_RECOMMENDATION_COMPACTION_SECONDS,
+    USER_SERVICE_RECOMMENDATION_POLL_SECONDS,
+    USER_SERVICE_RECOMMENDATIONS,
+    USER_SERVICE_SERVER,
+    USER_SERVICE_THREADS,
+    USER_SERVICE_WORKERS,
 )
+from .engine import SQLITE_JOURNAL_MODES, SQLITE_SYNCHRONOUS_MODES
+from .json_provider import JSON_PROVIDERS
+from .server import SERVERS
+
+
+def _add_games_dataset_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments locating the games dataset and its snapshot.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+    """
+    parser.add_argument(
+        "--games_dataset",
+        type=str,
+        default=GAME_SERVICE_DATASET_PATH,
+        help="Dataset path.",
+    )
+    parser.add_argument(
+        "--snapshot_path",
+        type=str,
+        default=GAME_SERVICE_SNAPSHOT_PATH,
+        help="Snapshot path (Default: the dataset path with the suffix .gsnap).",
+    )
+
+
+def _add_database_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments tuning the connection pool and SQLite connections.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+    """
+    parser.add_argument(
+        "--pool_size",
+        type=int,
+        default=DATABASE_POOL_SIZE,
+        help="Database connections kept open per process.",
+    )
+    parser.add_argument(
+        "--max_overflow",
+        type=int,
+        default=DATABASE_MAX_OVERFLOW,
+        help="Database connections opened beyond the pool size under load.",
+    )
+    parser.add_argument(
+        "--pool_recycle",
+        type=int,
+        default=DATABASE_POOL_RECYCLE,
+        help="Seconds after which a connection is replaced (-1: never).",
+    )
+    parser.add_argument(
+        "--pool_pre_ping",
+        action=argparse.BooleanOptionalAction,
+        default=DATABASE_POOL_PRE_PING,
+        help="Test connections before use and replace broken ones.",
+    )
+    parser.add_argument(
+        "--sqlite_journal_mode",
+        choices=SQLITE_JOURNAL_MODES,
+        default=SQLITE_JOURNAL_MODE,
+        help="SQLite journal mode, wal lets readers run during writes "
+        "('': SQLite's default).",
+    )
+    parser.add_argument(
+        "--sqlite_synchronous",
+        choices=SQLITE_SYNCHRONOUS_MODES,
+        default=SQLITE_SYNCHRONOUS,
+        help="SQLite synchronous mode ('': SQLite's default).",
+    )
+    parser.add_argument(
+        "--sqlite_mmap_size",
+        type=int,
+        default=SQLITE_MMAP_SIZE,
+        help="Bytes of the SQLite database read through memory mapping.",
+    )
+    parser.add_argument(
+        "--sqlite_cache_size",
+        type=int,
+        default=SQLITE_CACHE_SIZE,
+        help="SQLite page cache per connection, in pages or, if negative, KiB.",
+    )
+    parser.add_argument(
+        "--sqlite_busy_timeout",
+        type=int,
+        default=SQLITE_BUSY_TIMEOUT,
+        help="Milliseconds SQLite waits for a lock before failing.",
+    )
+
+
+def _add_json_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments selecting how responses are encoded as JSON.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+    """
+    parser.add_argument(
+        "--json_provider",
+        choices=JSON_PROVIDERS,
+        default=JSON_PROVIDER,
+        help="JSON encoder of responses, orjson falls back to json if it is "
+        "not installed.",
+    )
+    parser.add_argument(
+        "--json_stream_min_items",
+        type=int,
+        default=JSON_STREAM_MIN_ITEMS,
+        help="Stream responses with a list of at least this many items "
+        "(0 disables streaming).",
+    )
+
+
+def _add_server_arguments(
+    parser: argparse.ArgumentParser,
+    server: str,
+    workers: int,
+    threads: int,
+    servers: Tuple[str, ...] = ("flask", "gunicorn"),
+) -> None:
+    """
+    Add the arguments selecting and tuning the server of a service.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+        server (str): The default server.
+        workers (int): The default number of worker processes.
+        threads (int): The default number of threads per worker.
+        servers (Tuple[str, ...]): The servers supported by the service.
+    """
+    parser.add_argument(
+        "--server",
+        choices=servers,
+        default=server,
+        help="Server: the flask development server, gunicorn (requires gunicorn) "
+        "or, if supported, uvicorn (requires uvicorn and aiosqlite).",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=workers, help="Worker processes of gunicorn."
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=threads,
+        help="Threads per gunicorn worker, or threads of uvicorn for Flask requests.",
+    )
+    parser.add_argument(
+        "--keepalive",
+        type=int,
+        default=SERVER_KEEPALIVE,
+        help="Seconds gunicorn keeps idle client connections open.",
+    )
+    parser.add_argument(
+        "--backlog",
+        type=int,
+        default=SERVER_BACKLOG,
+        help="Connections gunicorn queues while all workers are busy.",
+    )
 
 
 def parse_arguments(service_name: str) -> argparse.Namespace:
@@ -18,6 +212,7 @@ def parse_arguments(service_name: str) -> argparse.Namespace:
 
     Args:
         service_name (str): The name of the service ('game_service' or 'user_service')
+            or command ('game_catalog_sync' or 'game_snapshot').
 
     Returns:
         argparse.Namespace: An object containing the parsed arguments.
@@ -38,18 +233,83 @@ def parse_arguments(service_name: str) -> argparse.Namespace:
         parser.add_argument(
             "--host", type=str, default=GAME_SERVICE_HOST, help="Host address."
         )
+        _add_games_dataset_arguments(parser)
         parser.add_argument(
-            "--games_dataset",
+            "--database_url",
             type=str,
-            default=GAME_SERVICE_DATASET_PATH,
-            help="Dataset path.",
+            default=GAME_SERVICE_DATABASE_URL,
+            help="Database URL.",
+        )
+        _add_database_arguments(parser)
+        parser.add_argument(
+            "--search_index",
+            action=argparse.BooleanOptionalAction,
+            default=GAME_SERVICE_SEARCH_INDEX,
+            help="Serve name searches from an in-memory index.",
         )
+        parser.add_argument(
+            "--memory_catalog",
+            action=argparse.BooleanOptionalAction,
+            default=GAME_SERVICE_MEMORY_CATALOG,
+            help="Serve game reads from an in-memory copy of the catalog.",
+        )
+        parser.add_argument(
+            "--catalog_poll_seconds",
+            type=float,
+            default=GAME_SERVICE_CATALOG_POLL_SECONDS,
+            help="Seconds between checks for catalog changes by other processes.",
+        )
+        parser.add_argument(
+            "--game_cache_size",
+            type=int,
+            default=GAME_SERVICE_GAME_CACHE_SIZE,
+            help="Number of games kept in the lookup cache (0 disables it).",
+        )
+        parser.add_argument(
+            "--game_cache_ttl",
+            type=float,
+            default=GAME_SERVICE_GAME_CACHE_TTL,
+            help="Seconds a cached game is served (0 or less: until catalog changes).",
+        )
+        parser.add_argument(
+            "--response_cache_size",
+            type=int,
+            default=GAME_SERVICE_RESPONSE_CACHE_SIZE,
+            help="Number of encoded game lists kept in the cache (0 disables it).",
+        )
+        parser.add_argument(
+            "--response_cache_bytes",
+            type=int,
+            default=GAME_SERVICE_RESPONSE_CACHE_BYTES,
+            help="Total bytes of the encoded game lists kept in the cache.",
+        )
+        _add_json_arguments(parser)
+        _add_server_arguments(
+            parser,
+            GAME_SERVICE_SERVER,
+            GAME_SERVICE_WORKERS,
+            GAME_SERVICE_THREADS,
+            SERVERS,
+        )
+
+    elif service_name == "game_catalog_sync":
+        _add_games_dataset_arguments(parser)
         parser.add_argument(
             "--database_url",
             type=str,
             default=GAME_SERVICE_DATABASE_URL,
             help="Database URL.",
         )
+        _add_database_arguments(parser)
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            default=10_000,
+            help="Number of games written per transaction.",
+        )
+
+    elif service_name == "game_snapshot":
+        _add_games_dataset_arguments(parser)
 
     elif service_name == "user_service":
         parser.add_argument(
@@ -64,6 +324,59 @@ def parse_arguments(service_name: str) -> argparse.Namespace:
             default=USER_SERVICE_DATABASE_URL,
             help="Database URL.",
         )
+        _add_database_arguments(parser)
+        parser.add_argument(
+            "--game_service_url",
+            type=str,
+            default=USER_SERVICE_GAME_SERVICE_URL,
+            help="Game service URL used to look up favorite games.",
+        )
+        parser.add_argument(
+            "--game_service_timeout",
+            type=float,
+            default=USER_SERVICE_GAME_SERVICE_TIMEOUT,
+            help="Seconds to wait for the game service.",
+        )
+        parser.add_argument(
+            "--recommendations",
+            action=argparse.BooleanOptionalAction,
+            default=USER_SERVICE_RECOMMENDATIONS,
+            help="Serve game recommendations (requires numpy and scipy).",
+        )
+        parser.add_argument(
+            "--recommendation_compaction_seconds",
+            type=float,
+            default=USER_SERVICE_RECOMMENDATION_COMPACTION_SECONDS,
+            help="Seconds between full rebuilds of the recommendations.",
+        )
+        parser.add_argument(
+            "--recommendation_poll_seconds",
+            type=float,
+            default=USER_SERVICE_RECOMMENDATION_POLL_SECONDS,
+            help="Seconds between reads of the favorite changes of all workers.",
+        )
+        parser.add_argument(
+            "--group_commit",
+            action=argparse.BooleanOptionalAction,
+            default=USER_SERVICE_GROUP_COMMIT,
+            help="Add the favorites of concurrent requests in shared transactions.",
+        )
+        parser.add_argument(
+            "--group_commit_max_batch",
+            type=int,
+            default=USER_SERVICE_GROUP_COMMIT_MAX_BATCH,
+            help="Maximum number of favorites written per transaction.",
+        )
+        parser.add_argument(
+            "--group_commit_seconds",
+            type=float,
+            default=USER_SERVICE_GROUP_COMMIT_SECONDS,
+            help="Seconds a transaction waits for more favorites.",
+        )
+        _add_json_arguments(parser)
+        _add_server_arguments(
+            parser, USER_SERVICE_SERVER, USER_SERVICE_WORKERS, USER_SERVICE_THREADS
+        )
 
     else:
         raise ValueError(f"Unsupported service name: {service_name}")
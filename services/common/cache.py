@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypedDict, TypeVar
+
+ValueType = TypeVar("ValueType")
+
+
+class CacheStatsDict(TypedDict):
+    """A TypedDict with the counters of a cache."""
+
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class LRUCache(Generic[ValueType]):
+    """
+    A thread-safe, size-bounded least-recently-used cache.
+
+    Every clear() starts a new generation. Values computed from data read
+    before a clear can be put with the generation read before computing
+    them, and are then dropped instead of outliving the clear.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): The maximum number of entries kept in the cache.
+            ttl (Optional[float]): Seconds after which an entry expires.
+                Entries never expire if ttl is None.
+            max_bytes (Optional[int]): The maximum total len() of the cached
+                values, e.g. of encoded responses. Unbounded if None.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[ValueType, float]]" = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> Optional[ValueType]:
+        """
+        Return the cached value for key, or None if it is not cached.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Optional[ValueType]: The cached value, if present and not expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    @property
+    def generation(self) -> int:
+        """Return the number of times the cache was cleared."""
+        return self._generation
+
+    def put(
+        self, key: Hashable, value: ValueType, generation: Optional[int] = None
+    ) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): The cache key.
+            value (ValueType): The value to cache.
+            generation (Optional[int]): The generation read before the value
+                was computed. The value is dropped if the cache was cleared
+                since.
+        """
+        if self.maxsize <= 0:
+            return
+        size = self._size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        expires_at = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._remove(key)
+            self._entries[key] = (value, expires_at)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        """
+        Remove an entry while holding the lock, if it is cached.
+
+        Args:
+            key (Hashable): The cache key.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= self._size(entry[0])
+
+    def _size(self, value: ValueType) -> int:
+        """
+        Return the size of a value counted against max_bytes.
+
+        Args:
+            value (ValueType): The value.
+
+        Returns:
+            int: len() of the value, 0 if the cache is not bounded by bytes.
+        """
+        return 0 if self.max_bytes is None else len(value)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache and start a new generation."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._generation += 1
+
+    def stats(self) -> CacheStatsDict:
+        """
+        Return the counters of the cache.
+
+        Returns:
+            CacheStatsDict: The current size and the number of hits, misses,
+                evictions of least recently used entries and expired entries.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
@@ -8,11 +8,78 @@ load_dotenv()
 GAME_SERVICE_PORT = int(os.getenv("GAME_SERVICE_PORT", 5001))
 GAME_SERVICE_HOST = os.getenv("GAME_SERVICE_HOST", "0.0.0.0")
 GAME_SERVICE_DATASET_PATH = os.getenv("GAME_SERVICE_DATASET_PATH", "data/games.csv")
+GAME_SERVICE_SNAPSHOT_PATH = os.getenv("GAME_SERVICE_SNAPSHOT_PATH")
 GAME_SERVICE_DATABASE_URL = os.getenv(
     "GAME_SERVICE_DATABASE_URL", "sqlite:///games.csv"
 )
+GAME_SERVICE_CATALOG_POLL_SECONDS = float(
+    os.getenv("GAME_SERVICE_CATALOG_POLL_SECONDS", 5)
+)
+GAME_SERVICE_SEARCH_INDEX = (
+    os.getenv("GAME_SERVICE_SEARCH_INDEX", "false").lower() == "true"
+)
+GAME_SERVICE_MEMORY_CATALOG = (
+    os.getenv("GAME_SERVICE_MEMORY_CATALOG", "false").lower() == "true"
+)
+GAME_SERVICE_GAME_CACHE_SIZE = int(os.getenv("GAME_SERVICE_GAME_CACHE_SIZE", 4096))
+GAME_SERVICE_GAME_CACHE_TTL = float(os.getenv("GAME_SERVICE_GAME_CACHE_TTL", 300))
+GAME_SERVICE_RESPONSE_CACHE_SIZE = int(
+    os.getenv("GAME_SERVICE_RESPONSE_CACHE_SIZE", 1024)
+)
+GAME_SERVICE_RESPONSE_CACHE_BYTES = int(
+    os.getenv("GAME_SERVICE_RESPONSE_CACHE_BYTES", 64 * 1024 * 1024)
+)
+GAME_SERVICE_SERVER = os.getenv("GAME_SERVICE_SERVER", "flask")
+GAME_SERVICE_WORKERS = int(os.getenv("GAME_SERVICE_WORKERS", os.cpu_count() or 1))
+GAME_SERVICE_THREADS = int(os.getenv("GAME_SERVICE_THREADS", 1))
 
 # User Service settings
 USER_SERVICE_PORT = int(os.getenv("USER_SERVICE_PORT", 5001))
 USER_SERVICE_HOST = os.getenv("GAME_SERVICE_HOST", "0.0.0.0")
 USER_SERVICE_DATABASE_URL = os.getenv("USER_SERVICE_DATABASE_URL", "sqlite:///users.db")
+USER_SERVICE_GAME_SERVICE_URL = os.getenv(
+    "USER_SERVICE_GAME_SERVICE_URL", f"http://localhost:{GAME_SERVICE_PORT}"
+)
+USER_SERVICE_RECOMMENDATIONS = (
+    os.getenv("USER_SERVICE_RECOMMENDATIONS", "false").lower() == "true"
+)
+USER_SERVICE_RECOMMENDATION_COMPACTION_SECONDS = float(
+    os.getenv("USER_SERVICE_RECOMMENDATION_COMPACTION_SECONDS", 3600)
+)
+USER_SERVICE_RECOMMENDATION_POLL_SECONDS = float(
+    os.getenv("USER_SERVICE_RECOMMENDATION_POLL_SECONDS", 0.5)
+)
+USER_SERVICE_GAME_SERVICE_TIMEOUT = float(
+    os.getenv("USER_SERVICE_GAME_SERVICE_TIMEOUT", 2)
+)
+USER_SERVICE_GROUP_COMMIT = (
+    os.getenv("USER_SERVICE_GROUP_COMMIT", "false").lower() == "true"
+)
+USER_SERVICE_GROUP_COMMIT_MAX_BATCH = int(
+    os.getenv("USER_SERVICE_GROUP_COMMIT_MAX_BATCH", 100)
+)
+USER_SERVICE_GROUP_COMMIT_SECONDS = float(
+    os.getenv("USER_SERVICE_GROUP_COMMIT_SECONDS", 0.002)
+)
+USER_SERVICE_SERVER = os.getenv("USER_SERVICE_SERVER", "flask")
+USER_SERVICE_WORKERS = int(os.getenv("USER_SERVICE_WORKERS", os.cpu_count() or 1))
+USER_SERVICE_THREADS = int(os.getenv("USER_SERVICE_THREADS", 4))
+
+# Production server settings shared by the services
+SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", 5))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", 2048))
+
+# Database settings shared by the services
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", 5))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", 10))
+DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", -1))
+DATABASE_POOL_PRE_PING = os.getenv("DATABASE_POOL_PRE_PING", "true").lower() == "true"
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "wal")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "normal")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", -64 * 1024))
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))
+
+# JSON settings shared by the services
+JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+JSON_STREAM_MIN_ITEMS = int(os.getenv("JSON_STREAM_MIN_ITEMS", 0))
@@ -0,0 +1,128 @@
+import argparse
+import logging
+from typing import Any, Dict
+
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+logger = logging.getLogger(__name__)
+
+SQLITE_JOURNAL_MODES = ("", "delete", "truncate", "persist", "memory", "wal", "off")
+SQLITE_SYNCHRONOUS_MODES = ("", "off", "normal", "full", "extra")
+
+
+def is_sqlite_memory_url(database_url: str) -> bool:
+    """
+    Check whether a database URL names an in-memory SQLite database.
+
+    Args:
+        database_url (str): The database connection URL.
+
+    Returns:
+        bool: True for in-memory SQLite databases, which Flask-SQLAlchemy
+            serves from a single static connection instead of a pool.
+    """
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(database_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Build the options of the SQLAlchemy engine from the command line arguments.
+
+    Args:
+        database_url (str): The database connection URL.
+        args (argparse.Namespace): The parsed arguments with pool_size,
+            max_overflow, pool_recycle and pool_pre_ping.
+
+    Returns:
+        Dict[str, Any]: The keyword arguments of create_engine. The pool is
+            only sized for databases that use a connection pool.
+    """
+    options: Dict[str, Any] = {
+        "pool_recycle": args.pool_recycle,
+        "pool_pre_ping": args.pool_pre_ping,
+    }
+    if not is_sqlite_memory_url(database_url):
+        options["pool_size"] = args.pool_size
+        options["max_overflow"] = args.max_overflow
+    return options
+
+
+def sqlite_pragmas(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Collect the SQLite pragmas set on every new connection.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments with the sqlite_*
+            pragma values.
+
+    Returns:
+        Dict[str, Any]: The values by pragma name. Empty journal and
+            synchronous modes keep SQLite's defaults.
+
+    Raises:
+        ValueError: If the journal or synchronous mode is not supported, e.g.
+            when given by an environment variable.
+    """
+    if args.sqlite_journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Unsupported SQLite journal mode: {args.sqlite_journal_mode}")
+    if args.sqlite_synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(
+            f"Unsupported SQLite synchronous mode: {args.sqlite_synchronous}"
+        )
+
+    pragmas = {
+        "journal_mode": args.sqlite_journal_mode,
+        "synchronous": args.sqlite_synchronous,
+        "mmap_size": args.sqlite_mmap_size,
+        "cache_size": args.sqlite_cache_size,
+        "busy_timeout": args.sqlite_busy_timeout,
+    }
+    return {name: value for name, value in pragmas.items() if value != ""}
+
+
+def configure_database(app: Flask, args: argparse.Namespace) -> None:
+    """
+    Apply the engine options and SQLite pragmas of the arguments to an app.
+
+    Must be called before the database is initialized, as Flask-SQLAlchemy
+    creates the engine in init_app.
+
+    Args:
+        app (Flask): The Flask application instance.
+        args (argparse.Namespace): The parsed database arguments.
+    """
+    database_url = app.config["SQLALCHEMY_DATABASE_URI"]
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(database_url, args)
+    app.config["SQLITE_PRAGMAS"] = sqlite_pragmas(args)
+    logger.info(
+        f"Engine options: {app.config['SQLALCHEMY_ENGINE_OPTIONS']}, "
+        f"SQLite pragmas: {app.config['SQLITE_PRAGMAS']}"
+    )
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """
+    Set pragmas on every connection the engine opens to a SQLite database.
+
+    Engines of other databases are left unchanged.
+
+    Args:
+        engine (Engine): The engine, the sync_engine of an async engine.
+        pragmas (Dict[str, Any]): The values by pragma name.
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    statements = [f"PRAGMA {name} = {value}" for name, value in pragmas.items()]
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
@@ -0,0 +1,344 @@
+import json
+import logging
+import math
+import re
+from json.encoder import encode_basestring_ascii
+from typing import Any, Iterator
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+logger = logging.getLogger(__name__)
+
+JSON_PROVIDERS = ("orjson", "json")
+STREAM_CHUNK_ITEMS = 256
+
+# orjson writes some floats differently than repr(), e.g. 1e16 and 0.00001
+# instead of 1e+16 and 1e-05. Number tokens are rewritten if one may occur,
+# which is checked on a copy with digits and minus signs mapped to 0, e and E
+# to e and other bytes to spaces, faster than with a regular expression.
+_NUMBER_BYTE_CLASSES = bytes(
+    ord("0") if byte in b"0123456789-" else ord("e") if byte in b"eE" else ord(" ")
+    for byte in range(256)
+)
+_JSON_STRING_OR_NUMBER = re.compile(rb'"(?:[^"\\]|\\.)*"|-?[0-9][0-9.eE+-]*')
+_ASTRAL_ESCAPE = re.compile(rb"\\U([0-9a-f]{8})")
+
+
+def _repr_float(match: "re.Match[bytes]") -> bytes:
+    """
+    Rewrite a float token like json.dumps, leaving strings and ints unchanged.
+
+    Args:
+        match (re.Match[bytes]): A string or number token of the JSON text.
+
+    Returns:
+        bytes: The token.
+    """
+    token = match.group()
+    if token.startswith(b'"') or not any(char in token for char in b".eE"):
+        return token
+    return repr(float(token)).encode()
+
+
+def _surrogate_pair(match: "re.Match[bytes]") -> bytes:
+    r"""
+    Rewrite a \U escape as the surrogate pair json.dumps writes.
+
+    Args:
+        match (re.Match[bytes]): The escape.
+
+    Returns:
+        bytes: The surrogate pair.
+    """
+    code = int(match.group(1), 16) - 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}".encode()
+
+
+def _escape_non_ascii(content: bytes) -> bytes:
+    r"""
+    Escape the characters beyond ASCII of JSON text like json.dumps does.
+
+    Without backslashes in the text, the escapes of the backslashreplace
+    error handler only need \x escapes widened and \U escapes split into
+    surrogate pairs. Otherwise the text is escaped like a string, and the
+    escapes of quotes and backslashes are undone.
+
+    Args:
+        content (bytes): The JSON text in UTF-8.
+
+    Returns:
+        bytes: The JSON text in ASCII.
+    """
+    if b"\\" in content:
+        text = encode_basestring_ascii(content.decode())[1:-1]
+        return text.replace('\\"', '"').replace("\\\\", "\\").encode()
+
+    content = content.decode().encode("ascii", "backslashreplace")
+    content = content.replace(b"\\x", b"\\u00")
+    if b"\\U" in content:
+        content = _ASTRAL_ESCAPE.sub(_surrogate_pair, content)
+    return content
+
+
+def _has_non_finite_float(obj: Any) -> bool:
+    """
+    Check whether data contains NaN or an infinity.
+
+    Args:
+        obj (Any): The data, with dicts, lists and tuples searched.
+
+    Returns:
+        bool: True if a float in the data is not finite.
+    """
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class StreamingJSONProvider(DefaultJSONProvider):
+    """
+    Flask's JSON provider that can stream responses with long lists.
+
+    Responses are encoded exactly like jsonify does. If stream_min_items
+    is set, responses whose value, or one of whose top-level values, is a
+    list of at least that many items are sent in chunks of
+    STREAM_CHUNK_ITEMS items while they are encoded, so the first bytes
+    go out before the whole list is encoded.
+    """
+
+    stream_min_items = 0
+
+    def encode(self, obj: Any) -> bytes:
+        """
+        Encode data like jsonify does outside of debug mode.
+
+        Args:
+            obj (Any): The data to encode.
+
+        Returns:
+            bytes: The compact JSON text, without the trailing newline.
+        """
+        return json.dumps(
+            obj,
+            default=self.default,
+            ensure_ascii=self.ensure_ascii,
+            sort_keys=self.sort_keys,
+            separators=(",", ":"),
+        ).encode()
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize data as JSON to a string.
+
+        Compact output, the only one used for responses outside of debug
+        mode, is produced by encode. Other options are passed to json.dumps.
+
+        Args:
+            obj (Any): The data to serialize.
+            **kwargs (Any): Passed to json.dumps.
+
+        Returns:
+            str: The JSON text.
+        """
+        if kwargs == {"separators": (",", ":")}:
+            return self.encode(obj).decode()
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """
+        Serialize the arguments as JSON like jsonify does.
+
+        Args:
+            *args (Any): A single value to serialize, or several values to
+                serialize as a list.
+            **kwargs (Any): Serialized as a dict.
+
+        Returns:
+            Response: The JSON response, streamed if it has a long list.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(obj)
+
+        if self.stream_min_items and self._longest_list(obj) >= self.stream_min_items:
+            return self._app.response_class(self._stream(obj), mimetype=self.mimetype)
+        return self._app.response_class(
+            self.encode(obj) + b"\n", mimetype=self.mimetype
+        )
+
+    @staticmethod
+    def _longest_list(obj: Any) -> int:
+        """
+        Return the length of the longest list at the top of a response.
+
+        Args:
+            obj (Any): The data of the response.
+
+        Returns:
+            int: The length of obj if it is a list, or of its longest list value
+                if it is a dict, else 0.
+        """
+        if isinstance(obj, list):
+            return len(obj)
+        if isinstance(obj, dict):
+            return max(
+                (len(value) for value in obj.values() if isinstance(value, list)),
+                default=0,
+            )
+        return 0
+
+    def _stream(self, obj: Any) -> Iterator[bytes]:
+        """
+        Encode a response in chunks.
+
+        Args:
+            obj (Any): The data of the response.
+
+        Yields:
+            bytes: The chunks, which join to the output of jsonify.
+        """
+        if isinstance(obj, dict) and self.sort_keys:
+            if not all(isinstance(key, str) for key in obj):
+                yield self.encode(obj) + b"\n"
+                return
+
+            yield b"{"
+            for position, key in enumerate(sorted(obj)):
+                yield (b"," if position else b"") + self.encode(key) + b":"
+                yield from self._stream_value(obj[key])
+            yield b"}\n"
+        else:
+            yield from self._stream_value(obj)
+            yield b"\n"
+
+    def _stream_value(self, value: Any) -> Iterator[bytes]:
+        """
+        Encode a value, a list in chunks of STREAM_CHUNK_ITEMS items.
+
+        Args:
+            value (Any): The value.
+
+        Yields:
+            bytes: The chunks of the encoded value.
+        """
+        if not isinstance(value, list) or not value:
+            yield self.encode(value)
+            return
+
+        yield b"["
+        for start in range(0, len(value), STREAM_CHUNK_ITEMS):
+            end = start + STREAM_CHUNK_ITEMS
+            chunk = self.encode(value[start:end])
+            yield (b"," if start else b"") + chunk[1:-1]
+        yield b"]"
+
+
+class OrjsonJSONProvider(StreamingJSONProvider):
+    """
+    A JSON provider encoding with orjson (requires orjson).
+
+    The output is byte for byte the output of Flask's default provider:
+    keys are sorted, characters beyond ASCII are escaped and floats are
+    written like repr(). Data orjson cannot encode the same way, such as
+    dates, keys that are not strings, integers beyond 64 bits and NaN or
+    infinities, which orjson writes as null, are encoded with json.dumps.
+    """
+
+    def __init__(self, app: Flask):
+        """
+        Initialize the provider.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        import orjson
+
+        super().__init__(app)
+        self._orjson = orjson
+        passthrough = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+        self._options = (
+            orjson.OPT_SORT_KEYS | passthrough | orjson.OPT_PASSTHROUGH_SUBCLASS
+        )
+
+    def encode(self, obj: Any) -> bytes:
+        """
+        Encode data like jsonify does outside of debug mode.
+
+        Args:
+            obj (Any): The data to encode.
+
+        Returns:
+            bytes: The compact JSON text, without the trailing newline.
+        """
+        if not (self.sort_keys and self.ensure_ascii):
+            return super().encode(obj)
+        try:
+            content = self._orjson.dumps(
+                obj, default=_unsupported, option=self._options
+            )
+        except TypeError:
+            return super().encode(obj)
+        if b"null" in content and _has_non_finite_float(obj):
+            # orjson writes NaN and infinities as null, json.dumps does not.
+            return super().encode(obj)
+
+        if b"0e0" in content.translate(_NUMBER_BYTE_CLASSES) or b"0.0000" in content:
+            content = _JSON_STRING_OR_NUMBER.sub(_repr_float, content)
+        if not content.isascii():
+            content = _escape_non_ascii(content)
+        if b"\x7f" in content:
+            content = content.replace(b"\x7f", b"\\u007f")
+        return content
+
+
+def _unsupported(obj: Any) -> Any:
+    """
+    Reject types orjson would encode differently than json.dumps.
+
+    Args:
+        obj (Any): The object orjson cannot encode.
+
+    Raises:
+        TypeError: Always, to fall back to json.dumps.
+    """
+    raise TypeError(f"Type is not encoded with orjson: {type(obj).__name__}")
+
+
+def configure_json_provider(app: Flask, provider: str, stream_min_items: int) -> None:
+    """
+    Replace the JSON provider of an app.
+
+    Args:
+        app (Flask): The Flask application instance.
+        provider (str): "orjson", falling back to "json" if orjson is not
+            installed, or "json".
+        stream_min_items (int): Stream responses with a list of at least
+            this many items, 0 never streams.
+
+    Raises:
+        ValueError: If the provider is not supported.
+    """
+    if provider not in JSON_PROVIDERS:
+        raise ValueError(f"Unsupported JSON provider: {provider}")
+
+    json_provider: StreamingJSONProvider
+    try:
+        if provider != "orjson":
+            raise ImportError
+        json_provider = OrjsonJSONProvider(app)
+    except ImportError:
+        if provider == "orjson":
+            logger.warning("orjson is not installed, encoding JSON with json.")
+        json_provider = StreamingJSONProvider(app)
+
+    json_provider.stream_min_items = stream_min_items
+    app.json = json_provider
@@ -0,0 +1,122 @@
+import argparse
+import gc
+import logging
+from typing import Any, Callable, Optional
+
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+SERVERS = ("flask", "gunicorn", "uvicorn")
+
+
+def run_server(
+    app: Flask,
+    args: argparse.Namespace,
+    post_fork: Optional[Callable[[], None]] = None,
+    asgi_app: Optional[Callable[[], Any]] = None,
+) -> None:
+    """
+    Serve the app with the server selected by the command line arguments.
+
+    "flask" runs the single-process development server. "gunicorn" forks
+    args.workers worker processes from the current process after the app is
+    set up, so the workers share the loaded data copy-on-write. "uvicorn"
+    serves the ASGI app created by asgi_app from an asyncio event loop in the
+    current process.
+
+    Args:
+        app (Flask): The configured Flask application instance.
+        args (argparse.Namespace): The parsed arguments with host, port,
+            server, workers, threads, keepalive and backlog.
+        post_fork (Optional[Callable[[], None]]): Run in every worker after
+            the fork, e.g. to drop inherited database connections or to start
+            background threads, which do not survive a fork.
+        asgi_app (Optional[Callable[[], Any]]): Creates the ASGI app of the
+            service, None if the service has none.
+
+    Raises:
+        ValueError: If the server is not supported by the service.
+    """
+    if args.server == "flask":
+        if post_fork is not None:
+            post_fork()
+        app.run(host=args.host, port=args.port, threaded=True)
+    elif args.server == "gunicorn":
+        _run_gunicorn(app, args, post_fork)
+    elif args.server == "uvicorn" and asgi_app is not None:
+        if post_fork is not None:
+            post_fork()
+        _run_uvicorn(asgi_app(), args)
+    else:
+        raise ValueError(f"Unsupported server: {args.server}")
+
+
+def _run_gunicorn(
+    app: Flask,
+    args: argparse.Namespace,
+    post_fork: Optional[Callable[[], None]],
+) -> None:
+    """
+    Serve the already loaded app with gunicorn (requires gunicorn).
+
+    Args:
+        app (Flask): The configured Flask application instance.
+        args (argparse.Namespace): The parsed server arguments.
+        post_fork (Optional[Callable[[], None]]): Run in every worker after
+            the fork.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    options = {
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers,
+        "threads": args.threads,
+        "keepalive": args.keepalive,
+        "backlog": args.backlog,
+        "preload_app": True,
+    }
+    if post_fork is not None:
+        options["post_fork"] = lambda server, worker: post_fork()
+
+    class PreloadedApplication(BaseApplication):
+        """Serves the app object loaded by the master process."""
+
+        def load_config(self):
+            """Apply the options to the gunicorn configuration."""
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            """Return the app, which is inherited by the forked workers."""
+            return app
+
+    logger.info(
+        f"Starting gunicorn with {args.workers} workers and {args.threads} threads"
+    )
+    # Hide the loaded objects from the garbage collector, whose collections in
+    # the workers would otherwise write to their pages and unshare them.
+    gc.freeze()
+    PreloadedApplication().run()
+
+
+def _run_uvicorn(asgi_app: Any, args: argparse.Namespace) -> None:
+    """
+    Serve an ASGI app with uvicorn (requires uvicorn).
+
+    Args:
+        asgi_app (Any): The ASGI app.
+        args (argparse.Namespace): The parsed server arguments.
+    """
+    import uvicorn
+
+    config = uvicorn.Config(
+        asgi_app,
+        host=args.host,
+        port=args.port,
+        backlog=args.backlog,
+        timeout_keep_alive=args.keepalive,
+        access_log=False,
+    )
+    logger.info(f"Starting uvicorn with {args.threads} threads for Flask requests")
+    uvicorn.Server(config).run()
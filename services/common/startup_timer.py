@@ -0,0 +1,42 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Measures the phases of a service start and logs a report."""
+
+    def __init__(self):
+        """
+        Initialize the timer.
+
+        The CPU time the process used so far is recorded as the first phase.
+        Before the service's main code runs this is almost entirely spent on
+        starting the interpreter and importing modules.
+        """
+        self._phases: List[Tuple[str, float]] = [("imports", time.process_time())]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measure the wall clock time of a phase.
+
+        Args:
+            name (str): The name of the phase in the report.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases.append((name, time.perf_counter() - start))
+
+    def report(self) -> None:
+        """Log the duration of every phase and the total."""
+        total = sum(seconds for _, seconds in self._phases)
+        logger.info("Startup timing report:")
+        for name, seconds in self._phases:
+            logger.info(f"  {name}: {seconds * 1000:.1f} ms")
+        logger.info(f"  total: {total * 1000:.1f} ms")
@@ -1,22 +1,41 @@
 import logging
 import sys
+from typing import Optional
 
 from flask import Flask
 
 from ..common.arg_parser import configure_logging, parse_arguments
+from ..common.config import JSON_PROVIDER, JSON_STREAM_MIN_ITEMS
+from ..common.engine import configure_database
+from ..common.json_provider import configure_json_provider
+from ..common.server import run_server
+from ..common.startup_timer import StartupTimer
+from .asgi import GameServiceASGI
+from .database.catalog_version import CatalogVersionWatcher
 from .database.database import db, init_db
+from .database.fts import create_fts_table
 from .database.seed import seed_data
-from .routes import game_routes
+from .game_service import configure_game_cache
+from .routes import configure_list_response_cache, game_routes
+from .utils.memory_catalog import enable_memory_catalog
+from .utils.search_index import enable_name_search_index
 
 logger = logging.getLogger(__name__)
 
 
-def create_app(database_url: str) -> Flask:
+def create_app(
+    database_url: str,
+    json_provider: str = JSON_PROVIDER,
+    json_stream_min_items: int = JSON_STREAM_MIN_ITEMS,
+) -> Flask:
     """
     Create and configure the Flask application.
 
     Args:
         database_url (str): The database connection URL.
+        json_provider (str): The JSON encoder of responses, "orjson" or "json".
+        json_stream_min_items (int): Stream responses with a list of at least
+            this many items, 0 never streams.
 
     Returns:
         Flask: The configured Flask application instance.
@@ -26,27 +45,96 @@ def create_app(database_url: str) -> Flask:
     app = Flask(__name__)
     app.config["SQLALCHEMY_DATABASE_URI"] = database_url
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    configure_json_provider(app, json_provider, json_stream_min_items)
 
     app.register_blueprint(game_routes)
     return app
 
 
-def setup_database(app: Flask, games_dataset_path: str) -> None:
+def setup_database(
+    app: Flask,
+    games_dataset_path: str,
+    search_index: bool = False,
+    snapshot_path: Optional[str] = None,
+    timer: Optional[StartupTimer] = None,
+    memory_catalog: bool = False,
+) -> None:
     """
     Initialize the database and seed the data.
 
     Args:
         app (Flask): The Flask application instance.
+        games_dataset_path (str): The path to the games dataset.
+        search_index (bool): Build the in-memory name search index.
+        snapshot_path (Optional[str]): The path of the dataset's snapshot.
+        timer (Optional[StartupTimer]): Records the duration of each step.
+        memory_catalog (bool): Load the catalog into memory and serve reads
+            from it instead of the database. Includes the name search index.
     """
+    timer = timer or StartupTimer()
+
     logger.info("Initializing database...")
     init_db(app)
     with app.app_context():
-        db.create_all()
+        with timer.phase("database init"):
+            db.create_all()
+            create_fts_table()
+
         logger.info("Seeding the database with initial data...")
-        seed_data(games_dataset_path)
+        with timer.phase("seed"):
+            seed_data(games_dataset_path, snapshot_path=snapshot_path)
+
+        if memory_catalog:
+            logger.info("Loading the catalog into memory...")
+            with timer.phase("memory catalog"):
+                enable_memory_catalog()
+        elif search_index:
+            logger.info("Building the name search index...")
+            with timer.phase("search index"):
+                enable_name_search_index()
+
+
+def watch_catalog_version(
+    app: Flask, interval: float
+) -> Optional[CatalogVersionWatcher]:
+    """
+    Refresh in-memory caches when another process changes the catalog.
+
+    Args:
+        app (Flask): The Flask application instance.
+        interval (float): The minimum number of seconds between two checks.
+            Watching is disabled if the interval is negative.
+
+    Returns:
+        Optional[CatalogVersionWatcher]: The watcher, None if disabled.
+    """
+    if interval < 0:
+        return None
+
+    watcher = CatalogVersionWatcher(interval)
+    with app.app_context():
+        watcher.check()
+    app.before_request(watcher.check)
+    return watcher
+
+
+def prepare_worker(app: Flask) -> None:
+    """
+    Prepare a process that serves requests.
+
+    Worker processes forked by the server must not reuse the database
+    connections of the parent. The catalog, the search index and the
+    in-memory catalog loaded before the fork are shared.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
 
 
 if __name__ == "__main__":
+    timer = StartupTimer()
     args = parse_arguments("game_service")
     configure_logging(args.verbose)
 
@@ -54,18 +142,59 @@ if __name__ == "__main__":
     host = args.host
     dataset_path = args.games_dataset
     database_url = args.database_url
+    search_index = args.search_index
+    memory_catalog = args.memory_catalog
+    catalog_poll_seconds = args.catalog_poll_seconds
 
     logger.info("Starting the Flask application...")
     logger.info("Application is configured with the following settings:")
     logger.info(f"HOST: {host}, PORT: {port}")
+    logger.info(
+        f"Server: {args.server}, workers: {args.workers}, threads: {args.threads}"
+    )
     logger.info(f"Dataset Path: {dataset_path}, Database_url: {database_url}")
+    logger.info(f"Search index: {search_index}, memory catalog: {memory_catalog}")
+    logger.info(f"Game cache size: {args.game_cache_size}, ttl: {args.game_cache_ttl}")
+    logger.info(
+        f"Response cache size: {args.response_cache_size}, "
+        f"bytes: {args.response_cache_bytes}"
+    )
+    logger.info(
+        f"JSON provider: {args.json_provider}, "
+        f"streaming lists of {args.json_stream_min_items} items or more"
+    )
 
     try:
-        app = create_app(database_url)
-
-        setup_database(app, dataset_path)
-
-        app.run(host=host, port=port)
+        with timer.phase("app creation"):
+            app = create_app(
+                database_url, args.json_provider, args.json_stream_min_items
+            )
+            configure_database(app, args)
+
+        configure_game_cache(
+            args.game_cache_size,
+            args.game_cache_ttl if args.game_cache_ttl > 0 else None,
+        )
+        configure_list_response_cache(
+            args.response_cache_size, args.response_cache_bytes
+        )
+        setup_database(
+            app,
+            dataset_path,
+            search_index,
+            args.snapshot_path,
+            timer,
+            memory_catalog,
+        )
+        watcher = watch_catalog_version(app, catalog_poll_seconds)
+        timer.report()
+
+        run_server(
+            app,
+            args,
+            lambda: prepare_worker(app),
+            lambda: GameServiceASGI(app, database_url, args.threads, watcher),
+        )
     except Exception as e:
         logger.critical(f"Application failed to start: {e}", exc_info=True)
         sys.exit(1)
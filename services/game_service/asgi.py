@@ -0,0 +1,428 @@
+import asyncio
+import functools
+import io
+import logging
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from flask import Flask
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from werkzeug.datastructures import MultiDict
+
+from ..common.engine import apply_sqlite_pragmas
+from .database.catalog_version import CatalogVersionWatcher
+from .database.models import Game
+from .exceptions import GameNotFoundError
+from .game_service import (
+    GameDict,
+    cache_game,
+    game_cache_generation,
+    get_cached_game,
+)
+from .routes import get_cached_list_response
+from .utils.memory_catalog import MemoryCatalog, get_memory_catalog
+
+logger = logging.getLogger(__name__)
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+Headers = List[Tuple[bytes, bytes]]
+HttpResponse = Tuple[int, Headers, bytes]
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+_GAME_PATH = re.compile(r"/games/(\d+)")
+
+
+def async_database_url(database_url: str) -> str:
+    """
+    Replace the driver of a database URL with its asyncio driver.
+
+    Args:
+        database_url (str): The database connection URL of the Flask app.
+
+    Returns:
+        str: The URL for SQLAlchemy's async engine. URLs that already name an
+            asyncio driver are returned unchanged.
+    """
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.drivername)
+    if driver is not None:
+        url = url.set(drivername=driver)
+    return url.render_as_string(hide_password=False)
+
+
+def wsgi_environ(scope: Scope, body: bytes) -> Dict[str, Any]:
+    """
+    Build the WSGI environ of an ASGI HTTP request.
+
+    Args:
+        scope (Scope): The ASGI connection scope.
+        body (bytes): The complete request body.
+
+    Returns:
+        Dict[str, Any]: The environ to call a WSGI app with.
+    """
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin-1"),
+        "PATH_INFO": scope["path"].encode().decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    if scope.get("client"):
+        environ["REMOTE_ADDR"] = scope["client"][0]
+
+    for name, value in scope["headers"]:
+        key = name.decode("latin-1").upper().replace("-", "_")
+        if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = f"HTTP_{key}"
+        value = value.decode("latin-1")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+
+    # The server has already decoded a chunked body, pass its real length.
+    environ.pop("HTTP_TRANSFER_ENCODING", None)
+    environ["CONTENT_LENGTH"] = str(len(body))
+    return environ
+
+
+class GameServiceASGI:
+    """
+    Serves the game service from an asyncio event loop (requires aiosqlite).
+
+    Connections are held by the event loop, so idle keep-alive clients cost
+    no thread. Single games are read with SQLAlchemy's async engine and game
+    lists already in the response cache are sent without leaving the loop.
+    All other requests, including game lists that are not cached yet, are
+    handled by the Flask app in a bounded thread pool, so they keep the URLs,
+    JSON and error handling of the Blueprint.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        database_url: str,
+        threads: int,
+        watcher: Optional[CatalogVersionWatcher] = None,
+    ):
+        """
+        Initialize the ASGI app.
+
+        Args:
+            app (Flask): The configured Flask application instance.
+            database_url (str): The database connection URL of the Flask app.
+            threads (int): The number of threads handling requests with Flask.
+            watcher (Optional[CatalogVersionWatcher]): Polls the catalog
+                version before requests that are answered in the event loop.
+        """
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        self.app = app
+        self.watcher = watcher
+        self.engine = create_async_engine(
+            async_database_url(database_url),
+            **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+        )
+        apply_sqlite_pragmas(
+            self.engine.sync_engine, app.config.get("SQLITE_PRAGMAS", {})
+        )
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix="flask")
+        self._encoded_catalog: Optional[MemoryCatalog] = None
+        self._encoded_games: Dict[int, bytes] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Handle one ASGI connection scope.
+
+        Args:
+            scope (Scope): The ASGI connection scope.
+            receive (Receive): Receives the messages of the client.
+            send (Send): Sends messages to the client.
+        """
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        body = await self._read_body(receive)
+        status, headers, content = await self._respond(scope, body)
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": content})
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        """
+        Release the database connections and threads when the server stops.
+
+        Args:
+            receive (Receive): Receives the lifespan events.
+            send (Send): Acknowledges the lifespan events.
+        """
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _read_body(self, receive: Receive) -> bytes:
+        """
+        Read the complete body of a request.
+
+        Args:
+            receive (Receive): Receives the messages of the client.
+
+        Returns:
+            bytes: The request body.
+        """
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    async def _respond(self, scope: Scope, body: bytes) -> HttpResponse:
+        """
+        Answer a request in the event loop if possible, otherwise with Flask.
+
+        Args:
+            scope (Scope): The ASGI connection scope.
+            body (bytes): The complete request body.
+
+        Returns:
+            HttpResponse: The status, headers and body of the response.
+        """
+        if scope["method"] == "GET":
+            game_path = _GAME_PATH.fullmatch(scope["path"])
+            if game_path is not None:
+                await self._check_catalog_version()
+                return await self._get_game(int(game_path.group(1)))
+
+            if scope["path"] == "/games":
+                query = scope["query_string"].decode("utf-8", "replace")
+                args = MultiDict(parse_qsl(query, keep_blank_values=True))
+                if "ids" not in args:
+                    await self._check_catalog_version()
+                    cached_body = get_cached_list_response(args)
+                    if cached_body is not None:
+                        logger.info("Returning cached list of games")
+                        return 200, self._json_headers(cached_body), cached_body
+
+        return await self._run_in_thread(self._call_flask, scope, body)
+
+    async def _get_game(self, game_id: int) -> HttpResponse:
+        """
+        Get a board game by game_id, like GameService.get_game.
+
+        With the in-memory catalog enabled the database is not queried.
+
+        Args:
+            game_id (int): The unique ID of a board game.
+
+        Returns:
+            HttpResponse: The game, or a 404 response if it does not exist.
+        """
+        logger.info(f"Received request to for game with ID: {game_id}")
+
+        catalog = get_memory_catalog()
+        if catalog is not None:
+            return self._get_game_from_memory(catalog, game_id)
+
+        game = get_cached_game(game_id)
+        if game is None:
+            game = await self._fetch_game(game_id)
+        if game is None:
+            logger.error(f"Game not found: {game_id}")
+            error = GameNotFoundError(game_id=game_id)
+            return self._json_response({"error": str(error)}, 404)
+
+        logger.info(f"Returning game with ID {game_id}")
+        return self._json_response(game, 200)
+
+    def _get_game_from_memory(
+        self, catalog: MemoryCatalog, game_id: int
+    ) -> HttpResponse:
+        """
+        Get a board game from the in-memory catalog.
+
+        The encoded response of each game is kept until the catalog is
+        replaced, so repeated requests only look up the bytes.
+
+        Args:
+            catalog (MemoryCatalog): The active in-memory catalog.
+            game_id (int): The unique ID of a board game.
+
+        Returns:
+            HttpResponse: The game, or a 404 response if it does not exist.
+        """
+        if catalog is not self._encoded_catalog:
+            self._encoded_catalog = catalog
+            self._encoded_games = {}
+
+        content = self._encoded_games.get(game_id)
+        if content is None:
+            game = catalog.get(game_id)
+            if game is None:
+                logger.error(f"Game not found: {game_id}")
+                error = GameNotFoundError(game_id=game_id)
+                return self._json_response({"error": str(error)}, 404)
+
+            content = self._encode_json(game)
+            self._encoded_games[game_id] = content
+
+        logger.info(f"Returning game with ID {game_id}")
+        return 200, self._json_headers(content), content
+
+    async def _fetch_game(self, game_id: int) -> Optional[GameDict]:
+        """
+        Read a game with the async engine and add it to the cache of get_game.
+
+        Args:
+            game_id (int): The unique ID of a board game.
+
+        Returns:
+            Optional[GameDict]: The game, or None if it does not exist.
+        """
+        generation = game_cache_generation()
+        async with self.engine.connect() as connection:
+            result = await connection.execute(
+                select(Game.game_id, Game.name).where(Game.game_id == game_id)
+            )
+            row = result.first()
+        if row is None:
+            return None
+
+        game = {"id": row.game_id, "name": row.name}
+        cache_game(game, generation)
+        return game
+
+    async def _check_catalog_version(self) -> None:
+        """Poll the catalog version in a thread if the interval has passed."""
+        if self.watcher is not None and self.watcher.is_due():
+            await self._run_in_thread(self._check_catalog_version_in_app)
+
+    def _check_catalog_version_in_app(self) -> None:
+        """Poll the catalog version within the Flask app context."""
+        with self.app.app_context():
+            self.watcher.check()
+
+    async def _run_in_thread(self, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking function in the thread pool.
+
+        Args:
+            function (Callable[..., Any]): The function.
+            *args (Any): The arguments of the function.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(function, *args)
+        )
+
+    def _call_flask(self, scope: Scope, body: bytes) -> HttpResponse:
+        """
+        Handle a request with the Flask app.
+
+        Args:
+            scope (Scope): The ASGI connection scope.
+            body (bytes): The complete request body.
+
+        Returns:
+            HttpResponse: The status, headers and body of Flask's response.
+        """
+        response_start = []
+
+        def start_response(status, headers, exc_info=None):
+            response_start[:] = [status, headers]
+
+        chunks = self.app(wsgi_environ(scope, body), start_response)
+        try:
+            content = b"".join(chunks)
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+        status, headers = response_start
+        return (
+            int(status.split(" ", 1)[0]),
+            [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers
+            ],
+            content,
+        )
+
+    def _json_response(self, data: Any, status: int) -> HttpResponse:
+        """
+        Build a JSON response like jsonify does.
+
+        Args:
+            data (Any): The data to encode.
+            status (int): The HTTP status code.
+
+        Returns:
+            HttpResponse: The status, headers and body of the response.
+        """
+        content = self._encode_json(data)
+        return status, self._json_headers(content), content
+
+    def _encode_json(self, data: Any) -> bytes:
+        """
+        Encode data like jsonify does.
+
+        Args:
+            data (Any): The data to encode.
+
+        Returns:
+            bytes: The JSON body.
+        """
+        return self.app.json.response(data).get_data()
+
+    @staticmethod
+    def _json_headers(content: bytes) -> Headers:
+        """
+        Build the headers of a JSON response.
+
+        Args:
+            content (bytes): The encoded JSON body.
+
+        Returns:
+            Headers: The content type and length.
+        """
+        return [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(content)).encode()),
+        ]
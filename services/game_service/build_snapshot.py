@@ -0,0 +1,26 @@
+import logging
+import sys
+
+from ..common.arg_parser import configure_logging, parse_arguments
+from .utils.data_loader import iter_csv_game_batches
+from .utils.snapshot import default_snapshot_path, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    args = parse_arguments("game_snapshot")
+    configure_logging(args.verbose)
+
+    dataset_path = args.games_dataset
+    snapshot_path = args.snapshot_path or default_snapshot_path(dataset_path)
+
+    logger.info(f"Building a snapshot of {dataset_path} at {snapshot_path}...")
+
+    try:
+        write_snapshot(
+            iter_csv_game_batches(dataset_path), snapshot_path, source_path=dataset_path
+        )
+    except Exception as e:
+        logger.critical(f"Snapshot could not be built: {e}", exc_info=True)
+        sys.exit(1)
@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import update
+
+from ..utils.catalog_events import notify_catalog_changed
+from .database import db
+from .fts import fts_available, rebuild_fts_index
+from .models import CatalogVersion
+
+logger = logging.getLogger(__name__)
+
+CATALOG_ID = 1
+
+
+def get_catalog_version() -> int:
+    """
+    Return the current catalog version.
+
+    Returns:
+        int: The number of catalog changes so far, 0 if there were none.
+    """
+    version = db.session.get(CatalogVersion, CATALOG_ID)
+    return version.version if version else 0
+
+
+def bump_catalog_version() -> int:
+    """
+    Increment the catalog version.
+
+    Returns:
+        int: The new catalog version.
+    """
+    result = db.session.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.catalog_id == CATALOG_ID)
+        .values(version=CatalogVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.session.add(CatalogVersion(catalog_id=CATALOG_ID, version=1))
+    db.session.commit()
+    return get_catalog_version()
+
+
+def publish_catalog_change() -> None:
+    """
+    Announce that the games table was written.
+
+    Brings the full-text index in sync, bumps the catalog version for other
+    processes and notifies the listeners of this process.
+    """
+    if fts_available():
+        rebuild_fts_index()
+    version = bump_catalog_version()
+    logger.info(f"Games catalog changed, now at version {version}.")
+    notify_catalog_changed()
+
+
+class CatalogVersionWatcher:
+    """Polls the catalog version and notifies listeners about external changes."""
+
+    def __init__(self, interval: float):
+        """
+        Initialize the watcher.
+
+        Args:
+            interval (float): The minimum number of seconds between two polls.
+        """
+        self.interval = interval
+        self._version: Optional[int] = None
+        self._last_check = float("-inf")
+        self._lock = threading.Lock()
+
+    def is_due(self) -> bool:
+        """
+        Tell whether the interval since the last poll has passed.
+
+        Returns:
+            bool: True if check would poll the catalog version.
+        """
+        return time.monotonic() - self._last_check >= self.interval
+
+    def check(self) -> None:
+        """Notify listeners if the catalog version changed since the last poll."""
+        now = time.monotonic()
+        if now - self._last_check < self.interval or not self._lock.acquire(False):
+            return
+
+        try:
+            self._last_check = now
+            version = get_catalog_version()
+            if self._version is not None and version != self._version:
+                logger.info(f"Detected catalog version {version}, refreshing caches.")
+                notify_catalog_changed()
+            self._version = version
+        finally:
+            self._lock.release()
@@ -3,11 +3,15 @@ import logging
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 
+from ...common.engine import apply_sqlite_pragmas
+
 logger = logging.getLogger(__name__)
 
 db = SQLAlchemy()
 
 
 def init_db(app: Flask):
-    """Bind SQLAlchemy to the Flask app."""
+    """Bind SQLAlchemy to the Flask app and apply its SQLite pragmas."""
     db.init_app(app)
+    with app.app_context():
+        apply_sqlite_pragmas(db.engine, app.config.get("SQLITE_PRAGMAS", {}))
@@ -0,0 +1,161 @@
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from ..utils.catalog_events import on_catalog_change
+from .database import db
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "games_fts"
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+_fts_available: Optional[bool] = None
+
+
+def fts_available() -> bool:
+    """
+    Check whether the full-text index on game names exists.
+
+    The result is cached until the catalog changes, as the table is created
+    by the processes that write the catalog.
+
+    Returns:
+        bool: True if the database is SQLite and the FTS5 table was created.
+    """
+    global _fts_available
+
+    available = _fts_available
+    if available is not None:
+        return available
+
+    available = False
+    if db.engine.dialect.name == "sqlite":
+        exists = db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).first()
+        available = exists is not None
+    _fts_available = available
+    return available
+
+
+@on_catalog_change
+def _reset_fts_available() -> None:
+    """Check again whether the full-text index exists on the next search."""
+    global _fts_available
+
+    _fts_available = None
+
+
+def create_fts_table() -> bool:
+    """
+    Create the FTS5 table mirroring games.name, if it does not exist yet.
+
+    The table is an external content table: it stores only the index and
+    reads the names from the games table. A newly created table is populated
+    from the existing games.
+
+    Returns:
+        bool: True if the table exists after the call, False if the database
+            does not support FTS5.
+    """
+    if db.engine.dialect.name != "sqlite":
+        logger.info("Full-text search is only supported on SQLite.")
+        return False
+    if fts_available():
+        return True
+
+    try:
+        db.session.execute(
+            text(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                "name, content='games', content_rowid='game_id', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+        )
+    except OperationalError as e:
+        db.session.rollback()
+        logger.warning(f"Could not create the full-text index: {e}")
+        return False
+
+    _reset_fts_available()
+    rebuild_fts_index()
+    return True
+
+
+def drop_fts_table() -> None:
+    """Drop the FTS5 table if it exists."""
+    db.session.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    db.session.commit()
+    _reset_fts_available()
+
+
+def rebuild_fts_index() -> None:
+    """Rebuild the full-text index from the current content of the games table."""
+    db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    db.session.commit()
+    logger.info("Rebuilt the full-text index on game names.")
+
+
+def build_match_query(search: str) -> str:
+    """
+    Translate free text into an FTS5 query matching all words as prefixes.
+
+    Quoting every word keeps FTS5 operators and special characters in the
+    input from being interpreted.
+
+    Args:
+        search (str): The text entered by the user.
+
+    Returns:
+        str: The FTS5 MATCH expression, empty if search contains no words.
+    """
+    return " ".join(f'"{token}"*' for token in _TOKEN_PATTERN.findall(search))
+
+
+def count_fts_matches(match_query: str) -> int:
+    """
+    Count the games matching a full-text query.
+
+    Args:
+        match_query (str): An FTS5 MATCH expression.
+
+    Returns:
+        int: The number of matching games.
+    """
+    return db.session.execute(
+        text(f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :query"),
+        {"query": match_query},
+    ).scalar_one()
+
+
+def search_fts(match_query: str, limit: int, offset: int) -> List[Tuple[int, str]]:
+    """
+    Return the best ranked games matching a full-text query.
+
+    Games are ranked by bm25, ties are broken by game_id.
+
+    Args:
+        match_query (str): An FTS5 MATCH expression.
+        limit (int): The maximum number of games to return.
+        offset (int): The number of best ranked games to skip.
+
+    Returns:
+        List[Tuple[int, str]]: (game_id, name) pairs in ranking order.
+    """
+    rows = db.session.execute(
+        text(
+            f"SELECT games.game_id, games.name FROM {FTS_TABLE} "
+            f"JOIN games ON games.game_id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :query "
+            f"ORDER BY bm25({FTS_TABLE}), games.game_id "
+            "LIMIT :limit OFFSET :offset"
+        ),
+        {"query": match_query, "limit": limit, "offset": offset},
+    )
+    return [(game_id, name) for game_id, name in rows]
@@ -13,8 +13,25 @@ class Game(db.Model):
     __tablename__ = "games"
 
     game_id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(255), nullable=False)
+    name = db.Column(db.String(255), nullable=False, index=True)
 
     def to_dict(self) -> dict:
         """Convert the Game object into a dictionary."""
         return {"id": self.game_id, "name": self.name}
+
+
+class CatalogVersion(db.Model):
+    """
+    A counter that is incremented whenever the games catalog is written.
+
+    Lets processes that did not write the catalog notice changes.
+
+    Attributes:
+        catalog_id (int): The identifier of the single counter row.
+        version (int): The number of catalog changes so far.
+    """
+
+    __tablename__ = "catalog_version"
+
+    catalog_id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
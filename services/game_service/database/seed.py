@@ -1,28 +1,71 @@
-from ..utils.data_loader import load_csv
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import insert
+
+from ..utils.data_loader import LOAD_BATCH_SIZE, iter_game_batches
+from .catalog_version import publish_catalog_change
 from .database import db
 from .models import Game
 
+logger = logging.getLogger(__name__)
 
-def seed_data(dataset_path: str) -> None:
+
+def seed_data(
+    dataset_path: str,
+    batch_size: int = LOAD_BATCH_SIZE,
+    snapshot_path: Optional[str] = None,
+) -> None:
     """
     Seed the database with initial data.
 
+    The games are streamed from a fresh snapshot of the dataset if there is
+    one, or else from the dataset itself, in batches of batch_size rows.
+    Games without a name are skipped. Each batch is inserted with a single
+    executemany, so memory use is bounded by the batch size. All batches are
+    committed in one transaction, so a seed that fails midway leaves the
+    database empty and is started over on the next run.
+
     Args:
-        dataset_path (str): The path to the database URL.
+        dataset_path (str): The path to the games dataset.
+        batch_size (int): The number of games inserted per statement.
+        snapshot_path (Optional[str]): The path of the dataset's snapshot.
+            Defaults to the dataset path with the suffix .gsnap.
 
     Raises:
         FileNotFoundError: if the dataset file is not found.
         ValueError: If the dataset is empty.
     """
-    if Game.query.count() == 0:
-        games_data = load_csv(dataset_path)
-        for _, row in games_data.iterrows():
-            game = Game(
-                game_id=row["BGGId"],
-                name=row["Name"],
-            )
-            db.session.add(game)
+    if Game.query.count() > 0:
+        return
+
+    start = time.perf_counter()
+    total_rows = 0
+    skipped = 0
+    try:
+        for games in iter_game_batches(dataset_path, batch_size, snapshot_path):
+            named_games = [game for game in games if game["name"]]
+            skipped += len(games) - len(named_games)
+            if named_games:
+                db.session.execute(insert(Game.__table__), named_games)
+
+            total_rows += len(named_games)
+            logger.debug(f"Inserted {total_rows} games so far.")
         db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if skipped:
+        logger.warning(f"Skipped {skipped} games without a name.")
+
+    elapsed = time.perf_counter() - start
+    rows_per_second = total_rows / elapsed if elapsed > 0 else float("inf")
+    logger.info(
+        f"Seeded {total_rows} games in {elapsed:.2f}s ({rows_per_second:.0f} rows/s)."
+    )
+    publish_catalog_change()
 
 
 def seed_test_data() -> None:
@@ -40,3 +83,4 @@ def seed_test_data() -> None:
 
     db.session.add_all(test_games)
     db.session.commit()
+    publish_catalog_change()
@@ -0,0 +1,130 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional, TypedDict
+
+from sqlalchemy import bindparam, delete, insert, update
+
+from ..utils.data_loader import LOAD_BATCH_SIZE, iter_game_batches
+from .catalog_version import publish_catalog_change
+from .database import db
+from .models import Game
+
+logger = logging.getLogger(__name__)
+
+
+class SyncResultDict(TypedDict):
+    """A TypedDict summarizing a catalog synchronization."""
+
+    inserted: int
+    updated: int
+    deleted: int
+    unchanged: int
+    skipped: int
+
+
+def _apply_batch(
+    new_games: List[Dict[str, Any]], changed_games: List[Dict[str, Any]]
+) -> None:
+    """
+    Insert new and update changed games in one transaction.
+
+    Args:
+        new_games (List[Dict[str, Any]]): Mappings of games to insert.
+        changed_games (List[Dict[str, Any]]): Mappings of games to rename.
+    """
+    if new_games:
+        db.session.execute(insert(Game.__table__), new_games)
+    if changed_games:
+        db.session.execute(
+            update(Game.__table__)
+            .where(Game.__table__.c.game_id == bindparam("b_game_id"))
+            .values(name=bindparam("b_name")),
+            [
+                {"b_game_id": game["game_id"], "b_name": game["name"]}
+                for game in changed_games
+            ],
+        )
+    db.session.commit()
+
+
+def sync_catalog(
+    dataset_path: str,
+    batch_size: int = LOAD_BATCH_SIZE,
+    snapshot_path: Optional[str] = None,
+) -> SyncResultDict:
+    """
+    Bring the games table in line with a dataset, writing only the differences.
+
+    The dataset is streamed in batches and compared row by row with the
+    stored names, keyed by game_id. New games are inserted, renamed games are
+    updated and games missing from the dataset are deleted. Rows without a
+    name are skipped with a warning and leave their stored game as it is,
+    as they refer to it but cannot replace it. Every batch is
+    written in its own short transaction, so readers are never blocked for
+    long.
+
+    Args:
+        dataset_path (str): The path to the games dataset.
+        batch_size (int): The maximum number of games written per transaction.
+        snapshot_path (Optional[str]): The path of the dataset's snapshot, which
+            is read instead of the dataset if it is fresh.
+
+    Returns:
+        SyncResultDict: The number of inserted, updated, deleted and unchanged
+            games, and of skipped rows without a name.
+
+    Raises:
+        FileNotFoundError: if the dataset file is not found.
+        ValueError: If the dataset is empty.
+    """
+    start = time.perf_counter()
+    stored_names = dict(db.session.query(Game.game_id, Game.name))
+    db.session.commit()
+
+    result: SyncResultDict = {
+        "inserted": 0,
+        "updated": 0,
+        "deleted": 0,
+        "unchanged": 0,
+        "skipped": 0,
+    }
+    seen_game_ids = set()
+    for games in iter_game_batches(dataset_path, batch_size, snapshot_path):
+        new_games, changed_games = [], []
+        for game in games:
+            game_id = game["game_id"]
+            if game_id in seen_game_ids:
+                logger.warning(f"Skipping duplicate game_id {game_id} in dataset.")
+                continue
+            seen_game_ids.add(game_id)
+
+            stored_name = stored_names.pop(game_id, None)
+            if not game["name"]:
+                result["skipped"] += 1
+            elif stored_name is None:
+                new_games.append(game)
+            elif stored_name != game["name"]:
+                changed_games.append(game)
+            else:
+                result["unchanged"] += 1
+
+        _apply_batch(new_games, changed_games)
+        result["inserted"] += len(new_games)
+        result["updated"] += len(changed_games)
+
+    removed_game_ids = list(stored_names)
+    for offset in range(0, len(removed_game_ids), batch_size):
+        batch_end = offset + batch_size
+        batch = removed_game_ids[offset:batch_end]
+        db.session.execute(
+            delete(Game.__table__).where(Game.__table__.c.game_id.in_(batch))
+        )
+        db.session.commit()
+        result["deleted"] += len(batch)
+
+    if result["inserted"] or result["updated"] or result["deleted"]:
+        publish_catalog_change()
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Synchronized games catalog in {elapsed:.2f}s: {result}")
+    return result
@@ -24,3 +24,32 @@ class NoGamesMatchNameFilterError(Exception):
         """
         super().__init__(f"No games found containing: {name_filter}")
         self.name_filter = name_filter
+
+
+class InvalidSearchModeError(Exception):
+    """Raised when games are searched with an unsupported search mode."""
+
+    def __init__(self, match: str, reason: str):
+        """
+        Initialize the Exception.
+
+        Args:
+            match (str): The requested search mode.
+            reason (str): Why the search mode cannot be used.
+        """
+        super().__init__(f"Invalid search mode '{match}': {reason}")
+        self.match = match
+
+
+class InvalidGameIdsError(Exception):
+    """Raised when a batch of game IDs cannot be looked up."""
+
+    def __init__(self, reason: str):
+        """
+        Initialize the Exception.
+
+        Args:
+            reason (str): Why the game IDs are invalid.
+        """
+        super().__init__(f"Invalid game IDs: {reason}")
+        self.reason = reason
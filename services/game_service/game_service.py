@@ -1,11 +1,111 @@
 import logging
-from typing import List, TypedDict
+from typing import Dict, List, Optional, Tuple, TypedDict
 
+from flask_sqlalchemy.query import Query
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from ..common.cache import CacheStatsDict, LRUCache
+from .database.fts import (
+    build_match_query,
+    count_fts_matches,
+    fts_available,
+    search_fts,
+)
 from .database.models import Game
-from .exceptions import GameNotFoundError, NoGamesMatchNameFilterError
+from .exceptions import (
+    GameNotFoundError,
+    InvalidGameIdsError,
+    NoGamesMatchNameFilterError,
+)
+from .utils.catalog_events import on_catalog_change
+from .utils.memory_catalog import get_memory_catalog
+from .utils.pagination import (
+    InvalidPaginationParametersError,
+    decode_cursor,
+    encode_cursor,
+    page_offset,
+    validate_sort_key,
+)
+from .utils.search_index import NameSearchIndex, get_name_search_index
 
 logger = logging.getLogger(__name__)
 
+MAX_BATCH_GAME_IDS = 100
+
+_game_count_cache: LRUCache[int] = LRUCache(maxsize=1024)
+_game_cache: "LRUCache[GameDict]" = LRUCache(maxsize=4096, ttl=300)
+
+
+@on_catalog_change
+def _clear_game_caches() -> None:
+    """Drop cached games and counts, as they are stale after a catalog change."""
+    _game_count_cache.clear()
+    _game_cache.clear()
+
+
+def configure_game_cache(maxsize: int, ttl: Optional[float]) -> None:
+    """
+    Replace the cache of get_game with an empty cache of the given size.
+
+    Args:
+        maxsize (int): The maximum number of cached games, 0 disables the cache.
+        ttl (Optional[float]): Seconds after which a cached game expires,
+            or None to keep games until the catalog changes.
+    """
+    global _game_cache
+
+    _game_cache = LRUCache(maxsize=maxsize, ttl=ttl)
+    logger.debug(f"Configured game cache with maxsize {maxsize} and ttl {ttl}")
+
+
+def get_cached_game(game_id: int) -> Optional["GameDict"]:
+    """
+    Return a game from the cache of get_game without querying the database.
+
+    Args:
+        game_id (int): The unique ID of a board game.
+
+    Returns:
+        Optional[GameDict]: The cached game, or None if it is not cached.
+    """
+    return _game_cache.get(game_id)
+
+
+def game_cache_generation() -> int:
+    """
+    Return the generation of the cache of get_game.
+
+    Read it before fetching a game and pass it to cache_game.
+
+    Returns:
+        int: The number of times the cache was cleared.
+    """
+    return _game_cache.generation
+
+
+def cache_game(game: "GameDict", generation: Optional[int] = None) -> None:
+    """
+    Add a game fetched by another reader to the cache of get_game.
+
+    Args:
+        game (GameDict): The game.
+        generation (Optional[int]): The generation of game_cache_generation
+            read before the game was fetched. The game is not cached if the
+            catalog changed since.
+    """
+    _game_cache.put(game["id"], game, generation)
+
+
+def cache_stats() -> Dict[str, CacheStatsDict]:
+    """
+    Return the counters of the game service caches.
+
+    Returns:
+        Dict[str, CacheStatsDict]: The stats of each cache by name.
+    """
+    return {"games": _game_cache.stats(), "counts": _game_count_cache.stats()}
+
 
 class GameDict(TypedDict):
     """A TypedDict representing a board game."""
@@ -14,9 +114,278 @@ class GameDict(TypedDict):
     name: str
 
 
+class PaginatedGamesDict(TypedDict):
+    """A TypedDict representing one page of board games."""
+
+    page: int
+    limit: int
+    total: int
+    games: List[GameDict]
+
+
+class CursorPageDict(TypedDict):
+    """A TypedDict representing one page of board games of a cursor listing."""
+
+    limit: int
+    total: int
+    games: List[GameDict]
+    next_cursor: Optional[str]
+
+
+class GameBatchDict(TypedDict):
+    """A TypedDict representing the result of a batch lookup of board games."""
+
+    games: List[GameDict]
+    missing: List[int]
+
+
 class GameService:
     """A service for managing board game data."""
 
+    def _filtered_query(self, name_filter: str) -> Query:
+        """
+        Build a query for games whose name contains name_filter.
+
+        Args:
+            name_filter (str): A filter to filter games by name.
+
+        Returns:
+            Query: The filtered query. No filter is applied if name_filter is empty.
+        """
+        query = Game.query
+        if name_filter:
+            query = query.filter(Game.name.ilike(f"%{name_filter}%"))
+        return query
+
+    def _sort_columns(self, sort: str) -> Tuple[InstrumentedAttribute, ...]:
+        """
+        Return the columns that define the order of a listing.
+
+        The game_id is always the last column, so the order is total.
+
+        Args:
+            sort (str): The sort key, "id" or "name".
+
+        Returns:
+            Tuple[InstrumentedAttribute, ...]: The columns to order by.
+
+        Raises:
+            InvalidSortKeyError: If sort is not a supported sort key.
+        """
+        validate_sort_key(sort)
+        if sort == "name":
+            return Game.name, Game.game_id
+        return (Game.game_id,)
+
+    def _search_index(self, name_filter: str) -> Optional[NameSearchIndex]:
+        """
+        Return the name search index if it is enabled and can answer name_filter.
+
+        The index of the in-memory catalog is used if the catalog is enabled.
+
+        Args:
+            name_filter (str): A filter to filter games by name.
+
+        Returns:
+            Optional[NameSearchIndex]: The index, or None to query the database.
+        """
+        catalog = get_memory_catalog()
+        index = catalog.index if catalog is not None else get_name_search_index()
+        if index is not None and index.supports(name_filter):
+            return index
+        return None
+
+    def count_games(self, name_filter: str = "") -> int:
+        """
+        Count the board games that satisfy an optional name_filter.
+
+        Counts are cached per name_filter until the catalog changes.
+
+        Args:
+            name_filter (str): A filter to filter games by name.
+
+        Returns:
+            int: The number of games matching the filter.
+        """
+        index = self._search_index(name_filter)
+        if index is not None:
+            return len(index.search(name_filter))
+
+        generation = _game_count_cache.generation
+        total = _game_count_cache.get(name_filter)
+        if total is None:
+            total = self._filtered_query(name_filter).count()
+            _game_count_cache.put(name_filter, total, generation)
+            logger.debug(f"Counted {total} games for name_filter '{name_filter}'")
+        return total
+
+    def list_games_page(
+        self, name_filter: str = "", page: int = 1, limit: int = 10, sort: str = "id"
+    ) -> PaginatedGamesDict:
+        """
+        List one page of board games that satisfy an optional name_filter.
+
+        Only the rows of the requested page are fetched from the database, or
+        the page is sliced from the name search index if it is enabled.
+
+        Args:
+            name_filter (str): A filter to filter games by name.
+            page (int): The page number to retrieve.
+            limit (int): Number of games per page.
+            sort (str): Order games by "id" or "name".
+
+        Returns:
+            PaginatedGamesDict: The requested page and the total number of matches.
+
+        Raises:
+            InvalidSortKeyError: If sort is not a supported sort key.
+            NoGamesMatchNameFilterError:
+                If no games are found that match the given filter.
+            InvalidPaginationParametersError: If page or limit is smaller than 1.
+            PageExceedsDataRangeError: If the page starts beyond the matching games.
+        """
+        sort_columns = self._sort_columns(sort)
+        index = self._search_index(name_filter)
+        if index is not None:
+            positions = index.sort(index.search(name_filter), sort)
+            total = len(positions)
+        else:
+            total = self.count_games(name_filter)
+
+        if total == 0:
+            raise NoGamesMatchNameFilterError(name_filter)
+
+        offset = page_offset(page, limit, total)
+        if index is not None:
+            end = offset + limit
+            games = index.games(positions[offset:end])
+        else:
+            query = self._filtered_query(name_filter).order_by(*sort_columns)
+            games = [game.to_dict() for game in query.offset(offset).limit(limit)]
+
+        logger.debug(f"Fetched {len(games)} of {total} games for page {page}")
+        return {"page": page, "limit": limit, "total": total, "games": games}
+
+    def list_games_after(
+        self, name_filter: str = "", cursor: str = "", limit: int = 10, sort: str = "id"
+    ) -> CursorPageDict:
+        """
+        List the board games following a cursor (keyset pagination).
+
+        The page is located by a range condition on the sort columns instead of
+        an OFFSET, so every page costs the same regardless of its depth.
+
+        Args:
+            name_filter (str): A filter to filter games by name.
+            cursor (str): The next_cursor of the previous page, or an empty
+                string for the first page.
+            limit (int): Number of games per page.
+            sort (str): Order games by "id" or "name".
+
+        Returns:
+            CursorPageDict: The games of the page and the cursor of the next page,
+                which is None on the last page.
+
+        Raises:
+            InvalidSortKeyError: If sort is not a supported sort key.
+            InvalidCursorError: If the cursor cannot be decoded.
+            InvalidPaginationParametersError: If limit is smaller than 1.
+            NoGamesMatchNameFilterError:
+                If no games are found that match the given filter.
+        """
+        sort_columns = self._sort_columns(sort)
+        after = decode_cursor(cursor, sort)
+        if limit < 1:
+            raise InvalidPaginationParametersError(None, limit)
+
+        index = self._search_index(name_filter)
+        if index is not None:
+            positions = index.sort(index.search(name_filter), sort)
+            if not positions:
+                raise NoGamesMatchNameFilterError(name_filter)
+
+            start = 0 if after is None else index.index_after(positions, after, sort)
+            end = start + limit
+            page_positions = positions[start:end]
+            games = index.games(page_positions)
+            total = len(positions)
+            last_key = None
+            if end < total:
+                last_key = index.sort_key(page_positions[-1], sort)
+        else:
+            total = self.count_games(name_filter)
+            if total == 0:
+                raise NoGamesMatchNameFilterError(name_filter)
+
+            query = self._filtered_query(name_filter)
+            if after is not None:
+                query = query.filter(tuple_(*sort_columns) > tuple_(*after))
+            rows = query.order_by(*sort_columns).limit(limit + 1).all()
+            games = [game.to_dict() for game in rows[:limit]]
+            last_key = None
+            if len(rows) > limit:
+                last_key = [getattr(rows[limit - 1], col.key) for col in sort_columns]
+
+        next_cursor = None if last_key is None else encode_cursor(sort, last_key)
+
+        logger.debug(f"Fetched {len(games)} games after cursor '{cursor}'")
+        return {
+            "limit": limit,
+            "total": total,
+            "games": games,
+            "next_cursor": next_cursor,
+        }
+
+    def search_games(
+        self, search: str, page: int = 1, limit: int = 10
+    ) -> PaginatedGamesDict:
+        """
+        Search board games by the words of their name, best matches first.
+
+        Every word of search must match a word of the name as a prefix, so
+        "chess" also matches "Chessboard". Games are ranked by bm25 using the
+        FTS5 index. Without a full-text index the search falls back to a
+        substring search on the whole text.
+
+        Args:
+            search (str): The words to search for.
+            page (int): The page number to retrieve.
+            limit (int): Number of games per page.
+
+        Returns:
+            PaginatedGamesDict: The requested page and the total number of matches.
+
+        Raises:
+            NoGamesMatchNameFilterError: If no games match the search.
+            InvalidPaginationParametersError: If page or limit is smaller than 1.
+            PageExceedsDataRangeError: If the page starts beyond the matching games.
+        """
+        if not fts_available():
+            logger.warning("No full-text index available, using a substring search.")
+            return self.list_games_page(search, page, limit)
+
+        match_query = build_match_query(search)
+        if not match_query:
+            raise NoGamesMatchNameFilterError(search)
+
+        cache_key = ("fulltext", match_query)
+        generation = _game_count_cache.generation
+        total = _game_count_cache.get(cache_key)
+        if total is None:
+            total = count_fts_matches(match_query)
+            _game_count_cache.put(cache_key, total, generation)
+        if total == 0:
+            raise NoGamesMatchNameFilterError(search)
+
+        offset = page_offset(page, limit, total)
+        games = [
+            {"id": game_id, "name": name}
+            for game_id, name in search_fts(match_query, limit, offset)
+        ]
+
+        logger.debug(f"Found {total} games for full-text search '{match_query}'")
+        return {"page": page, "limit": limit, "total": total, "games": games}
+
     def list_games(self, name_filter: str = "") -> List[GameDict]:
         """
         List board games that satisfy an optional name_filter.
@@ -33,21 +402,27 @@ class GameService:
             NoGamesMatchNameFilterError:
                 If no games are found that match the given filter.
         """
-        query = Game.query
-
         logger.debug(f"name_filtering games with name containing: '{name_filter}'")
-        query = query.filter(Game.name.ilike(f"%{name_filter}%"))
-        games = query.all()
+        index = self._search_index(name_filter)
+        if index is not None:
+            games = index.games(index.search(name_filter))
+        else:
+            query = self._filtered_query(name_filter).order_by(Game.game_id)
+            games = [game.to_dict() for game in query]
+
         if not games:
             raise NoGamesMatchNameFilterError(name_filter)
 
         logger.debug(f"Found {len(games)} for name_filter {name_filter}")
-        return [game.to_dict() for game in games]
+        return games
 
     def get_game(self, game_id: int) -> GameDict:
         """
         Get board game by game_id.
 
+        Games are served from the in-memory catalog if it is enabled, or else
+        from a read-through cache, which is cleared whenever the catalog changes.
+
         Args:
             game_id (int): The unique ID of a board game.
 
@@ -57,8 +432,84 @@ class GameService:
         Raises:
             GameNotFoundError: If no game has the game_id as ID.
         """
+        catalog = get_memory_catalog()
+        if catalog is not None:
+            game = catalog.get(game_id)
+            if game is None:
+                raise GameNotFoundError(game_id=game_id)
+            return game
+
+        generation = game_cache_generation()
+        cached_game = get_cached_game(game_id)
+        if cached_game is not None:
+            return cached_game
+
         logger.debug(f"Fetching game with game_id: {game_id}")
         game = Game.query.filter_by(game_id=game_id).one_or_none()
         if not game:
             raise GameNotFoundError(game_id=game_id)
-        return game.to_dict()
+
+        game_dict = game.to_dict()
+        cache_game(game_dict, generation)
+        return game_dict
+
+    def get_games(self, game_ids: List[int]) -> GameBatchDict:
+        """
+        Get several board games by game_id.
+
+        With the in-memory catalog enabled, all games are taken from it.
+        Otherwise cached games are taken from the cache of get_game and the
+        others are fetched with a single query. Games are returned in the order of
+        game_ids, repeated IDs are returned once.
+
+        Args:
+            game_ids (List[int]): The IDs of the games, at most MAX_BATCH_GAME_IDS.
+
+        Returns:
+            GameBatchDict: The games found and the IDs of the missing games.
+
+        Raises:
+            InvalidGameIdsError: If no or too many game IDs are given.
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        if not game_ids:
+            raise InvalidGameIdsError("at least one game ID is required.")
+        if len(game_ids) > MAX_BATCH_GAME_IDS:
+            raise InvalidGameIdsError(
+                f"at most {MAX_BATCH_GAME_IDS} game IDs can be requested at once."
+            )
+
+        catalog = get_memory_catalog()
+        if catalog is not None:
+            games = catalog.get_many(game_ids)
+            found_ids = {game["id"] for game in games}
+            return {
+                "games": games,
+                "missing": [
+                    game_id for game_id in game_ids if game_id not in found_ids
+                ],
+            }
+
+        generation = _game_cache.generation
+        games_by_id = {}
+        uncached_ids = []
+        for game_id in game_ids:
+            cached_game = _game_cache.get(game_id)
+            if cached_game is None:
+                uncached_ids.append(game_id)
+            else:
+                games_by_id[game_id] = cached_game
+
+        if uncached_ids:
+            logger.debug(f"Fetching {len(uncached_ids)} games by game_id")
+            for game in Game.query.filter(Game.game_id.in_(uncached_ids)):
+                game_dict = game.to_dict()
+                _game_cache.put(game.game_id, game_dict, generation)
+                games_by_id[game.game_id] = game_dict
+
+        return {
+            "games": [
+                games_by_id[game_id] for game_id in game_ids if game_id in games_by_id
+            ],
+            "missing": [game_id for game_id in game_ids if game_id not in games_by_id],
+        }
@@ -1,19 +1,93 @@
 import logging
+from typing import Any, Hashable, List, Optional
 
 from flask import Blueprint, Response, jsonify, request
-
-from .exceptions import GameNotFoundError, NoGamesMatchNameFilterError
-from .game_service import GameService
+from werkzeug.datastructures import MultiDict
+
+from ..common.cache import LRUCache
+from .exceptions import (
+    GameNotFoundError,
+    InvalidGameIdsError,
+    InvalidSearchModeError,
+    NoGamesMatchNameFilterError,
+)
+from .game_service import GameService, cache_stats
+from .utils.catalog_events import on_catalog_change
 from .utils.pagination import (
+    InvalidCursorError,
     InvalidPaginationParametersError,
+    InvalidSortKeyError,
     PageExceedsDataRangeError,
-    paginate,
 )
 
 logger = logging.getLogger(__name__)
 
 game_routes = Blueprint("game_routes", __name__)
 
+_list_response_cache: LRUCache[bytes] = LRUCache(
+    maxsize=1024, max_bytes=64 * 1024 * 1024
+)
+
+
+@on_catalog_change
+def _clear_list_response_cache() -> None:
+    """Drop cached game lists, as they are stale after a catalog change."""
+    _list_response_cache.clear()
+
+
+def configure_list_response_cache(
+    maxsize: int, max_bytes: int = 64 * 1024 * 1024
+) -> None:
+    """
+    Replace the response cache of list_games with an empty cache of the given size.
+
+    Args:
+        maxsize (int): The maximum number of cached responses, 0 disables the cache.
+        max_bytes (int): The maximum total size of the cached responses.
+            Larger responses are not cached.
+    """
+    global _list_response_cache
+
+    _list_response_cache = LRUCache(maxsize=maxsize, max_bytes=max_bytes)
+    logger.debug(
+        f"Configured list response cache with maxsize {maxsize}, max_bytes {max_bytes}"
+    )
+
+
+def list_response_cache_key(args: MultiDict) -> Hashable:
+    """
+    Normalize the query parameters of list_games to a key of the response cache.
+
+    Args:
+        args (MultiDict): The query parameters of the request.
+
+    Returns:
+        Hashable: The search mode, name filter, page or cursor, limit and sort.
+    """
+    page = args.get("page", 1, type=int)
+    cursor = args.get("cursor")
+    position = page if cursor is None else cursor
+    return (
+        args.get("match", "substring"),
+        args.get("name", "").lower(),
+        position,
+        args.get("limit", 10, type=int),
+        args.get("sort", "id"),
+    )
+
+
+def get_cached_list_response(args: MultiDict) -> Optional[bytes]:
+    """
+    Return the cached JSON body of a list_games request, if there is one.
+
+    Args:
+        args (MultiDict): The query parameters of the request.
+
+    Returns:
+        Optional[bytes]: The encoded response, or None if it is not cached.
+    """
+    return _list_response_cache.get(list_response_cache_key(args))
+
 
 @game_routes.errorhandler(NoGamesMatchNameFilterError)
 def handle_no_games_match_name_filter(error: NoGamesMatchNameFilterError) -> Response:
@@ -75,15 +149,116 @@ def handle_page_exceeds_data_range(error: PageExceedsDataRangeError) -> Response
     return jsonify({"error": str(error)}), 404
 
 
+@game_routes.errorhandler(InvalidCursorError)
+def handle_invalid_cursor(error: InvalidCursorError) -> Response:
+    """
+    Handle the case when a pagination cursor cannot be decoded.
+
+    Args:
+        error (InvalidCursorError): Exception instance.
+
+    Returns: 422 status code.
+    """
+    logger.error(f"Invalid cursor: {error.cursor}")
+    return jsonify({"error": str(error)}), 422
+
+
+@game_routes.errorhandler(InvalidSortKeyError)
+def handle_invalid_sort_key(error: InvalidSortKeyError) -> Response:
+    """
+    Handle the case when games are requested in an unsupported order.
+
+    Args:
+        error (InvalidSortKeyError): Exception instance.
+
+    Returns: 422 status code.
+    """
+    logger.error(f"Invalid sort key: {error.sort}")
+    return jsonify({"error": str(error)}), 422
+
+
+@game_routes.errorhandler(InvalidSearchModeError)
+def handle_invalid_search_mode(error: InvalidSearchModeError) -> Response:
+    """
+    Handle the case when games are searched with an unsupported search mode.
+
+    Args:
+        error (InvalidSearchModeError): Exception instance.
+
+    Returns: 422 status code.
+    """
+    logger.error(f"Invalid search mode: {error.match}")
+    return jsonify({"error": str(error)}), 422
+
+
+@game_routes.errorhandler(InvalidGameIdsError)
+def handle_invalid_game_ids(error: InvalidGameIdsError) -> Response:
+    """
+    Handle the case when a batch of game IDs cannot be looked up.
+
+    Args:
+        error (InvalidGameIdsError): Exception instance.
+
+    Returns: 422 status code.
+    """
+    logger.error(f"Invalid game IDs: {error.reason}")
+    return jsonify({"error": str(error)}), 422
+
+
+def _parse_game_ids(values: List[Any]) -> List[int]:
+    """
+    Convert the game IDs of a batch request to integers.
+
+    Args:
+        values (List[Any]): Integers, or strings of digits from a query string.
+
+    Returns:
+        List[int]: The game IDs.
+
+    Raises:
+        InvalidGameIdsError: If a value is not an integer, or outside the
+            signed 64-bit range of database integers.
+    """
+    game_ids = []
+    for value in values:
+        if isinstance(value, str) and value.strip().isdecimal():
+            value = int(value)
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise InvalidGameIdsError(f"'{value}' is not an integer.")
+        if not -(2**63) <= value < 2**63:
+            raise InvalidGameIdsError(f"'{value}' is out of range.")
+        game_ids.append(value)
+    return game_ids
+
+
 @game_routes.route("/games", methods=["GET"])
 def list_games() -> Response:
     """
     Retrieve and return a paginated list of games.
 
+    Successful responses are cached as encoded JSON, keyed on the normalized
+    query parameters, until the catalog changes. Responses computed before a
+    catalog change are not cached after it. Streamed responses are not cached.
+
+    Pages are either addressed by number (page) or, if the cursor parameter is
+    present, by the next_cursor of the previous page. An empty cursor requests
+    the first page of a cursor listing.
+
+    By default name matches games containing it as a substring. With
+    match=fulltext, every word of name must prefix a word of the game name and
+    games are ordered by relevance; this mode supports page numbers only.
+
+    If the ids parameter is present, the listing is replaced by a batch lookup
+    of the given games, see get_games_batch.
+
     Query Parameters:
+        ids (str, optional): Comma separated game IDs to look up.
         page (int, optional): The page number to retrieve (Default is 1).
+        cursor (str, optional): The next_cursor of the previous page.
         limit (int, optional): The number of games per page (Default is 10).
         name (str, optional): A name filter to apply to the list of games.
+        sort (str, optional): Order games by "id" or "name" (Default is "id").
+        match (str, optional): "substring" or "fulltext" (Default is "substring").
 
     Returns:
         Response: A JSON response with the following structure:
@@ -93,25 +268,53 @@ def list_games() -> Response:
                 "total": <total_number_of_games>,
                 "games": <list_of_games_for_current_page>
             }
+            In cursor mode "page" is replaced by
+            "next_cursor": <cursor_of_next_page_or_null>.
     """
     logger.info("Received request to list games.")
 
+    ids = request.args.get("ids")
+    if ids is not None:
+        game_ids = _parse_game_ids(ids.split(",") if ids else [])
+        response = GameService().get_games(game_ids)
+        logger.info(f"Returning {len(response['games'])} games by ID")
+        return jsonify(response), 200
+
     page = request.args.get("page", 1, type=int)
+    cursor = request.args.get("cursor")
     limit = request.args.get("limit", 10, type=int)
     name_filter = request.args.get("name", "").lower()
-
-    games = GameService().list_games(name_filter)
-    paginated_games = paginate(games, page, limit)
-
-    response = {
-        "page": page,
-        "limit": limit,
-        "total": len(games),
-        "games": paginated_games,
-    }
-
-    logger.info(f"Returning {len(paginated_games)} games for page {page}")
-    return jsonify(response), 200
+    sort = request.args.get("sort", "id")
+    match = request.args.get("match", "substring")
+
+    if match not in ("substring", "fulltext"):
+        raise InvalidSearchModeError(match, "must be 'substring' or 'fulltext'.")
+
+    cache = _list_response_cache
+    cache_key = list_response_cache_key(request.args)
+    generation = cache.generation
+    cached_body = cache.get(cache_key)
+    if cached_body is not None:
+        logger.info("Returning cached list of games")
+        return Response(cached_body, status=200, mimetype="application/json")
+
+    if match == "fulltext":
+        if cursor is not None:
+            raise InvalidSearchModeError(match, "cursor pagination is not supported.")
+        response = GameService().search_games(name_filter, page, limit)
+        logger.info(f"Returning {len(response['games'])} ranked games for page {page}")
+    elif cursor is not None:
+        response = GameService().list_games_after(name_filter, cursor, limit, sort)
+        logger.info(f"Returning {len(response['games'])} games after cursor")
+    else:
+        response = GameService().list_games_page(name_filter, page, limit, sort)
+        logger.info(f"Returning {len(response['games'])} games for page {page}")
+
+    json_response = jsonify(response)
+    # Buffering a streamed body would defeat streaming, so it is not cached.
+    if cache.maxsize > 0 and not json_response.is_streamed:
+        cache.put(cache_key, json_response.get_data(), generation)
+    return json_response, 200
 
 
 @game_routes.route("/games/<int:game_id>", methods=["GET"])
@@ -131,3 +334,47 @@ def get_game(game_id: int) -> Response:
 
     logger.info(f"Returning game with ID {game_id}")
     return jsonify(game), 200
+
+
+@game_routes.route("/games/batch", methods=["POST"])
+def get_games_batch() -> Response:
+    """
+    Retrieve several games by ID in one request.
+
+    Games are returned in the order of the request, repeated IDs once.
+    IDs without a game are reported instead of failing the whole batch.
+
+    JSON Parameters:
+        ids (List[int]): The IDs of the games, at most 100.
+
+    Returns:
+        Response: A JSON response with the following structure:
+            {
+                "games": <list_of_found_games>,
+                "missing": <list_of_ids_without_a_game>
+            }
+    """
+    logger.info("Received request for a batch of games.")
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get("ids"), list):
+        raise InvalidGameIdsError("expected a JSON object with a list of ids.")
+
+    response = GameService().get_games(_parse_game_ids(data["ids"]))
+
+    logger.info(f"Returning {len(response['games'])} games by ID")
+    return jsonify(response), 200
+
+
+@game_routes.route("/games/cache/stats", methods=["GET"])
+def get_cache_stats() -> Response:
+    """
+    Retrieve the counters of the game service caches.
+
+    Returns:
+        Response: A JSON response with the size, maxsize, hits, misses,
+            evictions and expirations of the "games", "counts" and
+            "responses" caches.
+    """
+    logger.info("Received request for cache stats.")
+    return jsonify({**cache_stats(), "responses": _list_response_cache.stats()}), 200
@@ -0,0 +1,40 @@
+import logging
+import sys
+
+from ..common.arg_parser import configure_logging, parse_arguments
+from ..common.engine import configure_database
+from .app import create_app
+from .database.database import db, init_db
+from .database.fts import create_fts_table
+from .database.sync import sync_catalog
+
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    args = parse_arguments("game_catalog_sync")
+    configure_logging(args.verbose)
+
+    logger.info("Synchronizing the games catalog...")
+    logger.info(f"Dataset Path: {args.games_dataset}")
+    logger.info(f"Database_url: {args.database_url}")
+
+    try:
+        app = create_app(args.database_url)
+        configure_database(app, args)
+        init_db(app)
+        with app.app_context():
+            db.create_all()
+            create_fts_table()
+            result = sync_catalog(
+                args.games_dataset, args.batch_size, args.snapshot_path
+            )
+    except Exception as e:
+        logger.critical(f"Catalog synchronization failed: {e}", exc_info=True)
+        sys.exit(1)
+
+    logger.info(
+        f"Inserted {result['inserted']}, updated {result['updated']}, "
+        f"deleted {result['deleted']} games; {result['unchanged']} unchanged, "
+        f"{result['skipped']} rows without a name skipped."
+    )
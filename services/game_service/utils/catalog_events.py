@@ -0,0 +1,43 @@
+import logging
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+CatalogListener = Callable[[], None]
+
+_listeners: List[CatalogListener] = []
+
+
+def on_catalog_change(listener: CatalogListener) -> CatalogListener:
+    """
+    Register a listener that is called whenever the games catalog changes.
+
+    Can be used as a decorator.
+
+    Args:
+        listener (CatalogListener): A callable without arguments.
+
+    Returns:
+        CatalogListener: The registered listener.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+    return listener
+
+
+def remove_catalog_listener(listener: CatalogListener) -> None:
+    """
+    Unregister a listener registered with on_catalog_change.
+
+    Args:
+        listener (CatalogListener): The listener to remove.
+    """
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def notify_catalog_changed() -> None:
+    """Notify all registered listeners that the games catalog has changed."""
+    logger.debug(f"Notifying {len(_listeners)} listeners of a catalog change.")
+    for listener in _listeners:
+        listener()
@@ -1,34 +1,124 @@
+import csv
 import logging
+from typing import Iterator, Optional
 
-import pandas as pd
+from .snapshot import GameBatch, default_snapshot_path, open_fresh_snapshot
 
 logger = logging.getLogger(__name__)
 
+GAME_ID_COLUMN = "BGGId"
+NAME_COLUMN = "Name"
+LOAD_BATCH_SIZE = 10_000
 
-def load_csv(path: str) -> pd.DataFrame:
+
+def iter_csv_game_batches(
+    dataset_path: str, batch_size: int = LOAD_BATCH_SIZE
+) -> Iterator[GameBatch]:
     """
-    Load a CSV file as a pandas dataframe.
+    Stream the games of a dataset in batches of at most batch_size rows.
+
+    Only the BGGId and Name columns are converted. Rows without a name,
+    including rows too short to have one, are yielded with an empty name,
+    so the caller can tell them from games missing in the dataset. Rows
+    without an integer BGGId are skipped. Both are logged with their line.
+    The file is parsed with the csv module, so pandas is not needed. A
+    UTF-8 byte order mark is ignored.
 
     Args:
-        path (str): The file path of the CSV dataset.
+        dataset_path (str): The path to the games dataset.
+        batch_size (int): The maximum number of games per batch.
 
-    Returns:
-        pd.Dataframe: A pandas DataFrame containing the CSV data.
+    Yields:
+        GameBatch: Column mappings with the keys game_id and name, which is
+            empty for rows without a name.
 
     Raises:
-        FileNotFoundError: If the specified file is not found.
-        ValueError: If the CSV file is empty.
+        FileNotFoundError: if the dataset file is not found.
+        ValueError: If the dataset is empty or lacks the BGGId or Name column.
     """
-    logger.info(f"Attempting to load dataset from {path}")
+    logger.info(
+        f"Streaming columns {[GAME_ID_COLUMN, NAME_COLUMN]} from {dataset_path}"
+    )
 
     try:
-        df = pd.read_csv(path)
+        dataset_file = open(dataset_path, newline="", encoding="utf-8-sig")
     except FileNotFoundError as e:
-        logger.error(f"Dataset at {path} was not found.")
-        raise FileNotFoundError(f"Dataset at {path} was not found.") from e
-    except pd.errors.EmptyDataError as e:
-        logger.error(f"Dataset at {path} is empty.")
-        raise ValueError(f"Dataset at {path} is empty.") from e
-
-    logger.info(f"Dataset loaded successfully from {path}, with {len(df)} rows.")
-    return df
+        logger.error(f"Dataset at {dataset_path} was not found.")
+        raise FileNotFoundError(f"Dataset at {dataset_path} was not found.") from e
+
+    with dataset_file:
+        reader = csv.reader(dataset_file)
+        header = next(reader, None)
+        if header is None:
+            logger.error(f"Dataset at {dataset_path} is empty.")
+            raise ValueError(f"Dataset at {dataset_path} is empty.")
+        if GAME_ID_COLUMN not in header or NAME_COLUMN not in header:
+            raise ValueError(
+                f"Dataset at {dataset_path} needs the columns "
+                f"{GAME_ID_COLUMN} and {NAME_COLUMN}."
+            )
+
+        game_id_index = header.index(GAME_ID_COLUMN)
+        name_index = header.index(NAME_COLUMN)
+        batch: GameBatch = []
+        for row in reader:
+            if not row:
+                continue
+            try:
+                game_id = int(row[game_id_index])
+            except (IndexError, ValueError):
+                logger.warning(
+                    f"Skipped line {reader.line_num} of {dataset_path}: "
+                    f"{GAME_ID_COLUMN} is missing or not an integer."
+                )
+                continue
+            name = row[name_index] if name_index < len(row) else ""
+            if not name:
+                logger.warning(
+                    f"Line {reader.line_num} of {dataset_path} has no "
+                    f"{NAME_COLUMN} for game {game_id}."
+                )
+
+            batch.append({"game_id": game_id, "name": name})
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+
+def iter_game_batches(
+    dataset_path: str,
+    batch_size: int = LOAD_BATCH_SIZE,
+    snapshot_path: Optional[str] = None,
+) -> Iterator[GameBatch]:
+    """
+    Stream the games of a dataset, from its snapshot if it is fresh.
+
+    Reading a snapshot avoids parsing the CSV file. Without a fresh snapshot
+    the dataset is read with iter_csv_game_batches.
+
+    Args:
+        dataset_path (str): The path to the games dataset.
+        batch_size (int): The maximum number of games per batch.
+        snapshot_path (Optional[str]): The path of the dataset's snapshot.
+            Defaults to the dataset path with the suffix .gsnap.
+
+    Yields:
+        GameBatch: Mappings with the keys game_id and name, which is empty
+            for games without a name.
+
+    Raises:
+        FileNotFoundError: if neither the dataset nor its snapshot is found.
+        ValueError: If the dataset is empty.
+    """
+    snapshot_path = snapshot_path or default_snapshot_path(dataset_path)
+    snapshot = open_fresh_snapshot(snapshot_path, dataset_path)
+    if snapshot is None:
+        yield from iter_csv_game_batches(dataset_path, batch_size)
+        return
+
+    logger.info(f"Loading {len(snapshot)} games from snapshot {snapshot_path}")
+    with snapshot:
+        yield from snapshot.iter_batches(batch_size)
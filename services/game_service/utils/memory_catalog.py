@@ -0,0 +1,106 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..database.database import db
+from ..database.models import Game
+from .catalog_events import on_catalog_change
+from .search_index import NameSearchIndex
+
+logger = logging.getLogger(__name__)
+
+_memory_catalog: Optional["MemoryCatalog"] = None
+
+
+class MemoryCatalog:
+    """
+    An immutable in-memory copy of the games catalog.
+
+    Holds a game dictionary per game_id for lookups and a NameSearchIndex,
+    whose arrays ordered by game_id and by name serve the listings. The
+    catalog is never modified after it is built: a catalog change builds a
+    new one, which replaces the active catalog in a single assignment, so a
+    request that took a reference to the catalog reads one consistent version.
+    """
+
+    def __init__(self, games: Iterable[Tuple[int, str]]):
+        """
+        Build the catalog.
+
+        Args:
+            games (Iterable[Tuple[int, str]]): (game_id, name) pairs.
+        """
+        self.index = NameSearchIndex(games)
+        self._games: Dict[int, dict] = {
+            game["id"]: game for game in self.index.games(range(len(self.index)))
+        }
+
+    def __len__(self) -> int:
+        """Return the number of games."""
+        return len(self._games)
+
+    def get(self, game_id: int) -> Optional[dict]:
+        """
+        Look up a game by game_id.
+
+        Args:
+            game_id (int): The unique ID of a board game.
+
+        Returns:
+            Optional[dict]: The game shaped like Game.to_dict(), or None if
+                no game has the game_id.
+        """
+        return self._games.get(game_id)
+
+    def get_many(self, game_ids: List[int]) -> List[dict]:
+        """
+        Look up several games by game_id.
+
+        Args:
+            game_ids (List[int]): The IDs of the games.
+
+        Returns:
+            List[dict]: The games found, in the order of game_ids.
+        """
+        games = self._games
+        return [games[game_id] for game_id in game_ids if game_id in games]
+
+
+def build_memory_catalog() -> MemoryCatalog:
+    """
+    Load all games of the database into a new in-memory catalog.
+
+    Returns:
+        MemoryCatalog: The new catalog.
+    """
+    games = db.session.query(Game.game_id, Game.name).all()
+    catalog = MemoryCatalog(games)
+    logger.info(f"Built in-memory catalog of {len(catalog)} games.")
+    return catalog
+
+
+@on_catalog_change
+def _reload_memory_catalog() -> None:
+    """Swap in a freshly built catalog after the catalog changed."""
+    global _memory_catalog
+
+    if _memory_catalog is not None:
+        _memory_catalog = build_memory_catalog()
+
+
+def enable_memory_catalog() -> None:
+    """Serve reads from an in-memory catalog, reloaded on catalog changes."""
+    global _memory_catalog
+
+    _memory_catalog = build_memory_catalog()
+
+
+def disable_memory_catalog() -> None:
+    """Drop the in-memory catalog, so reads go to the database again."""
+    global _memory_catalog
+
+    _memory_catalog = None
+
+
+def get_memory_catalog() -> Optional[MemoryCatalog]:
+    """Return the active in-memory catalog, or None if it is disabled."""
+    return _memory_catalog
@@ -1,10 +1,17 @@
+import base64
+import binascii
+import json
 import logging
-from typing import List
-
-from ..game_service import GameDict
+from typing import List, Optional, TypeVar, Union
 
 logger = logging.getLogger(__name__)
 
+ItemType = TypeVar("ItemType")
+CursorKey = List[Union[int, str]]
+
+SORT_KEYS = ("id", "name")
+_CURSOR_KEY_TYPES = {"id": (int,), "name": (str, int)}
+
 
 class InvalidPaginationParametersError(Exception):
     """Raised when pagination parameters are invalid."""
@@ -14,13 +21,18 @@ class InvalidPaginationParametersError(Exception):
         Initialize the exception.
 
         Args:
-            page (int): The page the user wants to see.
+            page (Optional[int]): The page the user wants to see.
+                None for cursor based pagination, which has no pages.
             limit (int): The maximum amount of games per page.
         """
-        super().__init__(
-            f"Invalid pagination parameters: page={page}, "
-            f"limit={limit}. Both must be >= 1."
-        )
+        if page is None:
+            message = f"Invalid pagination parameters: limit={limit}. Must be >= 1."
+        else:
+            message = (
+                f"Invalid pagination parameters: page={page}, "
+                f"limit={limit}. Both must be >= 1."
+            )
+        super().__init__(message)
         self.page = page
         self.limit = limit
 
@@ -39,26 +51,165 @@ class PageExceedsDataRangeError(Exception):
         self.page = page
 
 
-def paginate(data: List[GameDict], page: int, limit: int) -> List[GameDict]:
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, cursor: str):
+        """
+        Initialize the exception.
+
+        Args:
+            cursor (str): The cursor sent by the client.
+        """
+        super().__init__(f"Invalid cursor: '{cursor}'.")
+        self.cursor = cursor
+
+
+class InvalidSortKeyError(Exception):
+    """Raised when games are requested in an unsupported order."""
+
+    def __init__(self, sort: str):
+        """
+        Initialize the exception.
+
+        Args:
+            sort (str): The requested sort key.
+        """
+        super().__init__(
+            f"Invalid sort key: '{sort}'. Must be one of: {', '.join(SORT_KEYS)}."
+        )
+        self.sort = sort
+
+
+def validate_sort_key(sort: str) -> None:
     """
-    Return a paginated subset of data based on the given page and limit.
+    Validate that games can be sorted by the given key.
 
     Args:
-        data (List[GameDict]): A list of game dictionary objects.
-        page (int): The page number to retrieve.
-        limit (int): Number of game dictionary objects per page.
+        sort (str): The requested sort key.
+
+    Raises:
+        InvalidSortKeyError: If sort is not one of SORT_KEYS.
+    """
+    if sort not in SORT_KEYS:
+        raise InvalidSortKeyError(sort)
+
+
+def encode_cursor(sort: str, key: CursorKey) -> str:
+    """
+    Encode the sort key values of the last item of a page as an opaque cursor.
+
+    Args:
+        sort (str): The sort key of the listing.
+        key (CursorKey): The values of the sort columns of the last item.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    payload = json.dumps({"sort": sort, "after": key}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Optional[CursorKey]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor (str): The cursor sent by the client. An empty cursor starts
+            at the beginning of the listing.
+        sort (str): The sort key of the current listing.
 
     Returns:
-        A subset of the game dictionary objects for the requested range.
+        Optional[CursorKey]: The sort key values to continue after,
+            or None for the first page.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed, was created for a
+            listing with a different sort key, or its key cannot be compared
+            with the database's names and 64-bit game IDs.
+    """
+    if not cursor:
+        return None
+
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        key = payload["after"]
+        key_types = _CURSOR_KEY_TYPES[payload["sort"]]
+        if payload["sort"] != sort:
+            raise ValueError(f"Cursor does not belong to a listing sorted by {sort}")
+        if len(key) != len(key_types) or not all(
+            isinstance(value, key_type) and not isinstance(value, bool)
+            for value, key_type in zip(key, key_types)
+        ):
+            raise ValueError(f"Cursor key {key} does not match sort key {sort}")
+        for value in key:
+            if isinstance(value, int) and not -(2**63) <= value < 2**63:
+                raise ValueError(f"Cursor value {value} is out of range")
+            if isinstance(value, str):
+                # Lone surrogates decode from JSON but cannot be sent to the database.
+                value.encode()
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Could not decode cursor '{cursor}': {e}")
+        raise InvalidCursorError(cursor) from e
+
+    return key
+
+
+def validate_pagination_parameters(page: int, limit: int) -> None:
+    """
+    Validate that page and limit are positive.
+
+    Args:
+        page (int): The page number to retrieve.
+        limit (int): Number of items per page.
+
+    Raises:
+        InvalidPaginationParametersError: If page or limit is smaller than 1.
     """
     logger.debug(f"Pagination parameters - page: {page}, limit: {limit}")
     if page < 1 or limit < 1:
         raise InvalidPaginationParametersError(page, limit)
 
-    start = (page - 1) * limit
-    end = start + limit
 
-    if start >= len(data):
+def page_offset(page: int, limit: int, total: int) -> int:
+    """
+    Return the offset of the first item on the requested page.
+
+    Args:
+        page (int): The page number to retrieve.
+        limit (int): Number of items per page.
+        total (int): Total number of items available.
+
+    Returns:
+        int: The index of the first item of the page.
+
+    Raises:
+        InvalidPaginationParametersError: If page or limit is smaller than 1.
+        PageExceedsDataRangeError: If the page starts beyond the available items.
+    """
+    validate_pagination_parameters(page, limit)
+
+    start = (page - 1) * limit
+    if start >= total:
         raise PageExceedsDataRangeError(page)
 
+    return start
+
+
+def paginate(data: List[ItemType], page: int, limit: int) -> List[ItemType]:
+    """
+    Return a paginated subset of data based on the given page and limit.
+
+    Args:
+        data (List[ItemType]): A list of items, e.g. game dictionary objects.
+        page (int): The page number to retrieve.
+        limit (int): Number of items per page.
+
+    Returns:
+        A subset of the items for the requested range.
+    """
+    start = page_offset(page, limit, len(data))
+    end = start + limit
+
     return data[start:end]
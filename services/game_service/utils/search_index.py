@@ -0,0 +1,243 @@
+import logging
+import string
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..database.database import db
+from ..database.models import Game
+from .catalog_events import on_catalog_change
+from .pagination import CursorKey
+
+logger = logging.getLogger(__name__)
+
+NGRAM_SIZE = 3
+LIKE_WILDCARDS = ("%", "_")
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+_name_search_index: Optional["NameSearchIndex"] = None
+
+
+def ascii_lower(text: str) -> str:
+    """
+    Lowercase only the ASCII letters of text, like SQLite's lower() does.
+
+    Args:
+        text (str): The text to lowercase.
+
+    Returns:
+        str: The lowercased text.
+    """
+    return text.translate(_ASCII_LOWER)
+
+
+def _ngrams(text: str, size: int) -> List[str]:
+    """
+    Return all substrings of text with the given size, in order.
+
+    Args:
+        text (str): The text to split.
+        size (int): The length of the substrings.
+
+    Returns:
+        List[str]: The substrings, possibly with duplicates.
+    """
+    return ["".join(chars) for chars in zip(*(text[offset:] for offset in range(size)))]
+
+
+class NameSearchIndex:
+    """
+    An immutable n-gram index answering substring queries on game names.
+
+    Every substring of up to NGRAM_SIZE characters of the lowercased names is
+    mapped to the positions of the games containing it. Positions refer to the
+    games ordered by game_id, so results come back in the same order as the
+    SQL listing. Matching follows SQLite's ILIKE: names and filters are compared
+    after lowercasing their ASCII letters.
+    """
+
+    def __init__(self, games: Iterable[Tuple[int, str]]):
+        """
+        Build the index.
+
+        Args:
+            games (Iterable[Tuple[int, str]]): (game_id, name) pairs.
+        """
+        rows = sorted((game_id, name) for game_id, name in games)
+        self.game_ids: List[int] = [game_id for game_id, _ in rows]
+        self.names: List[str] = [name for _, name in rows]
+        self._lowered_names = [ascii_lower(name) for name in self.names]
+
+        self._by_name = sorted(
+            range(len(rows)), key=lambda position: rows[position][::-1]
+        )
+        self._name_ranks = [0] * len(rows)
+        for rank, position in enumerate(self._by_name):
+            self._name_ranks[position] = rank
+
+        self._postings: Dict[str, List[int]] = {}
+        for position, name in enumerate(self._lowered_names):
+            ngrams = {
+                ngram
+                for size in range(1, NGRAM_SIZE + 1)
+                for ngram in _ngrams(name, size)
+            }
+            for ngram in ngrams:
+                self._postings.setdefault(ngram, []).append(position)
+
+    def __len__(self) -> int:
+        """Return the number of indexed games."""
+        return len(self.game_ids)
+
+    @staticmethod
+    def supports(name_filter: str) -> bool:
+        """
+        Check whether a filter can be answered by the index.
+
+        Filters containing LIKE wildcards are left to the database.
+
+        Args:
+            name_filter (str): A filter to filter games by name.
+
+        Returns:
+            bool: True if the index returns the same results as ILIKE.
+        """
+        return not any(wildcard in name_filter for wildcard in LIKE_WILDCARDS)
+
+    def search(self, name_filter: str) -> List[int]:
+        """
+        Find the games whose name contains name_filter.
+
+        Args:
+            name_filter (str): A filter to filter games by name.
+
+        Returns:
+            List[int]: Positions of the matching games, ordered by game_id.
+        """
+        term = ascii_lower(name_filter)
+        if not term:
+            return list(range(len(self)))
+        if len(term) <= NGRAM_SIZE:
+            return self._postings.get(term, [])
+
+        candidates = min(
+            (self._postings.get(ngram, []) for ngram in _ngrams(term, NGRAM_SIZE)),
+            key=len,
+        )
+        return [
+            position for position in candidates if term in self._lowered_names[position]
+        ]
+
+    def sort(self, positions: List[int], sort: str) -> List[int]:
+        """
+        Order positions returned by search.
+
+        The name order of all games is computed with the index, which is
+        rebuilt when the catalog changes. All games are returned in that
+        order, and large results are picked from it instead of sorted.
+
+        Args:
+            positions (List[int]): Positions ordered by game_id.
+            sort (str): The sort key, "id" or "name".
+
+        Returns:
+            List[int]: The positions in the requested order. Must not be
+                modified.
+        """
+        if sort != "name":
+            return positions
+        if len(positions) == len(self):
+            return self._by_name
+        if len(positions) * 8 > len(self):
+            selected = bytearray(len(self))
+            for position in positions:
+                selected[position] = 1
+            return [position for position in self._by_name if selected[position]]
+        return sorted(positions, key=self._name_ranks.__getitem__)
+
+    def sort_key(self, position: int, sort: str) -> CursorKey:
+        """
+        Return the values of the sort columns of the game at position.
+
+        Args:
+            position (int): The position of a game.
+            sort (str): The sort key, "id" or "name".
+
+        Returns:
+            CursorKey: The key a cursor pointing at the game is created from.
+        """
+        if sort == "name":
+            return [self.names[position], self.game_ids[position]]
+        return [self.game_ids[position]]
+
+    def index_after(self, positions: List[int], after: CursorKey, sort: str) -> int:
+        """
+        Find the index of the first position that sorts after a cursor key.
+
+        Args:
+            positions (List[int]): Positions in the order given by sort.
+            after (CursorKey): The sort key values to continue after.
+            sort (str): The sort key, "id" or "name".
+
+        Returns:
+            int: The index into positions of the first following game.
+        """
+        return bisect_right(
+            positions, after, key=lambda position: self.sort_key(position, sort)
+        )
+
+    def games(self, positions: List[int]) -> List[dict]:
+        """
+        Return game dictionaries for positions.
+
+        Args:
+            positions (List[int]): Positions of games.
+
+        Returns:
+            List[dict]: Game dictionaries shaped like Game.to_dict().
+        """
+        return [
+            {"id": self.game_ids[position], "name": self.names[position]}
+            for position in positions
+        ]
+
+
+def build_name_search_index() -> NameSearchIndex:
+    """
+    Build a search index over all games in the database.
+
+    Returns:
+        NameSearchIndex: The new index.
+    """
+    games = db.session.query(Game.game_id, Game.name).all()
+    index = NameSearchIndex(games)
+    logger.info(f"Built name search index over {len(index)} games.")
+    return index
+
+
+@on_catalog_change
+def _rebuild_name_search_index() -> None:
+    """Replace the active index after the catalog changed."""
+    global _name_search_index
+
+    if _name_search_index is not None:
+        _name_search_index = build_name_search_index()
+
+
+def enable_name_search_index() -> None:
+    """Build the name search index and keep it up to date on catalog changes."""
+    global _name_search_index
+
+    _name_search_index = build_name_search_index()
+
+
+def disable_name_search_index() -> None:
+    """Drop the name search index, so searches go to the database again."""
+    global _name_search_index
+
+    _name_search_index = None
+
+
+def get_name_search_index() -> Optional[NameSearchIndex]:
+    """Return the active name search index, or None if it is disabled."""
+    return _name_search_index
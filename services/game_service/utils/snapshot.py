@@ -0,0 +1,266 @@
+import logging
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIX = ".gsnap"
+
+_MAGIC = b"GSNAP001"
+_HEADER = struct.Struct("<8s1sxxxxxxQqQQI")
+_HEADER_SIZE = 64
+_BYTEORDER = b"L" if sys.byteorder == "little" else b"B"
+
+GameBatch = List[Dict[str, Any]]
+
+
+class InvalidSnapshotError(Exception):
+    """Raised when a file is not a readable games snapshot."""
+
+    def __init__(self, path: str, reason: str):
+        """
+        Initialize the exception.
+
+        Args:
+            path (str): The path of the snapshot file.
+            reason (str): Why the snapshot cannot be read.
+        """
+        super().__init__(f"Invalid games snapshot {path}: {reason}")
+        self.path = path
+
+
+def default_snapshot_path(dataset_path: str) -> str:
+    """
+    Return the snapshot path belonging to a dataset, e.g. data/games.gsnap.
+
+    Args:
+        dataset_path (str): The path to the games dataset.
+
+    Returns:
+        str: The default path of the dataset's snapshot.
+    """
+    return os.path.splitext(dataset_path)[0] + SNAPSHOT_SUFFIX
+
+
+def write_snapshot(
+    batches: Iterable[GameBatch], snapshot_path: str, source_path: str
+) -> int:
+    """
+    Write games to a binary snapshot file.
+
+    The file consists of a fixed size header, the game_ids as an int64 array,
+    the end offsets of the names as a uint64 array and the UTF-8 encoded names
+    as one string heap. Games are sorted by game_id. The header records the
+    modification time and size of the source dataset so stale snapshots can
+    be detected. The file is replaced atomically.
+
+    Args:
+        batches (Iterable[GameBatch]): Batches of mappings with the keys game_id
+            and name, as produced by the data loader.
+        snapshot_path (str): Where to write the snapshot.
+        source_path (str): The dataset the games were read from.
+
+    Returns:
+        int: The number of games written.
+    """
+    games = sorted(
+        (game["game_id"], game["name"].encode()) for batch in batches for game in batch
+    )
+    game_ids = array("q", (game_id for game_id, _ in games))
+    name_ends = array("Q")
+    heap = bytearray()
+    for _, name in games:
+        heap += name
+        name_ends.append(len(heap))
+
+    body = game_ids.tobytes() + name_ends.tobytes() + bytes(heap)
+    source = os.stat(source_path)
+    header = _HEADER.pack(
+        _MAGIC,
+        _BYTEORDER,
+        len(games),
+        source.st_mtime_ns,
+        source.st_size,
+        len(heap),
+        zlib.crc32(body),
+    )
+
+    temporary_path = f"{snapshot_path}.tmp"
+    with open(temporary_path, "wb") as snapshot_file:
+        snapshot_file.write(header.ljust(_HEADER_SIZE, b"\0"))
+        snapshot_file.write(body)
+    os.replace(temporary_path, snapshot_path)
+
+    logger.info(f"Wrote snapshot of {len(games)} games to {snapshot_path}")
+    return len(games)
+
+
+class GamesSnapshot:
+    """A memory-mapped, read-only view of a games snapshot file."""
+
+    def __init__(self, path: str):
+        """
+        Map a snapshot file into memory and validate it.
+
+        Args:
+            path (str): The path of the snapshot file.
+
+        Raises:
+            FileNotFoundError: If the snapshot does not exist.
+            InvalidSnapshotError: If the file is not a valid snapshot.
+        """
+        self.path = path
+        with open(path, "rb") as snapshot_file:
+            try:
+                self._mmap = mmap.mmap(
+                    snapshot_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError as e:
+                raise InvalidSnapshotError(path, "file is empty") from e
+
+        try:
+            self._load()
+        except InvalidSnapshotError:
+            self.close()
+            raise
+
+    def _load(self) -> None:
+        """Parse the header and create zero-copy views on the arrays."""
+        if len(self._mmap) < _HEADER_SIZE:
+            raise InvalidSnapshotError(self.path, "file is truncated")
+
+        (
+            magic,
+            byteorder,
+            count,
+            self.source_mtime_ns,
+            self.source_size,
+            heap_size,
+            checksum,
+        ) = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC:
+            raise InvalidSnapshotError(self.path, "unknown file format")
+        if byteorder != _BYTEORDER:
+            raise InvalidSnapshotError(self.path, "written on a different byte order")
+
+        ids_end = _HEADER_SIZE + 8 * count
+        name_ends_end = ids_end + 8 * count
+        if len(self._mmap) != name_ends_end + heap_size:
+            raise InvalidSnapshotError(self.path, "file is truncated")
+
+        view = memoryview(self._mmap)
+        if zlib.crc32(view[_HEADER_SIZE:]) != checksum:
+            view.release()
+            raise InvalidSnapshotError(self.path, "checksum mismatch")
+
+        self.game_ids = view[_HEADER_SIZE:ids_end].cast("q")
+        self._name_ends = view[ids_end:name_ends_end].cast("Q")
+        self._heap = view[name_ends_end:]
+        view.release()
+
+    def __len__(self) -> int:
+        """Return the number of games in the snapshot."""
+        return len(self.game_ids)
+
+    def __enter__(self) -> "GamesSnapshot":
+        """Return the snapshot for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the snapshot at the end of a with statement."""
+        self.close()
+
+    def name_at(self, position: int) -> str:
+        """
+        Decode the name of the game at position.
+
+        Args:
+            position (int): The position of the game, in game_id order.
+
+        Returns:
+            str: The name of the game.
+        """
+        start = self._name_ends[position - 1] if position > 0 else 0
+        end = self._name_ends[position]
+        return str(self._heap[start:end], "utf-8")
+
+    def is_fresh(self, dataset_path: str) -> bool:
+        """
+        Check whether the snapshot was created from the dataset in its current state.
+
+        Args:
+            dataset_path (str): The path to the games dataset.
+
+        Returns:
+            bool: True if the dataset's modification time and size are unchanged.
+        """
+        dataset = os.stat(dataset_path)
+        return (dataset.st_mtime_ns, dataset.st_size) == (
+            self.source_mtime_ns,
+            self.source_size,
+        )
+
+    def iter_batches(self, batch_size: int) -> Iterator[GameBatch]:
+        """
+        Yield the games in batches, shaped like the batches of the CSV loader.
+
+        Args:
+            batch_size (int): The maximum number of games per batch.
+
+        Yields:
+            GameBatch: Mappings with the keys game_id and name.
+        """
+        for start in range(0, len(self), batch_size):
+            end = min(start + batch_size, len(self))
+            yield [
+                {"game_id": self.game_ids[position], "name": self.name_at(position)}
+                for position in range(start, end)
+            ]
+
+    def close(self) -> None:
+        """Release the views and unmap the file."""
+        for view_name in ("game_ids", "_name_ends", "_heap"):
+            view = self.__dict__.pop(view_name, None)
+            if view is not None:
+                view.release()
+        self._mmap.close()
+
+
+def open_fresh_snapshot(
+    snapshot_path: str, dataset_path: str
+) -> Optional[GamesSnapshot]:
+    """
+    Open a snapshot if it exists, is valid and matches the dataset.
+
+    A snapshot without its dataset is used as is, so deployments can ship
+    only the snapshot.
+
+    Args:
+        snapshot_path (str): The path of the snapshot file.
+        dataset_path (str): The path to the games dataset.
+
+    Returns:
+        Optional[GamesSnapshot]: The open snapshot, or None if the dataset has
+            to be read instead.
+    """
+    if not os.path.exists(snapshot_path):
+        logger.debug(f"No snapshot found at {snapshot_path}")
+        return None
+
+    try:
+        snapshot = GamesSnapshot(snapshot_path)
+    except InvalidSnapshotError as e:
+        logger.warning(f"Ignoring snapshot: {e}")
+        return None
+
+    if os.path.exists(dataset_path) and not snapshot.is_fresh(dataset_path):
+        logger.info(f"Snapshot {snapshot_path} is stale, reading {dataset_path}")
+        snapshot.close()
+        return None
+
+    return snapshot
@@ -1,21 +1,44 @@
 import logging
 import sys
+from typing import Optional, Tuple
 
 from flask import Flask
 
 from ..common.arg_parser import configure_logging, parse_arguments
-from .database.database import db, init_db
+from ..common.config import JSON_PROVIDER, JSON_STREAM_MIN_ITEMS
+from ..common.engine import configure_database
+from ..common.json_provider import configure_json_provider
+from ..common.server import run_server
+from .database.database import (
+    create_missing_indexes,
+    db,
+    init_db,
+    recreate_without_rowid_reuse,
+    remove_duplicate_favorites,
+)
+from .database.models import FavoriteEvent
+from .database.favorite_counts import ensure_favorite_counts
 from .routes import user_routes
+from .utils.favorite_writer import start_favorite_group_commit
+from .utils.game_client import HttpGameClient, configure_game_client
+from .utils.recommender import enable_recommender, start_recommender_updates
 
 logger = logging.getLogger(__name__)
 
 
-def create_app(database_url: str) -> Flask:
+def create_app(
+    database_url: str,
+    json_provider: str = JSON_PROVIDER,
+    json_stream_min_items: int = JSON_STREAM_MIN_ITEMS,
+) -> Flask:
     """
     Create and configure the Flask application.
 
     Args:
         database_url (str): The database connection URL.
+        json_provider (str): The JSON encoder of responses, "orjson" or "json".
+        json_stream_min_items (int): Stream responses with a list of at least
+            this many items, 0 never streams.
 
     Returns:
         Flask: The configured Flask application instance.
@@ -25,22 +48,66 @@ def create_app(database_url: str) -> Flask:
     app = Flask(__name__)
     app.config["SQLALCHEMY_DATABASE_URI"] = database_url
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    configure_json_provider(app, json_provider, json_stream_min_items)
 
     app.register_blueprint(user_routes)
     return app
 
 
-def setup_database(app: Flask) -> None:
+def setup_database(app: Flask, recommendations: bool = False) -> None:
     """
     Initialize the database.
 
+    Databases created by older versions are migrated by adding missing
+    indexes, after removing duplicate favorites that violate them, by
+    recreating the favorite events table so its IDs are never reused, and
+    by counting the favorites of each game.
+
     Args:
         app (Flask): The Flask application instance.
+        recommendations (bool): Build the recommender from the favorites.
     """
     logger.info("Initializing database...")
     init_db(app)
     with app.app_context():
         db.create_all()
+        remove_duplicate_favorites()
+        create_missing_indexes()
+        recreate_without_rowid_reuse(FavoriteEvent.__table__)
+        ensure_favorite_counts()
+
+        if recommendations:
+            logger.info("Building recommendations...")
+            enable_recommender()
+
+
+def prepare_worker(
+    app: Flask,
+    recommendations: Optional[Tuple[float, float]] = None,
+    group_commit: Optional[Tuple[int, float]] = None,
+) -> None:
+    """
+    Prepare a process that serves requests.
+
+    Worker processes forked by the server must not reuse the database
+    connections of the parent, and threads are not inherited by them.
+
+    Args:
+        app (Flask): The Flask application instance.
+        recommendations (Optional[Tuple[float, float]]): The seconds between
+            rebuilds of the recommendations and between reads of favorite
+            events. None if recommendations are disabled.
+        group_commit (Optional[Tuple[int, float]]): The maximum batch size
+            and the delay in seconds of the group commit writer of favorites.
+            None if favorites are committed per request.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+    if recommendations is not None:
+        start_recommender_updates(app, *recommendations)
+    if group_commit is not None:
+        start_favorite_group_commit(app, *group_commit)
 
 
 if __name__ == "__main__":
@@ -54,14 +121,50 @@ if __name__ == "__main__":
     logger.info("Starting the user service...")
     logger.info("Application is configured with the following settings:")
     logger.info(f"HOST: {host}, PORT: {port}")
+    logger.info(
+        f"Server: {args.server}, workers: {args.workers}, threads: {args.threads}"
+    )
     logger.info(f"Database_url: {database_url}")
+    logger.info(
+        f"Recommendations: {args.recommendations}, "
+        f"compaction every {args.recommendation_compaction_seconds} s, "
+        f"polling every {args.recommendation_poll_seconds} s"
+    )
+    logger.info(
+        f"Group commit: {args.group_commit}, "
+        f"up to {args.group_commit_max_batch} favorites "
+        f"every {args.group_commit_seconds} s"
+    )
+    logger.info(
+        f"JSON provider: {args.json_provider}, "
+        f"streaming lists of {args.json_stream_min_items} items or more"
+    )
+    logger.info(
+        f"Game service: {args.game_service_url}, "
+        f"timeout: {args.game_service_timeout}"
+    )
 
     try:
-        app = create_app(database_url)
-
-        setup_database(app)
-
-        app.run(host=host, port=port)
+        app = create_app(database_url, args.json_provider, args.json_stream_min_items)
+        configure_database(app, args)
+
+        setup_database(app, args.recommendations)
+        configure_game_client(
+            HttpGameClient(args.game_service_url, args.game_service_timeout)
+        )
+
+        recommendations = None
+        if args.recommendations:
+            recommendations = (
+                args.recommendation_compaction_seconds,
+                args.recommendation_poll_seconds,
+            )
+        group_commit = None
+        if args.group_commit:
+            group_commit = (args.group_commit_max_batch, args.group_commit_seconds)
+        run_server(
+            app, args, lambda: prepare_worker(app, recommendations, group_commit)
+        )
     except Exception as e:
         logging.critical(f"User service could not start: {e}", exc_info=True)
         sys.exit(1)
@@ -2,6 +2,12 @@ import logging
 
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Table, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.sql.dml import Insert
+
+from ...common.engine import apply_sqlite_pragmas
 
 logger = logging.getLogger(__name__)
 
@@ -10,9 +16,100 @@ db = SQLAlchemy()
 
 def init_db(app: Flask):
     """
-    Bind SQLAlchemy to the Flask app.
+    Bind SQLAlchemy to the Flask app and apply its SQLite pragmas.
 
     Args:
         app (Flask): The Flask application instance.
     """
     db.init_app(app)
+    with app.app_context():
+        apply_sqlite_pragmas(db.engine, app.config.get("SQLITE_PRAGMAS", {}))
+
+
+def conflict_insert(table: Table) -> Insert:
+    """
+    Return an INSERT into a table that supports ON CONFLICT clauses.
+
+    Args:
+        table (Table): The table to insert into.
+
+    Returns:
+        Insert: The INSERT of the database's dialect, PostgreSQL or SQLite.
+    """
+    if db.engine.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def remove_duplicate_favorites() -> int:
+    """
+    Delete repeated favorites, keeping the first entry of each user and game.
+
+    Databases created before favorites were unique can contain duplicates,
+    which would prevent creating the unique index. Nothing is done if the
+    unique index already exists.
+
+    Returns:
+        int: The number of deleted rows.
+    """
+    index_names = {
+        index["name"] for index in inspect(db.engine).get_indexes("favorite_games")
+    }
+    if "ix_favorite_games_user_id_game_id" in index_names:
+        return 0
+
+    with db.engine.begin() as connection:
+        result = connection.execute(
+            text(
+                "DELETE FROM favorite_games WHERE favorite_id NOT IN ("
+                "SELECT MIN(favorite_id) FROM favorite_games GROUP BY user_id, game_id)"
+            )
+        )
+    if result.rowcount:
+        logger.warning(f"Removed {result.rowcount} duplicate favorite games.")
+    return result.rowcount
+
+
+def create_missing_indexes() -> None:
+    """
+    Create the indexes of the models that are missing in the database.
+
+    db.create_all() skips tables that already exist, including their indexes,
+    so indexes added to a model later are created here. IF NOT EXISTS is used
+    instead of reflection, which skips indexes on expressions.
+    """
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def recreate_without_rowid_reuse(table: Table) -> bool:
+    """
+    Recreate a SQLite table that was created without AUTOINCREMENT.
+
+    Without AUTOINCREMENT, SQLite reuses the rowids of deleted rows once the
+    table is empty, so the IDs no longer grow. The rows are dropped, so this
+    is only meant for tables whose rows are transient, like favorite events.
+
+    Args:
+        table (Table): A table declared with sqlite_autoincrement.
+
+    Returns:
+        bool: True if the table was recreated.
+    """
+    if db.engine.dialect.name != "sqlite":
+        return False
+
+    with db.engine.begin() as connection:
+        sql = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": table.name},
+        ).scalar()
+        if sql is None or "AUTOINCREMENT" in sql.upper():
+            return False
+
+        table.drop(connection)
+        table.create(connection)
+    logger.warning(f"Recreated table {table.name} with AUTOINCREMENT.")
+    return True
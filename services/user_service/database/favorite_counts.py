@@ -0,0 +1,82 @@
+import logging
+from typing import Dict
+
+from sqlalchemy import delete, func, insert, select
+
+from .database import conflict_insert, db
+from .models import FavoriteGame, GameFavoriteCount
+
+logger = logging.getLogger(__name__)
+
+
+def change_favorite_counts(deltas: Dict[int, int]) -> None:
+    """
+    Add deltas to the favorite counts of games in the current transaction.
+
+    The counts are changed with one upsert, so transactions that add the
+    first favorite of a game concurrently do not conflict on its row. Counts
+    that drop to zero are deleted. The caller commits the transaction
+    together with the change of the favorites.
+
+    Args:
+        deltas (Dict[int, int]): The change of the favorite count by game_id.
+    """
+    deltas = {game_id: delta for game_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    table = GameFavoriteCount.__table__
+    statement = conflict_insert(table)
+    new_count = table.c.favorite_count + statement.excluded.favorite_count
+    db.session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.game_id], set_={"favorite_count": new_count}
+        ),
+        [
+            {"game_id": game_id, "favorite_count": delta}
+            for game_id, delta in deltas.items()
+        ],
+    )
+    db.session.execute(
+        delete(table).where(
+            table.c.game_id.in_(list(deltas)), table.c.favorite_count <= 0
+        )
+    )
+
+
+def rebuild_favorite_counts() -> int:
+    """
+    Recompute the favorite counts of all games from the favorites.
+
+    Used to fill the counts of databases created before they were kept.
+
+    Returns:
+        int: The number of games with favorites.
+    """
+    table = GameFavoriteCount.__table__
+    with db.engine.begin() as connection:
+        connection.execute(delete(table))
+        result = connection.execute(
+            insert(table).from_select(
+                ["game_id", "favorite_count"],
+                select(FavoriteGame.game_id, func.count()).group_by(
+                    FavoriteGame.game_id
+                ),
+            )
+        )
+
+    logger.info(f"Rebuilt the favorite counts of {result.rowcount} games.")
+    return result.rowcount
+
+
+def ensure_favorite_counts() -> None:
+    """Rebuild the favorite counts if there are favorites but no counts yet."""
+    with db.engine.connect() as connection:
+        has_counts = connection.execute(
+            select(GameFavoriteCount.game_id).limit(1)
+        ).first()
+        has_favorites = connection.execute(
+            select(FavoriteGame.game_id).limit(1)
+        ).first()
+    if has_favorites and not has_counts:
+        rebuild_favorite_counts()
@@ -12,6 +12,10 @@ class User(db.Model):
     Attributes:
         user_id (int): The unique identifier for the user.
         username (str): The unique username chosen by the user.
+
+    The unique index on username serves exact lookups. The index on the
+    lowercased username and user_id serves case-insensitive prefix searches
+    as range scans, ordered like the search results.
     """
 
     __tablename__ = "users"
@@ -24,6 +28,9 @@ class User(db.Model):
         return {"user_id": self.user_id, "username": self.username}
 
 
+db.Index("ix_users_lower_username_user_id", db.func.lower(User.username), User.user_id)
+
+
 class FavoriteGame(db.Model):
     """
     Represents a board game that the user likes.
@@ -32,14 +39,93 @@ class FavoriteGame(db.Model):
         favorite_id (int): The unique identifier for the favorite game entry.
         user_id (int): The ID of the user who has marked the game as favorite.
         game_id (int): The ID of the board game marked as favorite.
+
+    A user can mark each game as favorite only once. The unique index on
+    user_id and game_id serves the favorites of a user, the index on game_id
+    the users who favored a game. favorite_id keeps the order in which games
+    were added; on SQLite it is the rowid and takes no extra space.
     """
 
     __tablename__ = "favorite_games"
+    __table_args__ = (
+        db.Index(
+            "ix_favorite_games_user_id_game_id", "user_id", "game_id", unique=True
+        ),
+    )
 
     favorite_id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=False)
-    game_id = db.Column(db.Integer, nullable=False)
+    game_id = db.Column(db.Integer, nullable=False, index=True)
 
     def to_dict(self) -> dict:
         """Convert the FavoriteGame object into a dictionary."""
         return {"user_id": self.user_id, "game_id": self.game_id}
+
+
+class GameFavoriteCount(db.Model):
+    """
+    The number of users who marked a game as favorite.
+
+    The counts are updated together with the favorite_games table, so the
+    popularity of games can be read without aggregating all favorites.
+
+    Attributes:
+        game_id (int): The ID of the board game.
+        favorite_count (int): The number of users who favor the game.
+    """
+
+    __tablename__ = "game_favorite_counts"
+    __table_args__ = (
+        db.Index(
+            "ix_game_favorite_counts_favorite_count_game_id",
+            db.desc("favorite_count"),
+            "game_id",
+        ),
+    )
+
+    game_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    favorite_count = db.Column(db.Integer, nullable=False)
+
+    def to_dict(self) -> dict:
+        """Convert the GameFavoriteCount object into a dictionary."""
+        return {"game_id": self.game_id, "favorite_count": self.favorite_count}
+
+
+class FavoriteEvent(db.Model):
+    """
+    Favorites a user added and removed in one transaction.
+
+    The events are written in the transaction that changes the favorites,
+    so every worker process can apply the changes of all workers to its
+    recommender. SQLite serializes write transactions, so event IDs follow
+    the order of the commits. The IDs are never reused, also after all
+    events were pruned.
+
+    Attributes:
+        event_id (int): The position of the event in the commit order.
+        user_id (int): The ID of the user.
+        added (List[int]): The IDs of the added games.
+        removed (List[int]): The IDs of the removed games.
+        favorites (List[int]): The user's favorites before the change.
+        created_at (float): The time of the change in seconds since the epoch.
+    """
+
+    __tablename__ = "favorite_events"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    event_id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    added = db.Column(db.JSON, nullable=False)
+    removed = db.Column(db.JSON, nullable=False)
+    favorites = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.Float, nullable=False, index=True)
+
+    def to_dict(self) -> dict:
+        """Convert the FavoriteEvent object into a dictionary."""
+        return {
+            "event_id": self.event_id,
+            "user_id": self.user_id,
+            "added": self.added,
+            "removed": self.removed,
+            "favorites": self.favorites,
+        }
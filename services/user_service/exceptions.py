@@ -26,6 +26,20 @@ class UserNotFoundError(Exception):
         self.user_id = user_id
 
 
+class UsernameNotFoundError(Exception):
+    """Raised when no user has the requested username."""
+
+    def __init__(self, username: str):
+        """
+        Initialize the exception.
+
+        Args:
+            username (str): The username that was not found.
+        """
+        super().__init__(f"User with username '{username}' not found")
+        self.username = username
+
+
 class GameAlreadyInFavoritesError(Exception):
     """
     Raised when a user tries to add a game to their favorites list.
@@ -57,3 +71,11 @@ class DatabaseError(Exception):
             message (str): A descriptive message explaining the database error.
         """
         super().__init__(self, message)
+
+
+class RecommendationsUnavailableError(Exception):
+    """Raised when recommendations are requested but the recommender is disabled."""
+
+    def __init__(self):
+        """Initialize the exception."""
+        super().__init__("Recommendations are not enabled")
@@ -1,16 +1,23 @@
 import logging
+from typing import List
 
-from flask import Blueprint, Response, jsonify
+from flask import Blueprint, Response, jsonify, request
 
 from .exceptions import (
     DatabaseError,
     GameAlreadyInFavoritesError,
+    RecommendationsUnavailableError,
     UserAlreadyExistsError,
     UserNotFoundError,
+    UsernameNotFoundError,
 )
 from .user_service import UserService
+from .utils.pagination import InvalidCursorError
 from .utils.parameter_validation import (
+    validate_json_id_lists,
     validate_json_parameters,
+    validate_limit_parameter,
+    validate_query_id_list,
     validate_query_parameters,
 )
 
@@ -62,6 +69,48 @@ def handle_user_not_found_error(error: UserNotFoundError):
     return jsonify({"error": str(error)}), 404
 
 
+@user_routes.errorhandler(UsernameNotFoundError)
+def handle_username_not_found_error(error: UsernameNotFoundError):
+    """
+    Handle case where no user has the requested username.
+
+    Args:
+        error (UsernameNotFoundError): Exception instance.
+
+    Returns: 404 status code.
+    """
+    logger.error(f"User with username '{error.username}' was not found.")
+    return jsonify({"error": str(error)}), 404
+
+
+@user_routes.errorhandler(InvalidCursorError)
+def handle_invalid_cursor(error: InvalidCursorError):
+    """
+    Handle the case when a pagination cursor cannot be decoded.
+
+    Args:
+        error (InvalidCursorError): Exception instance.
+
+    Returns: 400 status code.
+    """
+    logger.error(f"Invalid cursor: {error.cursor}")
+    return jsonify({"error": str(error)}), 400
+
+
+@user_routes.errorhandler(RecommendationsUnavailableError)
+def handle_recommendations_unavailable_error(error: RecommendationsUnavailableError):
+    """
+    Handle the case where recommendations are requested but not enabled.
+
+    Args:
+        error (RecommendationsUnavailableError): Exception instance.
+
+    Returns: 503 status code.
+    """
+    logger.error("Recommendations were requested but are not enabled.")
+    return jsonify({"error": str(error)}), 503
+
+
 @user_routes.route("/users", methods=["POST"])
 @validate_json_parameters(("username", str))
 def create_user(username) -> Response:
@@ -83,8 +132,30 @@ def create_user(username) -> Response:
 
 
 @user_routes.route("/users", methods=["GET"])
+def get_user() -> Response:
+    """
+    Get user by ID or by username.
+
+    Query Parameters:
+        user_id (int): The ID of the user to retrieve.
+        username (str): The exact username of the user to retrieve,
+            used instead of user_id.
+
+    Returns:
+        Response: JSON response containing user data.
+        Returns 400 if neither parameter is valid.
+        Returns 404 if the user is not found.
+    """
+    username = request.args.get("username")
+    if username is not None:
+        logger.info("Received request to get user by username.")
+        return jsonify(UserService().get_user_by_username(username)), 200
+
+    return _get_user_by_id()
+
+
 @validate_query_parameters(("user_id", int))
-def get_user(user_id: int) -> Response:
+def _get_user_by_id(user_id: int) -> Response:
     """
     Get user by ID.
 
@@ -101,6 +172,32 @@ def get_user(user_id: int) -> Response:
     return jsonify(user), 200
 
 
+@user_routes.route("/users/search", methods=["GET"])
+@validate_query_parameters(("prefix", str))
+@validate_limit_parameter(default=20, maximum=100)
+def search_users(prefix: str, limit: int) -> Response:
+    """
+    Find users whose username starts with a prefix, ignoring case.
+
+    Query Parameters:
+        prefix (str): The start of the usernames.
+        cursor (str, optional): The next_cursor of the previous page.
+        limit (int, optional): The number of users per page, 1 to 100
+            (Default is 20).
+
+    Returns:
+        Response: JSON response with the prefix, the limit, the users of the
+            page and the next_cursor, which is null on the last page.
+        Returns 400 if a parameter is invalid.
+    """
+    logger.debug(f"Received request to search users with prefix '{prefix}'.")
+
+    cursor = request.args.get("cursor", "")
+    page = UserService().search_users(prefix, cursor, limit)
+
+    return jsonify(page), 200
+
+
 @user_routes.route("/users/<int:user_id>/favorites", methods=["POST"])
 @validate_json_parameters(("game_id", int))
 def add_favorite_game(game_id: int, user_id: int) -> Response:
@@ -137,6 +234,34 @@ def add_favorite_game(game_id: int, user_id: int) -> Response:
     return jsonify(favorite_game), 200
 
 
+@user_routes.route("/users/<int:user_id>/favorites/bulk", methods=["POST"])
+@validate_json_id_lists("add", "remove")
+def update_favorite_games(user_id: int, add: List[int], remove: List[int]) -> Response:
+    """
+    Add and remove many favorite games of a user in one request.
+
+    Args:
+        user_id (int): The ID of the user.
+        add (List[int]): The IDs of the games to add to favorites.
+        remove (List[int]): The IDs of the games to remove from favorites.
+
+    Returns:
+        Response: JSON response with the user_id and the status of every
+            change under "results".
+        Returns 400 if the lists are invalid.
+        Returns 404 if the user is not found.
+        Returns 500 for a database error.
+    """
+    logger.info(
+        f"Updating favorite games of user {user_id}: "
+        f"adding {len(add)}, removing {len(remove)}"
+    )
+
+    results = UserService().update_favorite_games(user_id, add, remove)
+
+    return jsonify({"user_id": user_id, "results": results}), 200
+
+
 @user_routes.route("/users/<int:user_id>/favorites", methods=["GET"])
 def get_favorite_games(user_id: int) -> Response:
     """
@@ -145,16 +270,146 @@ def get_favorite_games(user_id: int) -> Response:
     Args:
         user_id (int): The ID of a user.
 
+    Query Parameters:
+        hydrate (str, optional): "true" to include the name of each game,
+            looked up from the game service (Default is "false").
+
     Returns:
         Response: JSON response containing the list of favorite games.
         Returns 400 if the user is not found.
     """
     logger.debug("Received request to list favorite games of user.")
 
+    hydrate = request.args.get("hydrate", "false").lower() == "true"
+
     try:
-        favorite_games = UserService().get_favorite_games(user_id)
+        if hydrate:
+            favorite_games = UserService().get_hydrated_favorite_games(user_id)
+        else:
+            favorite_games = UserService().get_favorite_games(user_id)
 
     except UserNotFoundError as e:
         return jsonify({"error": str(e)}), 400
 
     return jsonify(favorite_games), 200
+
+
+@user_routes.route("/favorites/games/<int:game_id>/count", methods=["GET"])
+def get_favorite_count(game_id: int) -> Response:
+    """
+    Retrieve how many users favor a game.
+
+    Args:
+        game_id (int): The ID of the game.
+
+    Returns:
+        Response: JSON response with the game_id and its favorite_count.
+    """
+    logger.debug(f"Received request for the favorite count of game {game_id}.")
+
+    counts = UserService().get_favorite_counts([game_id])
+
+    return jsonify({"game_id": game_id, "favorite_count": counts[game_id]}), 200
+
+
+@user_routes.route("/favorites/games/counts", methods=["GET"])
+@validate_query_id_list("game_ids")
+def get_favorite_counts(game_ids: List[int]) -> Response:
+    """
+    Retrieve how many users favor each of several games.
+
+    Query Parameters:
+        game_ids (str): Comma separated IDs of at most 1000 games.
+
+    Returns:
+        Response: JSON response with a list of game_id and favorite_count
+            pairs under "counts", in request order.
+        Returns 400 if the game IDs are invalid.
+    """
+    logger.debug(f"Received request for the favorite counts of {len(game_ids)} games.")
+
+    counts = UserService().get_favorite_counts(game_ids)
+
+    return (
+        jsonify(
+            {
+                "counts": [
+                    {"game_id": game_id, "favorite_count": favorite_count}
+                    for game_id, favorite_count in counts.items()
+                ]
+            }
+        ),
+        200,
+    )
+
+
+@user_routes.route("/favorites/games/top", methods=["GET"])
+@validate_limit_parameter(default=10, maximum=100)
+def get_most_favorited_games(limit: int) -> Response:
+    """
+    Retrieve the games with the most favorites.
+
+    Query Parameters:
+        limit (int, optional): The number of games, 1 to 100 (Default is 10).
+
+    Returns:
+        Response: JSON response with a list of game_id and favorite_count
+            pairs under "games", most favored first.
+        Returns 400 if the limit is invalid.
+    """
+    logger.debug(f"Received request for the {limit} most favored games.")
+
+    games = UserService().get_most_favorited_games(limit)
+
+    return jsonify({"games": games}), 200
+
+
+@user_routes.route("/favorites/games/<int:game_id>/users", methods=["GET"])
+@validate_limit_parameter(default=100, maximum=1000)
+def get_game_favoriters(game_id: int, limit: int) -> Response:
+    """
+    Retrieve the users who favor a game.
+
+    Args:
+        game_id (int): The ID of the game.
+
+    Query Parameters:
+        limit (int, optional): The maximum number of users, 1 to 1000
+            (Default is 100).
+
+    Returns:
+        Response: JSON response with the game_id, its favorite_count and the
+            user_ids of the first users who favored it.
+        Returns 400 if the limit is invalid.
+    """
+    logger.debug(f"Received request for the users who favor game {game_id}.")
+
+    favoriters = UserService().get_game_favoriters(game_id, limit)
+
+    return jsonify(favoriters), 200
+
+
+@user_routes.route("/users/<int:user_id>/recommendations", methods=["GET"])
+@validate_limit_parameter(default=10, maximum=100)
+def get_recommendations(user_id: int, limit: int) -> Response:
+    """
+    Recommend games based on the games favored together with the user's favorites.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Query Parameters:
+        limit (int, optional): The number of games, 1 to 100 (Default is 10).
+
+    Returns:
+        Response: JSON response with the user_id and a list of game_id and
+            score pairs under "recommendations", best first.
+        Returns 400 if the limit is invalid.
+        Returns 404 if the user is not found.
+        Returns 503 if recommendations are not enabled.
+    """
+    logger.debug(f"Received request for recommendations for user {user_id}.")
+
+    recommendations = UserService().get_recommendations(user_id, limit)
+
+    return jsonify({"user_id": user_id, "recommendations": recommendations}), 200
@@ -1,16 +1,38 @@
 import logging
-from typing import List, TypedDict
-
+from typing import Dict, List, Optional, TypedDict
+
+from sqlalchemy import (
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+)
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
-from .database.database import db
-from .database.models import FavoriteGame, User
+from .database.database import conflict_insert, db
+from .database.favorite_counts import change_favorite_counts
+from .database.models import FavoriteGame, GameFavoriteCount, User
 from .exceptions import (
     DatabaseError,
     GameAlreadyInFavoritesError,
+    RecommendationsUnavailableError,
     UserAlreadyExistsError,
     UserNotFoundError,
+    UsernameNotFoundError,
 )
+from .utils.favorite_events import record_favorite_changes
+from .utils.favorite_writer import get_favorite_writer
+from .utils.game_client import GameServiceUnavailableError, get_game_client
+from .utils.pagination import (
+    ascii_lower,
+    decode_cursor,
+    encode_cursor,
+    prefix_upper_bound,
+)
+from .utils.recommender import RecommendationDict, get_recommender
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +44,15 @@ class UserDict(TypedDict):
     username: str
 
 
+class UserSearchPageDict(TypedDict):
+    """A TypedDict representing one page of users whose username has a prefix."""
+
+    prefix: str
+    limit: int
+    users: List[UserDict]
+    next_cursor: Optional[str]
+
+
 class FavoriteGameDict(TypedDict):
     """A TypedDict representing a user's favorite game."""
 
@@ -29,6 +60,35 @@ class FavoriteGameDict(TypedDict):
     game_id: int
 
 
+class FavoriteGameChangeDict(TypedDict):
+    """A TypedDict representing the outcome of one change of a bulk update."""
+
+    game_id: int
+    action: str
+    status: str
+
+
+class GameFavoriteCountDict(TypedDict):
+    """A TypedDict representing the number of users who favor a game."""
+
+    game_id: int
+    favorite_count: int
+
+
+class GameFavoritersDict(TypedDict):
+    """A TypedDict representing the users who favor a game."""
+
+    game_id: int
+    favorite_count: int
+    user_ids: List[int]
+
+
+class HydratedFavoriteGameDict(FavoriteGameDict):
+    """A TypedDict representing a user's favorite game with the game's name."""
+
+    name: Optional[str]
+
+
 class UserService:
     """A service for managing user data."""
 
@@ -103,10 +163,101 @@ class UserService:
         logger.debug(f"Found user '{user.username}' with user_id: {user.user_id}")
         return user.to_dict()
 
+    def get_user_by_username(self, username: str) -> UserDict:
+        """
+        Retrieve a user by the exact username.
+
+        Args:
+            username (str): The username of the user.
+
+        Returns:
+            UserDict: A dictionary containing the user's details.
+
+        Raises:
+            UsernameNotFoundError: If no user has the username.
+        """
+        logger.debug(f"Fetching user with username: '{username}'")
+
+        user = db.session.execute(
+            select(User).where(User.username == username)
+        ).scalar_one_or_none()
+        if user is None:
+            logger.warning(f"User with username '{username}' not found.")
+            raise UsernameNotFoundError(username)
+
+        return user.to_dict()
+
+    def search_users(
+        self, prefix: str, cursor: str = "", limit: int = 20
+    ) -> UserSearchPageDict:
+        """
+        List the users whose username starts with a prefix, ignoring case.
+
+        Users are ordered by lowercased username and user_id. The prefix and
+        the cursor become range conditions on the index of these columns, so
+        every page is a short index scan regardless of the number of users.
+
+        Args:
+            prefix (str): The start of the usernames.
+            cursor (str): The next_cursor of the previous page, or an empty
+                string for the first page.
+            limit (int): The number of users per page.
+
+        Returns:
+            UserSearchPageDict: The users of the page and the cursor of the
+                next page, which is None on the last page.
+
+        Raises:
+            InvalidCursorError: If the cursor cannot be decoded.
+        """
+        after = decode_cursor(cursor)
+        # Lowercase like the index does. SQLite's lower() only folds ASCII,
+        # other databases may also fold the letters of non-ASCII prefixes.
+        if prefix.isascii() or db.engine.dialect.name == "sqlite":
+            lower_prefix = ascii_lower(prefix)
+        else:
+            lower_prefix = db.session.execute(select(func.lower(prefix))).scalar_one()
+        lower_username = func.lower(User.username)
+
+        query = select(User.user_id, User.username, lower_username)
+        if after is not None:
+            query = query.where(tuple_(lower_username, User.user_id) > tuple_(*after))
+        if lower_prefix:
+            query = query.where(lower_username >= lower_prefix)
+        upper_bound = prefix_upper_bound(lower_prefix)
+        if upper_bound is not None:
+            query = query.where(lower_username < upper_bound)
+        query = query.order_by(lower_username, User.user_id).limit(limit + 1)
+
+        rows = db.session.execute(query).all()
+        users: List[UserDict] = [
+            {"user_id": user_id, "username": username}
+            for user_id, username, _ in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            _, _, last_lower_username = rows[limit - 1]
+            next_cursor = encode_cursor((last_lower_username, users[-1]["user_id"]))
+
+        logger.debug(f"Found {len(users)} users with prefix '{prefix}'")
+        return {
+            "prefix": prefix,
+            "limit": limit,
+            "users": users,
+            "next_cursor": next_cursor,
+        }
+
     def add_favorite_game(self, user_id: int, game_id: int) -> FavoriteGameDict:
         """
         Add a game to a user's favorite games.
 
+        The favorite is inserted with a single statement that only inserts a
+        row if the user exists. A second favorite of the same game violates
+        the unique index on user_id and game_id. The favorite count of the
+        game is incremented in the same transaction. With group commit
+        enabled, the favorite is written together with those of concurrent
+        requests instead, and the call returns after that transaction commits.
+
         Args:
             user_id (int): The unique ID of the user.
             game_id (int): The unique ID of the game.
@@ -119,17 +270,28 @@ class UserService:
             GameAlreadyFavored: If the game is already favored by the user.
             DatabaseError: If a database error occurs.
         """
-        self._ensure_user(user_id)
-
-        if FavoriteGame.query.filter_by(user_id=user_id, game_id=game_id).first():
-            logging.warning(f"User {user_id} has already favored game {game_id}")
-            raise GameAlreadyInFavoritesError(user_id, game_id)
-
-        favorite_game = FavoriteGame(user_id=user_id, game_id=game_id)
+        writer = get_favorite_writer()
+        if writer is not None:
+            return writer.submit(user_id, game_id)
+
+        statement = insert(FavoriteGame).from_select(
+            ["user_id", "game_id"],
+            select(literal(user_id), literal(game_id)).where(
+                exists().where(User.user_id == user_id)
+            ),
+        )
         try:
-            db.session.add(favorite_game)
+            result = db.session.execute(statement)
+            if result.rowcount:
+                change_favorite_counts({game_id: 1})
+                record_favorite_changes({user_id: [game_id]})
             db.session.commit()
 
+        except IntegrityError as e:
+            db.session.rollback()
+            logging.warning(f"User {user_id} has already favored game {game_id}")
+            raise GameAlreadyInFavoritesError(user_id, game_id) from e
+
         except SQLAlchemyError as e:
             db.session.rollback()
             logger.error(f"Error adding favorite game {game_id} to user {user_id}: {e}")
@@ -137,13 +299,113 @@ class UserService:
                 f"Failed to add favorite game {game_id} to user {user_id}"
             ) from e
 
+        if result.rowcount == 0:
+            logger.warning(f"User with user_id {user_id} not found.")
+            raise UserNotFoundError(user_id)
+
         logger.info(f"Favorite Game with game_id {game_id} was added to user {user_id}")
-        return favorite_game.to_dict()
+        return {"user_id": user_id, "game_id": game_id}
+
+    def update_favorite_games(
+        self, user_id: int, add: List[int], remove: List[int]
+    ) -> List[FavoriteGameChangeDict]:
+        """
+        Add and remove many favorite games of a user in one transaction.
+
+        Removals are applied before additions. Games that are already favored
+        are skipped instead of aborting the update, as are removals of games
+        that are not favored, including games added or removed by concurrent
+        requests meanwhile. Rows are written with one statement per action,
+        and the statuses and favorite counts follow the rows the statements
+        actually inserted and deleted.
+
+        Args:
+            user_id (int): The unique ID of the user.
+            add (List[int]): The IDs of the games to add.
+            remove (List[int]): The IDs of the games to remove.
+
+        Returns:
+            List[FavoriteGameChangeDict]: The status of every requested change,
+                removals first, in request order. The status is "removed" or
+                "not_in_favorites" for removals and "added" or
+                "already_in_favorites" for additions.
+
+        Raises:
+            UserNotFoundError: If the user does not exist.
+            DatabaseError: If a database error occurs.
+        """
+        self._ensure_user(user_id)
+
+        table = FavoriteGame.__table__
+        remove_ids = list(dict.fromkeys(remove))
+        add_ids = list(dict.fromkeys(add))
+        try:
+            removed_ids = []
+            if remove_ids:
+                removed_ids = list(
+                    db.session.execute(
+                        delete(table)
+                        .where(
+                            table.c.user_id == user_id, table.c.game_id.in_(remove_ids)
+                        )
+                        .returning(table.c.game_id)
+                    ).scalars()
+                )
+            added_ids = []
+            if add_ids:
+                added_ids = list(
+                    db.session.execute(
+                        conflict_insert(table)
+                        .on_conflict_do_nothing(
+                            index_elements=[table.c.user_id, table.c.game_id]
+                        )
+                        .returning(table.c.game_id),
+                        [
+                            {"user_id": user_id, "game_id": game_id}
+                            for game_id in add_ids
+                        ],
+                    ).scalars()
+                )
+            deltas = dict.fromkeys(removed_ids, -1)
+            for game_id in added_ids:
+                deltas[game_id] = deltas.get(game_id, 0) + 1
+            change_favorite_counts(deltas)
+            record_favorite_changes({user_id: added_ids}, {user_id: removed_ids})
+            db.session.commit()
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error updating favorite games of user {user_id}: {e}")
+            raise DatabaseError(
+                f"Failed to update favorite games of user {user_id}"
+            ) from e
+
+        changes: List[FavoriteGameChangeDict] = []
+        pending_removals = set(removed_ids)
+        for game_id in remove:
+            status = "removed" if game_id in pending_removals else "not_in_favorites"
+            pending_removals.discard(game_id)
+            changes.append({"game_id": game_id, "action": "remove", "status": status})
+        pending_additions = set(added_ids)
+        for game_id in add:
+            status = "added" if game_id in pending_additions else "already_in_favorites"
+            pending_additions.discard(game_id)
+            changes.append({"game_id": game_id, "action": "add", "status": status})
+
+        logger.info(
+            f"Added {len(added_ids)} and removed {len(removed_ids)} "
+            f"favorite games of user {user_id}"
+        )
+        return changes
 
     def get_favorite_games(self, user_id: int) -> List[FavoriteGameDict]:
         """
         Retrieve a user's favorite games.
 
+        The user and the favorites are read with a single outer join, so a
+        user without favorites yields one row without a game_id. Favorites
+        are returned in the order they were added.
+
         Args:
             user_id (int): The unique ID of the user.
 
@@ -154,9 +416,162 @@ class UserService:
         Raises:
             UserNotFoundError: If the user does not exist.
         """
-        self._ensure_user(user_id)
+        statement = (
+            select(FavoriteGame.game_id)
+            .select_from(User)
+            .outerjoin(FavoriteGame, FavoriteGame.user_id == User.user_id)
+            .where(User.user_id == user_id)
+            .order_by(FavoriteGame.favorite_id)
+        )
+        game_ids = db.session.execute(statement).scalars().all()
+        if not game_ids:
+            logger.warning(f"User with user_id {user_id} not found.")
+            raise UserNotFoundError(user_id)
 
-        favorite_games = FavoriteGame.query.filter_by(user_id=user_id).all()
+        favorite_games: List[FavoriteGameDict] = [
+            {"user_id": user_id, "game_id": game_id}
+            for game_id in game_ids
+            if game_id is not None
+        ]
 
         logger.debug(f"Found {len(favorite_games)} favorite games of user {user_id}")
-        return [game.to_dict() for game in favorite_games]
+        return favorite_games
+
+    def get_hydrated_favorite_games(
+        self, user_id: int
+    ) -> List[HydratedFavoriteGameDict]:
+        """
+        Retrieve a user's favorite games together with the names of the games.
+
+        All names are looked up with one batched call to the game service.
+        If the game service is unavailable or does not know a game, its name
+        is None, so the favorites can still be shown.
+
+        Args:
+            user_id (int): The unique ID of the user.
+
+        Returns:
+            List[HydratedFavoriteGameDict]: A list of dictionaries containing
+                the ID of the user and the game and the name of the game.
+
+        Raises:
+            UserNotFoundError: If the user does not exist.
+        """
+        favorite_games = self.get_favorite_games(user_id)
+
+        game_names = {}
+        game_client = get_game_client()
+        if game_client is not None and favorite_games:
+            try:
+                game_names = game_client.get_game_names(
+                    game["game_id"] for game in favorite_games
+                )
+            except GameServiceUnavailableError as e:
+                logger.warning(f"Could not look up favorite games of {user_id}: {e}")
+
+        return [
+            {**game, "name": game_names.get(game["game_id"])} for game in favorite_games
+        ]
+
+    def get_favorite_counts(self, game_ids: List[int]) -> Dict[int, int]:
+        """
+        Retrieve how many users favor each of several games.
+
+        The counts are read from the counter table with one primary key
+        lookup per game.
+
+        Args:
+            game_ids (List[int]): The IDs of the games.
+
+        Returns:
+            Dict[int, int]: The favorite count by game ID, 0 for games that
+                nobody favors.
+        """
+        counts = dict.fromkeys(game_ids, 0)
+        if counts:
+            counts.update(
+                db.session.execute(
+                    select(
+                        GameFavoriteCount.game_id, GameFavoriteCount.favorite_count
+                    ).where(GameFavoriteCount.game_id.in_(list(counts)))
+                ).all()
+            )
+        return counts
+
+    def get_most_favorited_games(self, limit: int) -> List[GameFavoriteCountDict]:
+        """
+        Retrieve the games with the most favorites.
+
+        The games are read in the order of the index on the favorite count,
+        so only limit rows are visited. Ties are ordered by game_id.
+
+        Args:
+            limit (int): The number of games.
+
+        Returns:
+            List[GameFavoriteCountDict]: The games and their favorite counts,
+                most favored first.
+        """
+        game_counts = GameFavoriteCount.query.order_by(
+            GameFavoriteCount.favorite_count.desc(), GameFavoriteCount.game_id
+        ).limit(limit)
+        return [game_count.to_dict() for game_count in game_counts]
+
+    def get_game_favoriters(self, game_id: int, limit: int) -> GameFavoritersDict:
+        """
+        Retrieve the users who favor a game.
+
+        Args:
+            game_id (int): The ID of the game.
+            limit (int): The maximum number of user IDs returned.
+
+        Returns:
+            GameFavoritersDict: The favorite count of the game and the IDs of
+                the first users who favored it, in the order they did.
+        """
+        user_ids = (
+            db.session.execute(
+                select(FavoriteGame.user_id)
+                .where(FavoriteGame.game_id == game_id)
+                .order_by(FavoriteGame.favorite_id)
+                .limit(limit)
+            )
+            .scalars()
+            .all()
+        )
+        favorite_count = self.get_favorite_counts([game_id])[game_id]
+
+        logger.debug(f"Found {favorite_count} users who favor game {game_id}")
+        return {
+            "game_id": game_id,
+            "favorite_count": favorite_count,
+            "user_ids": user_ids,
+        }
+
+    def get_recommendations(self, user_id: int, limit: int) -> List[RecommendationDict]:
+        """
+        Recommend games that are often favored together with the user's favorites.
+
+        Args:
+            user_id (int): The unique ID of the user.
+            limit (int): The maximum number of recommendations.
+
+        Returns:
+            List[RecommendationDict]: The IDs and scores of the recommended
+                games, best first. Empty if the user has no favorites.
+
+        Raises:
+            UserNotFoundError: If the user does not exist.
+            RecommendationsUnavailableError: If the recommender is disabled.
+        """
+        recommender = get_recommender()
+        if recommender is None:
+            raise RecommendationsUnavailableError()
+
+        favorite_games = self.get_favorite_games(user_id)
+        recommendations = recommender.recommend(
+            (game["game_id"] for game in favorite_games), limit
+        )
+
+        logger.debug(f"Recommending {len(recommendations)} games to user {user_id}")
+        return recommendations
@@ -0,0 +1,136 @@
+import logging
+import time
+from typing import Dict, List, Optional, Set, TypedDict
+
+from sqlalchemy import delete, func, insert, select
+
+from ..database.database import db
+from ..database.models import FavoriteEvent, FavoriteGame
+
+logger = logging.getLogger(__name__)
+
+_recording = False
+
+
+class FavoriteEventDict(TypedDict):
+    """
+    A TypedDict representing the favorites a user added and removed at once.
+
+    favorites holds the user's favorites before the change, as read in the
+    transaction that made it.
+    """
+
+    event_id: int
+    user_id: int
+    added: List[int]
+    removed: List[int]
+    favorites: List[int]
+
+
+def enable_favorite_events() -> None:
+    """Start recording favorite events with every change of favorites."""
+    global _recording
+
+    _recording = True
+
+
+def disable_favorite_events() -> None:
+    """Stop recording favorite events."""
+    global _recording
+
+    _recording = False
+
+
+def record_favorite_changes(
+    added: Dict[int, List[int]], removed: Optional[Dict[int, List[int]]] = None
+) -> None:
+    """
+    Record changes of users' favorites in the current transaction.
+
+    Called after the changes are written and before they are committed, so
+    the events are committed together with the changes, and the favorites
+    are exactly those the change started from. Nothing is recorded if
+    favorite events are disabled.
+
+    Args:
+        added (Dict[int, List[int]]): The IDs of the added games by user_id.
+        removed (Optional[Dict[int, List[int]]]): The IDs of the removed games
+            by user_id.
+    """
+    removed = removed or {}
+    user_ids = {user_id for user_id, game_ids in added.items() if game_ids}
+    user_ids.update(user_id for user_id, game_ids in removed.items() if game_ids)
+    if not _recording or not user_ids:
+        return
+
+    favorites: Dict[int, Set[int]] = {user_id: set() for user_id in user_ids}
+    rows = db.session.execute(
+        select(FavoriteGame.user_id, FavoriteGame.game_id).where(
+            FavoriteGame.user_id.in_(user_ids)
+        )
+    )
+    for user_id, game_id in rows:
+        favorites[user_id].add(game_id)
+
+    created_at = time.time()
+    events = []
+    for user_id in sorted(user_ids):
+        user_added = list(added.get(user_id, ()))
+        user_removed = list(removed.get(user_id, ()))
+        before = favorites[user_id].difference(user_added).union(user_removed)
+        events.append(
+            {
+                "user_id": user_id,
+                "added": user_added,
+                "removed": user_removed,
+                "favorites": sorted(before),
+                "created_at": created_at,
+            }
+        )
+    db.session.execute(insert(FavoriteEvent), events)
+
+
+def read_favorite_events(after_event_id: int) -> List[FavoriteEventDict]:
+    """
+    Read the committed favorite events in the order of their commits.
+
+    Args:
+        after_event_id (int): The ID of the last event already applied.
+
+    Returns:
+        List[FavoriteEventDict]: The events with a greater ID.
+    """
+    events = db.session.scalars(
+        select(FavoriteEvent)
+        .where(FavoriteEvent.event_id > after_event_id)
+        .order_by(FavoriteEvent.event_id)
+    )
+    return [event.to_dict() for event in events]
+
+
+def latest_favorite_event_id() -> int:
+    """
+    Return the ID of the last committed favorite event.
+
+    Returns:
+        int: The ID, 0 if no event was recorded.
+    """
+    return db.session.scalar(select(func.coalesce(func.max(FavoriteEvent.event_id), 0)))
+
+
+def prune_favorite_events(before: float) -> int:
+    """
+    Delete favorite events that every worker has applied.
+
+    Args:
+        before (float): Events created before this time in seconds since
+            the epoch are deleted.
+
+    Returns:
+        int: The number of deleted events.
+    """
+    result = db.session.execute(
+        delete(FavoriteEvent).where(FavoriteEvent.created_at < before)
+    )
+    db.session.commit()
+    return result.rowcount
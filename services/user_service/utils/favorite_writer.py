@@ -0,0 +1,312 @@
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from flask import Flask
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from ..database.database import db
+from ..database.favorite_counts import change_favorite_counts
+from ..database.models import FavoriteGame, User
+from ..exceptions import DatabaseError, GameAlreadyInFavoritesError, UserNotFoundError
+from .favorite_events import record_favorite_changes
+
+logger = logging.getLogger(__name__)
+
+_favorite_writer: Optional["FavoriteGroupWriter"] = None
+
+SUBMIT_TIMEOUT_SECONDS = 30.0
+
+
+class _PendingFavorite:
+    """A favorite waiting to be written, and the outcome its request waits for."""
+
+    def __init__(self, user_id: int, game_id: int):
+        """
+        Initialize the pending favorite.
+
+        Args:
+            user_id (int): The unique ID of the user.
+            game_id (int): The unique ID of the game.
+        """
+        self.user_id = user_id
+        self.game_id = game_id
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+
+class FavoriteGroupWriter:
+    """
+    Writes the favorites of concurrent requests in shared transactions.
+
+    Requests put their favorite into a queue and wait. A background thread
+    takes the first waiting favorite, collects more for up to max_delay
+    seconds or until max_batch favorites are collected, and inserts them
+    with one statement in one transaction. Every request is answered after
+    the commit of its batch, so a batch of favorites costs a single commit.
+    Missing users and repeated favorites fail only their own request.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        max_batch: int,
+        max_delay: float,
+        timeout: float = SUBMIT_TIMEOUT_SECONDS,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            app (Flask): The application whose database holds the favorites.
+            max_batch (int): The maximum number of favorites per transaction.
+            max_delay (float): Seconds a batch waits for more favorites.
+            timeout (float): Seconds a request waits for its batch.
+        """
+        self.app = app
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._pending: "queue.Queue[Optional[_PendingFavorite]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self) -> None:
+        """Start writing batches in a background thread."""
+        self._thread = threading.Thread(
+            target=self.run, name="favorite-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, user_id: int, game_id: int) -> dict:
+        """
+        Add a game to a user's favorite games and wait for the commit.
+
+        A favorite that is not written within timeout seconds fails its
+        request, although its batch may still be committed later.
+
+        Args:
+            user_id (int): The unique ID of the user.
+            game_id (int): The unique ID of the game.
+
+        Returns:
+            dict: The IDs of user_id and game_id, like a FavoriteGameDict.
+
+        Raises:
+            UserNotFoundError: If the user does not exist.
+            GameAlreadyInFavoritesError: If the game is already favored by the user.
+            DatabaseError: If a database error occurs, the writer is not
+                running or the favorite is not written within the timeout.
+        """
+        thread = self._thread
+        if self._stopped or thread is None or not thread.is_alive():
+            logger.error("The favorite writer is not running.")
+            raise DatabaseError(
+                f"Failed to add favorite game {game_id} to user {user_id}"
+            )
+
+        favorite = _PendingFavorite(user_id, game_id)
+        self._pending.put(favorite)
+        if not favorite.done.wait(self.timeout):
+            logger.error(
+                f"Favorite game {game_id} of user {user_id} was not written "
+                f"within {self.timeout} s"
+            )
+            raise DatabaseError(
+                f"Failed to add favorite game {game_id} to user {user_id}"
+            )
+        if favorite.error is not None:
+            raise favorite.error
+        return {"user_id": user_id, "game_id": game_id}
+
+    def stop(self) -> None:
+        """Let the background thread finish after the waiting favorites."""
+        self._stopped = True
+        self._pending.put(None)
+
+    def next_batch(self) -> Optional[List[_PendingFavorite]]:
+        """
+        Wait for a favorite and collect the favorites that follow it.
+
+        Returns:
+            Optional[List[_PendingFavorite]]: The batch, or None if the writer
+                was stopped.
+        """
+        favorite = self._pending.get()
+        if favorite is None:
+            return None
+
+        batch = [favorite]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                favorite = self._pending.get(
+                    timeout=max(deadline - time.monotonic(), 0)
+                )
+            except queue.Empty:
+                break
+            if favorite is None:
+                self._pending.put(None)
+                break
+            batch.append(favorite)
+        return batch
+
+    def write(self, batch: List[_PendingFavorite]) -> None:
+        """
+        Write a batch in one transaction and answer its requests.
+
+        If the transaction conflicts with a favorite written by another
+        process meanwhile, each favorite of the batch is retried in its own
+        transaction, so the conflict fails only its request.
+
+        Args:
+            batch (List[_PendingFavorite]): The favorites to write.
+        """
+        for favorite in batch:
+            favorite.error = DatabaseError(
+                f"Failed to add favorite game {favorite.game_id} "
+                f"to user {favorite.user_id}"
+            )
+
+        try:
+            with self.app.app_context():
+                try:
+                    self._insert(batch)
+                except IntegrityError:
+                    db.session.rollback()
+                    if len(batch) > 1:
+                        logger.warning(
+                            f"Batch of {len(batch)} favorites conflicted, "
+                            "writing them one by one."
+                        )
+                        for favorite in batch:
+                            self.write([favorite])
+                        return
+
+                    favorite = batch[0]
+                    logger.warning(
+                        f"User {favorite.user_id} has already favored "
+                        f"game {favorite.game_id}"
+                    )
+                    favorite.error = GameAlreadyInFavoritesError(
+                        favorite.user_id, favorite.game_id
+                    )
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    logger.error(f"Error adding a batch of favorite games: {e}")
+        finally:
+            for favorite in batch:
+                favorite.done.set()
+
+    def _insert(self, batch: List[_PendingFavorite]) -> None:
+        """
+        Insert the new favorites of a batch and update the favorite counts.
+
+        Favorites of missing users and favorites that exist already, in the
+        database or earlier in the batch, are skipped. The outcome of every
+        favorite is only set after the commit, so the favorites of a failed
+        transaction keep their DatabaseError.
+
+        Args:
+            batch (List[_PendingFavorite]): The favorites to write.
+        """
+        user_ids = {favorite.user_id for favorite in batch}
+        game_ids = {favorite.game_id for favorite in batch}
+        existing_users = set(
+            db.session.execute(
+                select(User.user_id).where(User.user_id.in_(user_ids))
+            ).scalars()
+        )
+        rows = db.session.execute(
+            select(FavoriteGame.user_id, FavoriteGame.game_id).where(
+                FavoriteGame.user_id.in_(existing_users),
+                FavoriteGame.game_id.in_(game_ids),
+            )
+        )
+        favored = {(user_id, game_id) for user_id, game_id in rows}
+
+        added = []
+        errors: List[Optional[Exception]] = []
+        for favorite in batch:
+            key = (favorite.user_id, favorite.game_id)
+            if favorite.user_id not in existing_users:
+                errors.append(UserNotFoundError(favorite.user_id))
+            elif key in favored:
+                errors.append(GameAlreadyInFavoritesError(*key))
+            else:
+                errors.append(None)
+                favored.add(key)
+                added.append(favorite)
+
+        if added:
+            db.session.execute(
+                insert(FavoriteGame.__table__),
+                [
+                    {"user_id": favorite.user_id, "game_id": favorite.game_id}
+                    for favorite in added
+                ],
+            )
+            change_favorite_counts(Counter(favorite.game_id for favorite in added))
+            added_by_user: Dict[int, List[int]] = {}
+            for favorite in added:
+                added_by_user.setdefault(favorite.user_id, []).append(favorite.game_id)
+            record_favorite_changes(added_by_user)
+        db.session.commit()
+
+        for favorite, error in zip(batch, errors):
+            favorite.error = error
+        logger.info(
+            f"Committed {len(added)} of {len(batch)} favorite games in one transaction"
+        )
+
+    def run(self) -> None:
+        """Write batches of favorites until the writer is stopped."""
+        while True:
+            batch = self.next_batch()
+            if batch is None:
+                return
+            try:
+                self.write(batch)
+            except Exception as e:
+                logger.error(f"Failed to write favorite games: {e}", exc_info=True)
+
+
+def start_favorite_group_commit(
+    app: Flask, max_batch: int, max_delay: float
+) -> FavoriteGroupWriter:
+    """
+    Write favorites added from now on in shared transactions.
+
+    Args:
+        app (Flask): The application whose database holds the favorites.
+        max_batch (int): The maximum number of favorites per transaction.
+        max_delay (float): Seconds a batch waits for more favorites.
+
+    Returns:
+        FavoriteGroupWriter: The writer, running in a background thread.
+    """
+    global _favorite_writer
+
+    writer = FavoriteGroupWriter(app, max_batch, max_delay)
+    writer.start()
+    _favorite_writer = writer
+    return writer
+
+
+def stop_favorite_group_commit() -> None:
+    """Write favorites in a transaction per request again."""
+    global _favorite_writer
+
+    writer = _favorite_writer
+    _favorite_writer = None
+    if writer is not None:
+        writer.stop()
+
+
+def get_favorite_writer() -> Optional[FavoriteGroupWriter]:
+    """Return the active group commit writer, or None if it is disabled."""
+    return _favorite_writer
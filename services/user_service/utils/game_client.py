@@ -0,0 +1,268 @@
+import http.client
+import json
+import logging
+import queue
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from ...common.cache import CacheStatsDict, LRUCache
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_GAME_IDS = 100
+
+
+class GameServiceUnavailableError(Exception):
+    """Raised when the game service cannot answer a request."""
+
+    def __init__(self, reason: str):
+        """
+        Initialize the exception.
+
+        Args:
+            reason (str): Why the request to the game service failed.
+        """
+        super().__init__(f"Game service unavailable: {reason}")
+        self.reason = reason
+
+
+class GameClient(ABC):
+    """Resolves game IDs to game names."""
+
+    @abstractmethod
+    def get_game_names(self, game_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        Look up the names of several games.
+
+        Args:
+            game_ids (Iterable[int]): The IDs of the games.
+
+        Returns:
+            Dict[int, str]: The names by game ID. Unknown games are left out.
+
+        Raises:
+            GameServiceUnavailableError: If the games cannot be looked up.
+        """
+
+
+class LocalGameClient(GameClient):
+    """A stand-in for the game service that answers from a mapping."""
+
+    def __init__(self, game_names: Optional[Dict[int, str]] = None):
+        """
+        Initialize the client.
+
+        Args:
+            game_names (Optional[Dict[int, str]]): The names by game ID.
+        """
+        self.game_names = dict(game_names or {})
+
+    def get_game_names(self, game_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        Look up the names of several games in the mapping.
+
+        Args:
+            game_ids (Iterable[int]): The IDs of the games.
+
+        Returns:
+            Dict[int, str]: The names by game ID. Unknown games are left out.
+        """
+        return {
+            game_id: self.game_names[game_id]
+            for game_id in game_ids
+            if game_id in self.game_names
+        }
+
+
+class HttpGameClient(GameClient):
+    """
+    A client of the game service's batch endpoint.
+
+    Connections are kept alive in a pool, IDs are looked up in batches of at
+    most MAX_BATCH_GAME_IDS and names are cached for cache_ttl seconds. A
+    lookup takes at most timeout seconds in total, over all its batches and
+    retries, plus the time of the socket operation that is running when it
+    expires.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 2.0,
+        pool_size: int = 8,
+        cache_size: int = 4096,
+        cache_ttl: Optional[float] = 300,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url (str): The URL of the game service, e.g. http://localhost:5001.
+            timeout (float): Seconds a lookup of game names may take.
+            pool_size (int): The maximum number of idle connections kept open.
+            cache_size (int): The maximum number of cached game names.
+            cache_ttl (Optional[float]): Seconds a cached name is used.
+        """
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"Unsupported game service URL: {base_url}")
+
+        self.base_url = base_url
+        self.timeout = timeout
+        self._connection_class = (
+            http.client.HTTPSConnection
+            if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._host = url.hostname
+        self._port = url.port
+        self._batch_path = f"{url.path.rstrip('/')}/games/batch"
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(
+            maxsize=pool_size
+        )
+        self._cache: LRUCache[str] = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+
+    def _acquire_connection(self) -> http.client.HTTPConnection:
+        """Return an idle connection from the pool, or a new one."""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connection_class(self._host, self._port, timeout=self.timeout)
+
+    def _release_connection(self, connection: http.client.HTTPConnection) -> None:
+        """Return a connection to the pool, or close it if the pool is full."""
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _post_batch(self, game_ids: List[int], deadline: float) -> bytes:
+        """
+        Send one batch request, retrying once if a pooled connection went stale.
+
+        Every socket operation waits at most until the deadline.
+
+        Args:
+            game_ids (List[int]): At most MAX_BATCH_GAME_IDS game IDs.
+            deadline (float): The time.monotonic() by which the lookup ends.
+
+        Returns:
+            bytes: The body of the response.
+
+        Raises:
+            GameServiceUnavailableError: If the request fails or the deadline
+                has passed.
+        """
+        body = json.dumps({"ids": game_ids})
+        headers = {"Content-Type": "application/json"}
+        for attempt in range(2):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise GameServiceUnavailableError("timed out")
+            connection = self._acquire_connection()
+            connection.timeout = remaining
+            if connection.sock is not None:
+                connection.sock.settimeout(remaining)
+            try:
+                connection.request("POST", self._batch_path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError) as e:
+                connection.close()
+                if attempt == 0:
+                    continue
+                raise GameServiceUnavailableError(str(e)) from e
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                raise GameServiceUnavailableError(str(e)) from e
+
+            self._release_connection(connection)
+            if response.status != 200:
+                raise GameServiceUnavailableError(
+                    f"batch request returned status {response.status}"
+                )
+            return data
+
+    def get_game_names(self, game_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        Look up the names of several games, from the cache or the game service.
+
+        Args:
+            game_ids (Iterable[int]): The IDs of the games.
+
+        Returns:
+            Dict[int, str]: The names by game ID. Unknown games are left out.
+
+        Raises:
+            GameServiceUnavailableError: If the game service cannot be reached,
+                does not answer within the timeout or answers with an error.
+        """
+        deadline = time.monotonic() + self.timeout
+        game_names = {}
+        uncached_ids = []
+        for game_id in dict.fromkeys(game_ids):
+            name = self._cache.get(game_id)
+            if name is None:
+                uncached_ids.append(game_id)
+            else:
+                game_names[game_id] = name
+
+        for start in range(0, len(uncached_ids), MAX_BATCH_GAME_IDS):
+            end = start + MAX_BATCH_GAME_IDS
+            batch = uncached_ids[start:end]
+            logger.debug(f"Fetching {len(batch)} games from {self.base_url}")
+            try:
+                games = json.loads(self._post_batch(batch, deadline))["games"]
+            except (ValueError, KeyError, TypeError) as e:
+                raise GameServiceUnavailableError(f"invalid response: {e}") from e
+
+            for game in games:
+                self._cache.put(game["id"], game["name"])
+                game_names[game["id"]] = game["name"]
+
+        return game_names
+
+    def cache_stats(self) -> CacheStatsDict:
+        """
+        Return the counters of the game name cache.
+
+        Returns:
+            CacheStatsDict: The stats of the cache.
+        """
+        return self._cache.stats()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_game_client: Optional[GameClient] = None
+
+
+def configure_game_client(game_client: Optional[GameClient]) -> None:
+    """
+    Set the client used to look up games.
+
+    Args:
+        game_client (Optional[GameClient]): The client, or None to disable
+            looking up games.
+    """
+    global _game_client
+
+    _game_client = game_client
+
+
+def get_game_client() -> Optional[GameClient]:
+    """
+    Return the client used to look up games.
+
+    Returns:
+        Optional[GameClient]: The configured client, or None.
+    """
+    return _game_client
@@ -0,0 +1,113 @@
+import base64
+import binascii
+import json
+import logging
+import string
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+UsernameKey = Tuple[str, int]
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, cursor: str):
+        """
+        Initialize the exception.
+
+        Args:
+            cursor (str): The cursor sent by the client.
+        """
+        super().__init__(f"Invalid cursor: '{cursor}'.")
+        self.cursor = cursor
+
+
+def encode_cursor(key: UsernameKey) -> str:
+    """
+    Encode the lowercased username and user_id of the last user of a page.
+
+    Args:
+        key (UsernameKey): The lowercased username and the user_id.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    payload = json.dumps({"after": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[UsernameKey]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor (str): The cursor sent by the client. An empty cursor starts
+            at the beginning of the listing.
+
+    Returns:
+        Optional[UsernameKey]: The lowercased username and user_id to continue
+            after, or None for the first page.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed, or its key cannot be
+            compared with the database's usernames and 64-bit user IDs.
+    """
+    if not cursor:
+        return None
+
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        username, user_id = payload["after"]
+        is_user_id = isinstance(user_id, int) and not isinstance(user_id, bool)
+        if not isinstance(username, str) or not is_user_id:
+            raise ValueError(f"Cursor key {username, user_id} is not a username key")
+        if not -(2**63) <= user_id < 2**63:
+            raise ValueError(f"User ID {user_id} of the cursor is out of range")
+        # Lone surrogates decode from JSON but cannot be sent to the database.
+        username.encode()
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Could not decode cursor '{cursor}': {e}")
+        raise InvalidCursorError(cursor) from e
+
+    return username, user_id
+
+
+def ascii_lower(text: str) -> str:
+    """
+    Lowercase only the ASCII letters of text, like SQLite's lower() does.
+
+    Args:
+        text (str): The text to lowercase.
+
+    Returns:
+        str: The lowercased text.
+    """
+    return text.translate(_ASCII_LOWER)
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    Compute the smallest string that is greater than all strings with a prefix.
+
+    Together with the prefix itself this gives a range condition, which can be
+    answered by a scan of an index instead of a LIKE pattern.
+
+    Args:
+        prefix (str): The prefix.
+
+    Returns:
+        Optional[str]: The exclusive upper bound, or None if there is none.
+    """
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            # Surrogates cannot be encoded, the next character is U+E000.
+            following = 0xE000 if 0xD7FF <= last < 0xE000 else last + 1
+            return prefix[:-1] + chr(following)
+        prefix = prefix[:-1]
+    return None
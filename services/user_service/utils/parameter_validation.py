@@ -1,5 +1,6 @@
 import logging
 from functools import wraps
+from typing import List, Optional
 
 from flask import jsonify, request
 
@@ -85,3 +86,169 @@ def validate_query_parameters(*parameters):
 def validate_json_parameters(*parameters):
     """Validate query parameters in POST requests."""
     return validate_parameters("json", *parameters)
+
+
+def _out_of_range_id(ids: List[int]) -> Optional[int]:
+    """
+    Find an ID that does not fit the 64-bit integer columns of the database.
+
+    Args:
+        ids (List[int]): The IDs to check.
+
+    Returns:
+        Optional[int]: The first ID out of range, or None if all IDs fit.
+    """
+    return next((value for value in ids if not -(2**63) <= value < 2**63), None)
+
+
+def validate_json_id_lists(*parameter_names: str, max_length: int = 10_000):
+    """
+    Validate optional lists of integer IDs in a JSON body as decorator.
+
+    Missing lists default to empty lists.
+
+    Args:
+        *parameter_names (str): The names of the lists.
+        max_length (int): The maximum number of IDs per list.
+
+    Returns:
+        function: The wrapped view function with the validated lists added to kwargs.
+    """
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                logger.warning("Request body is not a JSON object.")
+                return jsonify({"error": "request body must be a JSON object"}), 400
+
+            for parameter_name in parameter_names:
+                value = data.get(parameter_name, [])
+                if not isinstance(value, list) or not all(
+                    isinstance(item, int) and not isinstance(item, bool)
+                    for item in value
+                ):
+                    logger.warning(f"Invalid ID list for {parameter_name}.")
+                    return (
+                        jsonify({"error": f"{parameter_name} must be a list of int"}),
+                        400,
+                    )
+                if len(value) > max_length:
+                    logger.warning(f"Too many IDs for {parameter_name}.")
+                    return (
+                        jsonify(
+                            {
+                                "error": f"{parameter_name} must not contain "
+                                f"more than {max_length} IDs"
+                            }
+                        ),
+                        400,
+                    )
+                out_of_range = _out_of_range_id(value)
+                if out_of_range is not None:
+                    logger.warning(
+                        f"ID {out_of_range} of {parameter_name} is out of range."
+                    )
+                    return (
+                        jsonify({"error": f"{parameter_name} must be a list of int64"}),
+                        400,
+                    )
+                kwargs[parameter_name] = value
+
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def validate_query_id_list(parameter_name: str, max_length: int = 1000):
+    """
+    Validate a required comma separated list of integer IDs in a query as decorator.
+
+    Args:
+        parameter_name (str): The name of the query parameter.
+        max_length (int): The maximum number of IDs.
+
+    Returns:
+        function: The wrapped view function with the IDs added to kwargs.
+    """
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            value = request.args.get(parameter_name)
+            if not value:
+                logger.warning(f"Missing parameter for {parameter_name}.")
+                return jsonify({"error": f"{parameter_name} is required"}), 400
+
+            try:
+                ids = [validate_parameter(item, int) for item in value.split(",")]
+            except ValueError:
+                return (
+                    jsonify({"error": f"{parameter_name} must be a list of int"}),
+                    400,
+                )
+            if len(ids) > max_length:
+                logger.warning(f"Too many IDs for {parameter_name}.")
+                return (
+                    jsonify(
+                        {
+                            "error": f"{parameter_name} must not contain "
+                            f"more than {max_length} IDs"
+                        }
+                    ),
+                    400,
+                )
+            out_of_range = _out_of_range_id(ids)
+            if out_of_range is not None:
+                logger.warning(
+                    f"ID {out_of_range} of {parameter_name} is out of range."
+                )
+                return (
+                    jsonify({"error": f"{parameter_name} must be a list of int64"}),
+                    400,
+                )
+
+            kwargs[parameter_name] = ids
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def validate_limit_parameter(default: int, maximum: int):
+    """
+    Validate an optional limit query parameter between 1 and maximum as decorator.
+
+    Args:
+        default (int): The limit if the parameter is missing.
+        maximum (int): The largest allowed limit.
+
+    Returns:
+        function: The wrapped view function with the limit added to kwargs.
+    """
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            value = request.args.get("limit")
+            try:
+                limit = default if value is None else validate_parameter(value, int)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            if not 1 <= limit <= maximum:
+                logger.warning(f"Limit {limit} is out of range.")
+                return (
+                    jsonify({"error": f"limit must be between 1 and {maximum}"}),
+                    400,
+                )
+
+            kwargs["limit"] = limit
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,532 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, TypedDict
+
+from flask import Flask
+from sqlalchemy import func, select
+
+from ..database.database import db
+from ..database.models import FavoriteEvent, FavoriteGame
+from .favorite_events import (
+    FavoriteEventDict,
+    disable_favorite_events,
+    enable_favorite_events,
+    latest_favorite_event_id,
+    prune_favorite_events,
+    read_favorite_events,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+
+logger = logging.getLogger(__name__)
+
+NEIGHBORS_PER_GAME = 50
+SIMILARITY_BLOCK_SIZE = 256
+
+_recommender: Optional["ItemSimilarityRecommender"] = None
+
+
+class RecommendationDict(TypedDict):
+    """A TypedDict representing a recommended game."""
+
+    game_id: int
+    score: float
+
+
+def favorites_matrix(
+    user_ids: "np.ndarray", game_ids: "np.ndarray"
+) -> Tuple["csr_matrix", "np.ndarray"]:
+    """
+    Build the binary user x game matrix of favorites.
+
+    Args:
+        user_ids (np.ndarray): The user of each favorite.
+        game_ids (np.ndarray): The game of each favorite.
+
+    Returns:
+        Tuple[csr_matrix, np.ndarray]: The matrix with one row per user and one
+            column per game, and the sorted game IDs of the columns.
+    """
+    import numpy as np
+    from scipy.sparse import csr_matrix
+
+    _, user_rows = np.unique(user_ids, return_inverse=True)
+    columns, game_columns = np.unique(game_ids, return_inverse=True)
+    matrix = csr_matrix(
+        (np.ones(len(game_ids), dtype=np.float32), (user_rows, game_columns)),
+        shape=(user_rows.max(initial=-1) + 1, len(columns)),
+    )
+    matrix.data[:] = 1
+    return matrix, columns
+
+
+class ItemSimilarityRecommender:
+    """
+    Recommends games that are often favored together with a user's favorites.
+
+    The similarity of two games is the cosine similarity of their columns in
+    the user x game matrix of favorites: the number of users who favor both,
+    divided by the geometric mean of their favorite counts. Only the most
+    similar neighbors of each game are kept.
+
+    Changes of single favorites can be applied incrementally. They update the
+    co-occurrence counts of the kept neighbors and may add new neighbors,
+    counting only the co-occurrences since the last build. A full rebuild
+    makes the neighbors exact again. last_event_id is the ID of the last
+    favorite event the recommender includes.
+    """
+
+    def __init__(
+        self,
+        game_ids: "np.ndarray",
+        favorite_counts: "np.ndarray",
+        neighbor_columns: "np.ndarray",
+        neighbor_co_occurrences: "np.ndarray",
+        neighbor_scores: "np.ndarray",
+    ):
+        """
+        Initialize the recommender from precomputed neighbors.
+
+        Args:
+            game_ids (np.ndarray): The sorted IDs of the games.
+            favorite_counts (np.ndarray): The number of favorites of each game.
+            neighbor_columns (np.ndarray): For every game, the positions of its
+                most similar games in game_ids, -1 where it has fewer neighbors.
+            neighbor_co_occurrences (np.ndarray): The number of users who favor
+                both the game and the neighbor.
+            neighbor_scores (np.ndarray): The similarities of the neighbors.
+        """
+        self.game_ids = game_ids
+        self.favorite_counts = favorite_counts
+        self.neighbor_columns = neighbor_columns
+        self.neighbor_co_occurrences = neighbor_co_occurrences
+        self.neighbor_scores = neighbor_scores
+        self.last_event_id = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_favorites(
+        cls,
+        user_ids: "np.ndarray",
+        game_ids: "np.ndarray",
+        neighbors: int = NEIGHBORS_PER_GAME,
+    ) -> "ItemSimilarityRecommender":
+        """
+        Compute the neighbors of every game from the favorites.
+
+        The game x game co-occurrence matrix is computed in blocks of
+        SIMILARITY_BLOCK_SIZE games, so only one block is held in memory.
+
+        Args:
+            user_ids (np.ndarray): The user of each favorite.
+            game_ids (np.ndarray): The game of each favorite.
+            neighbors (int): The number of neighbors kept per game.
+
+        Returns:
+            ItemSimilarityRecommender: The recommender.
+        """
+        import numpy as np
+
+        matrix, columns = favorites_matrix(user_ids, game_ids)
+        games_by_users = matrix.T.tocsr()
+        favorite_counts = np.asarray(matrix.sum(axis=0)).ravel()
+        inverse_norms = 1 / np.sqrt(np.maximum(favorite_counts, 1))
+
+        neighbor_columns = np.full((len(columns), neighbors), -1, dtype=np.int32)
+        neighbor_co_occurrences = np.zeros((len(columns), neighbors), dtype=np.float32)
+        neighbor_scores = np.zeros((len(columns), neighbors), dtype=np.float32)
+        for block_start in range(0, len(columns), SIMILARITY_BLOCK_SIZE):
+            block_end = min(block_start + SIMILARITY_BLOCK_SIZE, len(columns))
+            co_occurrences = (games_by_users[block_start:block_end] @ matrix).tocsr()
+
+            rows = np.repeat(
+                np.arange(block_start, block_end), np.diff(co_occurrences.indptr)
+            )
+            scores = co_occurrences.data * inverse_norms[rows]
+            scores *= inverse_norms[co_occurrences.indices]
+            scores[rows == co_occurrences.indices] = 0
+
+            for row in range(block_end - block_start):
+                start = co_occurrences.indptr[row]
+                end = co_occurrences.indptr[row + 1]
+                row_scores = scores[start:end]
+                row_columns = co_occurrences.indices[start:end]
+                row_counts = co_occurrences.data[start:end]
+                if len(row_scores) > neighbors:
+                    top = np.argpartition(row_scores, -neighbors)[-neighbors:]
+                    row_scores = row_scores[top]
+                    row_columns = row_columns[top]
+                    row_counts = row_counts[top]
+                order = np.argsort(-row_scores, kind="stable")
+                order = order[row_scores[order] > 0]
+                count = len(order)
+                neighbor_columns[block_start + row, :count] = row_columns[order]
+                neighbor_co_occurrences[block_start + row, :count] = row_counts[order]
+                neighbor_scores[block_start + row, :count] = row_scores[order]
+
+        return cls(
+            columns,
+            favorite_counts,
+            neighbor_columns,
+            neighbor_co_occurrences,
+            neighbor_scores,
+        )
+
+    def _column(self, game_id: int) -> Optional[int]:
+        """
+        Return the position of a game in game_ids.
+
+        Args:
+            game_id (int): The ID of the game.
+
+        Returns:
+            Optional[int]: The position, or None if the game is unknown.
+        """
+        import numpy as np
+
+        column = int(np.searchsorted(self.game_ids, game_id))
+        if column < len(self.game_ids) and self.game_ids[column] == game_id:
+            return column
+        return None
+
+    def _change_co_occurrence(self, row: int, column: int, delta: int) -> None:
+        """
+        Change the co-occurrence count of a game with one of its neighbors.
+
+        A game that is not yet a neighbor becomes one if a slot is free or if
+        it is more similar than the least similar neighbor.
+
+        Args:
+            row (int): The position of the game.
+            column (int): The position of the other game.
+            delta (int): The change of the number of users who favor both.
+        """
+        import numpy as np
+
+        columns = self.neighbor_columns[row]
+        co_occurrences = self.neighbor_co_occurrences[row]
+        matches = np.flatnonzero(columns == column)
+        if len(matches):
+            co_occurrences[matches[0]] += delta
+            return
+        if delta <= 0:
+            return
+
+        free = np.flatnonzero(columns < 0)
+        if len(free):
+            slot = free[0]
+        else:
+            slot = len(columns) - 1
+            score = delta / np.sqrt(
+                max(self.favorite_counts[row], 1) * max(self.favorite_counts[column], 1)
+            )
+            if score <= self.neighbor_scores[row, slot]:
+                return
+        columns[slot] = column
+        co_occurrences[slot] = delta
+
+    def _rescore(self, row: int) -> None:
+        """
+        Recompute the similarities of a game's neighbors and sort them.
+
+        Args:
+            row (int): The position of the game.
+        """
+        import numpy as np
+
+        is_neighbor = (self.neighbor_columns[row] >= 0) & (
+            self.neighbor_co_occurrences[row] > 0
+        )
+        columns = np.where(is_neighbor, self.neighbor_columns[row], -1)
+        co_occurrences = np.where(is_neighbor, self.neighbor_co_occurrences[row], 0)
+        norms = np.sqrt(np.maximum(self.favorite_counts[row], 1))
+        norms *= np.sqrt(np.maximum(self.favorite_counts[np.maximum(columns, 0)], 1))
+        scores = co_occurrences / norms
+
+        order = np.argsort(-scores, kind="stable")
+        self.neighbor_columns[row] = columns[order]
+        self.neighbor_co_occurrences[row] = co_occurrences[order]
+        self.neighbor_scores[row] = scores[order]
+
+    def apply_favorite_change(
+        self, game_id: int, other_game_ids: Iterable[int], delta: int
+    ) -> bool:
+        """
+        Update the neighbors after a user added or removed a favorite.
+
+        Args:
+            game_id (int): The ID of the added or removed game.
+            other_game_ids (Iterable[int]): The IDs of the user's other favorites.
+            delta (int): 1 if the game was added, -1 if it was removed.
+
+        Returns:
+            bool: False if the game is unknown to the recommender and the change
+                has to wait for the next rebuild.
+        """
+        with self._lock:
+            row = self._column(game_id)
+            if row is None:
+                return False
+
+            self.favorite_counts[row] = max(self.favorite_counts[row] + delta, 0)
+            for other_game_id in other_game_ids:
+                column = self._column(other_game_id)
+                if column is None or column == row:
+                    continue
+                self._change_co_occurrence(row, column, delta)
+                self._change_co_occurrence(column, row, delta)
+                self._rescore(column)
+            self._rescore(row)
+            return True
+
+    def recommend(
+        self, favorite_game_ids: Iterable[int], limit: int
+    ) -> List[RecommendationDict]:
+        """
+        Recommend games by summing the similarities to the favorite games.
+
+        Favorite games are never recommended. Games unknown to the recommender
+        are ignored.
+
+        Args:
+            favorite_game_ids (Iterable[int]): The IDs of the user's favorites.
+            limit (int): The maximum number of recommendations.
+
+        Returns:
+            List[RecommendationDict]: The recommended games, best first.
+        """
+        import numpy as np
+
+        favorites = np.fromiter(favorite_game_ids, dtype=np.int64)
+        with self._lock:
+            return self._recommend(favorites, limit)
+
+    def _recommend(
+        self, favorites: "np.ndarray", limit: int
+    ) -> List[RecommendationDict]:
+        """
+        Recommend games while holding the lock.
+
+        Args:
+            favorites (np.ndarray): The IDs of the user's favorites.
+            limit (int): The maximum number of recommendations.
+
+        Returns:
+            List[RecommendationDict]: The recommended games, best first.
+        """
+        import numpy as np
+
+        positions = np.searchsorted(self.game_ids, favorites)
+        known = positions < len(self.game_ids)
+        known[known] = self.game_ids[positions[known]] == favorites[known]
+        favorite_columns = positions[known]
+        if not len(favorite_columns):
+            return []
+
+        columns = self.neighbor_columns[favorite_columns].ravel()
+        scores = self.neighbor_scores[favorite_columns].ravel()
+        is_neighbor = columns >= 0
+        totals = np.bincount(
+            columns[is_neighbor],
+            weights=scores[is_neighbor],
+            minlength=len(self.game_ids),
+        )
+        totals[favorite_columns] = 0
+
+        candidates = np.flatnonzero(totals)
+        if len(candidates) > limit:
+            top = np.argpartition(totals[candidates], -limit)[-limit:]
+            candidates = candidates[top]
+        candidates = candidates[np.lexsort((candidates, -totals[candidates]))]
+        return [
+            {"game_id": int(self.game_ids[column]), "score": float(totals[column])}
+            for column in candidates
+        ]
+
+
+def build_recommender() -> ItemSimilarityRecommender:
+    """
+    Build a recommender over all favorites in the database.
+
+    The ID of the last favorite event is read in the same statement as the
+    favorites, so the recommender includes exactly the events up to it.
+
+    Returns:
+        ItemSimilarityRecommender: The recommender.
+    """
+    import numpy as np
+
+    start = time.perf_counter()
+    last_event_id = select(
+        func.coalesce(func.max(FavoriteEvent.event_id), 0)
+    ).scalar_subquery()
+    rows = db.session.execute(
+        select(FavoriteGame.user_id, FavoriteGame.game_id, last_event_id)
+    )
+    favorites = np.array(rows.all(), dtype=np.int64).reshape(-1, 3)
+
+    recommender = ItemSimilarityRecommender.from_favorites(
+        favorites[:, 0], favorites[:, 1]
+    )
+    if len(favorites):
+        recommender.last_event_id = int(favorites[0, 2])
+    else:
+        recommender.last_event_id = latest_favorite_event_id()
+    logger.info(
+        f"Built recommendations for {len(recommender.game_ids)} games from "
+        f"{len(favorites)} favorites in {time.perf_counter() - start:.2f}s"
+    )
+    return recommender
+
+
+def enable_recommender() -> None:
+    """
+    Build the recommender, so recommendations can be served.
+
+    Changes of favorites are recorded as favorite events from now on, so
+    the recommender can be kept up to date.
+    """
+    global _recommender
+
+    enable_favorite_events()
+    _recommender = build_recommender()
+
+
+def disable_recommender() -> None:
+    """Drop the recommender and stop recording favorite events."""
+    global _recommender
+
+    disable_favorite_events()
+    _recommender = None
+
+
+def get_recommender() -> Optional[ItemSimilarityRecommender]:
+    """Return the active recommender, or None if it is disabled."""
+    return _recommender
+
+
+class RecommenderUpdater:
+    """
+    Applies favorite events to the recommender as they are committed.
+
+    The events are read from the database, so every worker process applies
+    the changes made through all workers. Every compaction_seconds the
+    recommender is rebuilt from the database, which makes the neighbors
+    exact again, and events older than two compactions are deleted.
+    """
+
+    def __init__(self, app: Flask, compaction_seconds: float, poll_seconds: float):
+        """
+        Initialize the updater.
+
+        Args:
+            app (Flask): The application whose database holds the favorites.
+            compaction_seconds (float): Seconds between two full rebuilds.
+            poll_seconds (float): Seconds between two reads of new events.
+        """
+        self.app = app
+        self.compaction_seconds = compaction_seconds
+        self.poll_seconds = poll_seconds
+        self._compacted_at = time.monotonic()
+
+    def apply(self, event: FavoriteEventDict) -> None:
+        """
+        Apply one favorite event to the active recommender.
+
+        The user's favorites before the change come with the event, read in
+        the transaction that made the change, so events of the same user are
+        not paired with each other's favorites twice. Removals and additions
+        are applied one at a time, each paired with the favorites the user
+        had at that point. Events the recommender already includes are
+        skipped.
+
+        Args:
+            event (FavoriteEventDict): The added and removed favorites.
+        """
+        recommender = get_recommender()
+        if recommender is None or event["event_id"] <= recommender.last_event_id:
+            return
+
+        favorites = set(event["favorites"])
+
+        changes = [(game_id, -1) for game_id in event["removed"]]
+        changes += [(game_id, 1) for game_id in event["added"]]
+        for game_id, delta in changes:
+            favorites.discard(game_id)
+            if not recommender.apply_favorite_change(game_id, favorites, delta):
+                logger.debug(f"Game {game_id} waits for the next rebuild")
+            if delta > 0:
+                favorites.add(game_id)
+        recommender.last_event_id = event["event_id"]
+
+    def process_pending(self) -> int:
+        """
+        Apply all events committed since the last one the recommender includes.
+
+        Returns:
+            int: The number of processed events.
+        """
+        recommender = get_recommender()
+        if recommender is None:
+            return 0
+
+        with self.app.app_context():
+            events = read_favorite_events(recommender.last_event_id)
+            for event in events:
+                self.apply(event)
+        return len(events)
+
+    def compact(self) -> None:
+        """
+        Rebuild the recommender from the database and replace the active one.
+
+        Events created before the previous compaction are deleted, as every
+        worker has rebuilt its recommender since.
+        """
+        global _recommender
+
+        compacted_at = time.monotonic()
+        with self.app.app_context():
+            recommender = build_recommender()
+            pruned = prune_favorite_events(time.time() - 2 * self.compaction_seconds)
+        _recommender = recommender
+        self._compacted_at = compacted_at
+        logger.info(f"Deleted {pruned} applied favorite events")
+
+    def run(self) -> None:
+        """Apply events as they are committed and rebuild periodically, forever."""
+        while True:
+            time.sleep(self.poll_seconds)
+            try:
+                self.process_pending()
+            except Exception as e:
+                logger.error(f"Failed to apply favorite events: {e}", exc_info=True)
+
+            if time.monotonic() >= self._compacted_at + self.compaction_seconds:
+                try:
+                    self.compact()
+                except Exception as e:
+                    logger.error(
+                        f"Failed to rebuild recommendations: {e}", exc_info=True
+                    )
+                    self._compacted_at = time.monotonic()
+
+
+def start_recommender_updates(
+    app: Flask, compaction_seconds: float, poll_seconds: float
+) -> None:
+    """
+    Keep the recommender up to date with the favorite events of all workers.
+
+    Args:
+        app (Flask): The application whose database holds the favorites.
+        compaction_seconds (float): Seconds between two full rebuilds.
+        poll_seconds (float): Seconds between two reads of new events.
+    """
+    updater = RecommenderUpdater(app, compaction_seconds, poll_seconds)
+    threading.Thread(
+        target=updater.run, name="recommender-updates", daemon=True
+    ).start()
@@ -31,6 +31,15 @@ def setup_database(app: Flask):
         db.drop_all()
 
 
+@pytest.fixture
+def empty_database(app: Flask):
+    """Create all tables without data, then drop them after each test."""
+    with app.app_context():
+        db.create_all()
+        yield
+        db.drop_all()
+
+
 @pytest.fixture
 def client(app, setup_database):
     """
@@ -0,0 +1,173 @@
+import asyncio
+from pathlib import Path
+from typing import Generator, List, Tuple
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from services.game_service.app import create_app
+from services.game_service.asgi import GameServiceASGI, async_database_url
+from services.game_service.database.database import db
+from services.game_service.database.seed import seed_test_data
+from services.game_service.routes import get_cached_list_response
+from services.game_service.utils.catalog_events import notify_catalog_changed
+from services.game_service.utils.memory_catalog import (
+    disable_memory_catalog,
+    enable_memory_catalog,
+)
+
+
+@pytest.fixture
+def asgi_app(tmp_path: Path) -> Generator[GameServiceASGI, None, None]:
+    """
+    Create the ASGI app of a game service seeded with test data.
+
+    The database is a file, as the async engine cannot see an in-memory
+    database of the Flask app.
+
+    Yields (GameServiceASGI): The ASGI app.
+    """
+    database_url = f"sqlite:///{tmp_path / 'games.db'}"
+    app = create_app(database_url)
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        seed_test_data()
+
+    asgi_app = GameServiceASGI(app, database_url, threads=2)
+    yield asgi_app
+
+    asgi_app.executor.shutdown()
+    with app.app_context():
+        db.drop_all()
+        db.engine.dispose()
+    notify_catalog_changed()
+
+
+async def send_request(
+    asgi_app: GameServiceASGI,
+    method: str,
+    path: str,
+    query_string: bytes = b"",
+    body: bytes = b"",
+) -> Tuple[int, bytes]:
+    """
+    Send one HTTP request to the ASGI app.
+
+    Args:
+        asgi_app (GameServiceASGI): The ASGI app.
+        method (str): The HTTP method.
+        path (str): The path of the request.
+        query_string (bytes): The encoded query string.
+        body (bytes): The request body.
+
+    Returns:
+        Tuple[int, bytes]: The status and the body of the response.
+    """
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "query_string": query_string,
+        "headers": [(b"content-type", b"application/json")],
+        "server": ("testserver", 80),
+    }
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+    messages: List[dict] = []
+
+    async def receive() -> dict:
+        return requests.pop(0)
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    return messages[0]["status"], messages[1]["body"]
+
+
+def test_get_game_matches_flask(asgi_app: GameServiceASGI):
+    """Test that games read with the async engine are encoded like jsonify does."""
+    client = asgi_app.app.test_client()
+
+    async def scenario():
+        responses = [
+            await send_request(asgi_app, "GET", "/games/4"),
+            await send_request(asgi_app, "GET", "/games/4"),
+            await send_request(asgi_app, "GET", "/games/9999"),
+        ]
+        await asgi_app.engine.dispose()
+        return responses
+
+    first, cached, missing = asyncio.run(scenario())
+
+    assert first == (200, client.get("/games/4").data)
+    assert cached == first
+    assert missing == (404, client.get("/games/9999").data)
+
+
+def test_get_game_from_memory_catalog(asgi_app: GameServiceASGI):
+    """Test that games are served from the in-memory catalog without the engine."""
+    client = asgi_app.app.test_client()
+    with asgi_app.app.app_context():
+        enable_memory_catalog()
+
+    async def scenario():
+        return [
+            await send_request(asgi_app, "GET", "/games/4"),
+            await send_request(asgi_app, "GET", "/games/9999"),
+        ]
+
+    try:
+        found, missing = asyncio.run(scenario())
+        assert found == (200, client.get("/games/4").data)
+        assert missing == (404, client.get("/games/9999").data)
+        assert asgi_app.engine.sync_engine.pool.checkedin() == 0
+    finally:
+        disable_memory_catalog()
+
+
+def test_list_games_served_from_response_cache(asgi_app: GameServiceASGI):
+    """Test that the first listing runs Flask and repeated ones hit the cache."""
+    query_string = b"name=chess&limit=1&sort=name"
+
+    async def scenario():
+        responses = [
+            await send_request(asgi_app, "GET", "/games", query_string),
+            await send_request(asgi_app, "GET", "/games", query_string),
+        ]
+        await asgi_app.engine.dispose()
+        return responses
+
+    first, cached = asyncio.run(scenario())
+
+    assert first[0] == 200
+    assert cached == first
+    args = MultiDict({"name": "chess", "limit": "1", "sort": "name"})
+    assert get_cached_list_response(args) == first[1]
+
+
+def test_other_routes_are_handled_by_flask(asgi_app: GameServiceASGI):
+    """Test that requests without an async handler keep their Flask behavior."""
+
+    async def scenario():
+        return await send_request(
+            asgi_app, "POST", "/games/batch", body=b'{"ids": [2, 9999]}'
+        )
+
+    status, body = asyncio.run(scenario())
+
+    assert status == 200
+    assert body == b'{"games":[{"id":2,"name":"Dragonmaster"}],"missing":[9999]}\n'
+
+
+def test_async_database_url():
+    """Test that synchronous drivers are replaced with their asyncio drivers."""
+    sqlite_url = async_database_url("sqlite:///games.db")
+    postgresql_url = async_database_url("postgresql://user:secret@db/games")
+    async_url = async_database_url("sqlite+aiosqlite:///games.db")
+
+    assert sqlite_url == "sqlite+aiosqlite:///games.db"
+    assert postgresql_url == "postgresql+asyncpg://user:secret@db/games"
+    assert async_url == "sqlite+aiosqlite:///games.db"
@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+from services.common.cache import LRUCache
+
+
+def test_get_counts_hits_and_misses() -> None:
+    """Test that lookups are counted as hits or misses."""
+    cache: LRUCache[str] = LRUCache(maxsize=2)
+    cache.put(1, "Die Macher")
+
+    assert cache.get(1) == "Die Macher"
+    assert cache.get(2) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_put_evicts_least_recently_used_entry() -> None:
+    """Test that a full cache evicts the entry that was used longest ago."""
+    cache: LRUCache[str] = LRUCache(maxsize=2)
+    cache.put(1, "Die Macher")
+    cache.put(2, "Dragonmaster")
+    cache.get(1)
+    cache.put(3, "Samurai")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "Die Macher"
+    assert cache.get(3) == "Samurai"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_not_returned() -> None:
+    """Test that entries older than the ttl count as expired misses."""
+    cache: LRUCache[str] = LRUCache(maxsize=2, ttl=10)
+    with patch("services.common.cache.time.monotonic", return_value=100.0):
+        cache.put(1, "Die Macher")
+    with patch("services.common.cache.time.monotonic", return_value=105.0):
+        assert cache.get(1) == "Die Macher"
+    with patch("services.common.cache.time.monotonic", return_value=111.0):
+        assert cache.get(1) is None
+
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["size"] == 0
+
+
+def test_zero_maxsize_disables_cache() -> None:
+    """Test that a cache without capacity stores nothing."""
+    cache: LRUCache[str] = LRUCache(maxsize=0)
+    cache.put(1, "Die Macher")
+
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_max_bytes_evicts_and_skips_large_values() -> None:
+    """Test that a cache bounded by bytes evicts entries and skips larger values."""
+    cache: LRUCache[bytes] = LRUCache(maxsize=10, max_bytes=10)
+    cache.put(1, b"1234")
+    cache.put(2, b"5678")
+    cache.put(3, b"90ab")
+    cache.put(4, b"x" * 11)
+
+    assert cache.get(1) is None
+    assert cache.get(2) == b"5678"
+    assert cache.get(3) == b"90ab"
+    assert cache.get(4) is None
+    assert len(cache) == 2
+
+
+def test_put_from_before_clear_is_dropped() -> None:
+    """Test that values computed before a clear are not cached after it."""
+    cache: LRUCache[str] = LRUCache(maxsize=2)
+    generation = cache.generation
+    cache.clear()
+    cache.put(1, "Die Macher", generation)
+    cache.put(2, "Dragonmaster", cache.generation)
+
+    assert cache.get(1) is None
+    assert cache.get(2) == "Dragonmaster"
@@ -0,0 +1,85 @@
+import argparse
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from services.common.engine import configure_database, engine_options, sqlite_pragmas
+from services.game_service.app import create_app
+from services.game_service.database.database import db, init_db
+
+
+def database_args(**overrides) -> argparse.Namespace:
+    """
+    Build the parsed database arguments.
+
+    Args:
+        **overrides: Values replacing the defaults.
+
+    Returns:
+        argparse.Namespace: The arguments.
+    """
+    args = {
+        "pool_size": 3,
+        "max_overflow": 2,
+        "pool_recycle": 600,
+        "pool_pre_ping": True,
+        "sqlite_journal_mode": "wal",
+        "sqlite_synchronous": "normal",
+        "sqlite_mmap_size": 1024 * 1024,
+        "sqlite_cache_size": -4096,
+        "sqlite_busy_timeout": 1234,
+    }
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def test_sqlite_pragmas_and_pool_are_applied(tmp_path: Path):
+    """Test that new connections get the pragmas and the pool is sized."""
+    app = create_app(f"sqlite:///{tmp_path / 'games.db'}")
+    configure_database(app, database_args())
+    init_db(app)
+
+    with app.app_context():
+        with db.engine.connect() as connection:
+            pragmas = {
+                name: connection.execute(text(f"PRAGMA {name}")).scalar()
+                for name in (
+                    "journal_mode",
+                    "synchronous",
+                    "cache_size",
+                    "busy_timeout",
+                )
+            }
+        pool = db.engine.pool
+        db.engine.dispose()
+
+    assert pragmas == {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "cache_size": -4096,
+        "busy_timeout": 1234,
+    }
+    assert (pool.size(), pool._max_overflow, pool._recycle) == (3, 2, 600)
+
+
+def test_in_memory_database_is_not_pooled():
+    """Test that pool sizes are left out for the static in-memory connection."""
+    options = engine_options("sqlite:///:memory:", database_args())
+
+    assert options == {"pool_recycle": 600, "pool_pre_ping": True}
+
+
+def test_empty_modes_keep_sqlite_defaults():
+    """Test that empty journal and synchronous modes are not set."""
+    pragmas = sqlite_pragmas(
+        database_args(sqlite_journal_mode="", sqlite_synchronous="")
+    )
+
+    assert set(pragmas) == {"mmap_size", "cache_size", "busy_timeout"}
+
+
+def test_unsupported_journal_mode():
+    """Test that journal modes are validated before they are put into SQL."""
+    with pytest.raises(ValueError):
+        sqlite_pragmas(database_args(sqlite_journal_mode="wal; DROP TABLE games"))
@@ -0,0 +1,98 @@
+import pytest
+from flask.testing import FlaskClient
+from sqlalchemy import text
+
+from services.game_service.database.catalog_version import publish_catalog_change
+from services.game_service.database.database import db
+from services.game_service.database.fts import (
+    FTS_TABLE,
+    build_match_query,
+    create_fts_table,
+    drop_fts_table,
+    fts_available,
+)
+from services.game_service.database.models import Game
+from services.game_service.game_service import GameService
+from services.game_service.utils.catalog_events import notify_catalog_changed
+
+
+@pytest.fixture
+def fts_table(setup_database):
+    """Create the full-text index for a test and drop it afterwards."""
+    assert create_fts_table()
+    yield
+    drop_fts_table()
+
+
+def test_fts_available_is_cached_until_catalog_change(setup_database) -> None:
+    """Test that the table lookup is cached and redone after a catalog change."""
+    assert not fts_available()
+    db.session.execute(text(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(name)"))
+    assert not fts_available()
+
+    notify_catalog_changed()
+    assert fts_available()
+
+    drop_fts_table()
+    assert not fts_available()
+
+
+def test_build_match_query() -> None:
+    """Test that user input is turned into quoted prefix queries."""
+    assert build_match_query("buffalo ches") == '"buffalo"* "ches"*'
+    assert build_match_query('chess" OR "die') == '"chess"* "OR"* "die"*'
+    assert build_match_query("-*") == ""
+
+
+def test_search_games_ranks_matches(fts_table) -> None:
+    """Test that the best matching game comes first."""
+    result = GameService().search_games("chess")
+
+    assert result["total"] == 2
+    assert [game["name"] for game in result["games"]] == ["Chess", "Buffalo Chess"]
+
+
+def test_search_games_matches_word_prefixes(fts_table) -> None:
+    """Test that words match as prefixes and diacritics are ignored."""
+    assert GameService().search_games("mac")["games"] == [
+        {"id": 1, "name": "Die Macher"}
+    ]
+    assert GameService().search_games("konige")["games"] == [
+        {"id": 4, "name": "Tal der Könige"}
+    ]
+
+
+def test_search_games_follows_catalog_changes(fts_table) -> None:
+    """Test that the full-text index is rebuilt when a catalog change is published."""
+    db.session.add(Game(game_id=7, name="Chess Deluxe"))
+    db.session.commit()
+    publish_catalog_change()
+
+    assert GameService().search_games("deluxe")["games"] == [
+        {"id": 7, "name": "Chess Deluxe"}
+    ]
+
+
+def test_search_games_without_fts_table(setup_database) -> None:
+    """Test that searching without a full-text index falls back to substrings."""
+    result = GameService().search_games("chess")
+
+    assert {game["name"] for game in result["games"]} == {"Buffalo Chess", "Chess"}
+
+
+def test_fulltext_route(client: FlaskClient, fts_table) -> None:
+    """Test the full-text search mode of the games listing."""
+    response = client.get("/games?name=chess&match=fulltext&limit=1")
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["total"] == 2
+    assert data["games"] == [{"id": 171, "name": "Chess"}]
+
+
+def test_fulltext_route_rejects_cursor(client: FlaskClient, fts_table) -> None:
+    """Test that the full-text search mode cannot be combined with a cursor."""
+    response = client.get("/games?name=chess&match=fulltext&cursor=")
+
+    assert response.status_code == 422
+    assert "error" in response.get_json()
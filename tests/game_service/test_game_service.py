@@ -1,7 +1,19 @@
 import pytest
 
-from services.game_service.exceptions import GameNotFoundError
-from services.game_service.game_service import GameService
+from services.game_service.database.catalog_version import publish_catalog_change
+from services.game_service.database.database import db
+from services.game_service.database.models import Game
+from services.game_service.exceptions import (
+    GameNotFoundError,
+    InvalidGameIdsError,
+    NoGamesMatchNameFilterError,
+)
+from services.game_service.game_service import (
+    MAX_BATCH_GAME_IDS,
+    GameService,
+    cache_stats,
+)
+from services.game_service.utils.pagination import PageExceedsDataRangeError
 
 
 def test_list_games_with_static_data(setup_database) -> None:
@@ -29,6 +41,36 @@ def list_games_with_no_match(setup_database) -> None:
     assert games == []
 
 
+def test_list_games_page(setup_database) -> None:
+    """Test that a page is fetched with the total number of matching games."""
+    result = GameService().list_games_page(page=2, limit=3)
+
+    assert result["page"] == 2
+    assert result["limit"] == 3
+    assert result["total"] == 8
+    assert [game["id"] for game in result["games"]] == [4, 5, 6]
+
+
+def test_list_games_page_with_filter(setup_database) -> None:
+    """Test that the total of a page only counts games matching the filter."""
+    result = GameService().list_games_page("chess", page=1, limit=1)
+
+    assert result["total"] == 2
+    assert result["games"] == [{"id": 32, "name": "Buffalo Chess"}]
+
+
+def test_list_games_page_exceeds_data_range(setup_database) -> None:
+    """Test that a page beyond the matching games raises an error."""
+    with pytest.raises(PageExceedsDataRangeError):
+        GameService().list_games_page("chess", page=2, limit=2)
+
+
+def test_list_games_page_with_no_match(setup_database) -> None:
+    """Test that a filter without matches raises an error."""
+    with pytest.raises(NoGamesMatchNameFilterError):
+        GameService().list_games_page("NonExistentGame")
+
+
 @pytest.mark.parametrize(
     "game_id, expected_name",
     [
@@ -53,3 +95,69 @@ def test_get_nonexistent_game_by_id(setup_database) -> None:
         GameService().get_game(non_existent_id)
 
     assert str(exc_info.value) == f"Game with ID: {non_existent_id} not found."
+
+
+def test_get_game_is_served_from_cache(setup_database) -> None:
+    """Test that repeated lookups of a game are answered by the cache."""
+    hits = cache_stats()["games"]["hits"]
+
+    first = GameService().get_game(1)
+    second = GameService().get_game(1)
+
+    assert first == second
+    assert cache_stats()["games"]["hits"] == hits + 1
+
+
+def test_get_game_cache_is_cleared_on_catalog_change(setup_database) -> None:
+    """Test that a catalog change drops cached games."""
+    GameService().get_game(1)
+    db.session.get(Game, 1).name = "Die Macher (Second Edition)"
+    db.session.commit()
+    publish_catalog_change()
+
+    assert GameService().get_game(1)["name"] == "Die Macher (Second Edition)"
+
+
+def test_game_fetched_before_catalog_change_is_not_cached(
+    setup_database, monkeypatch
+) -> None:
+    """Test that a game read before a catalog change is not cached after it."""
+    to_dict = Game.to_dict
+
+    def to_dict_during_catalog_change(game: Game):
+        publish_catalog_change()
+        return to_dict(game)
+
+    monkeypatch.setattr(Game, "to_dict", to_dict_during_catalog_change)
+    GameService().get_game(1)
+    GameService().get_games([2])
+
+    assert cache_stats()["games"]["size"] == 0
+
+
+def test_count_before_catalog_change_is_not_cached(setup_database, monkeypatch) -> None:
+    """Test that a count computed before a catalog change is not cached after it."""
+    filtered_query = GameService._filtered_query
+
+    def query_during_catalog_change(service: GameService, name_filter: str):
+        publish_catalog_change()
+        return filtered_query(service, name_filter)
+
+    monkeypatch.setattr(GameService, "_filtered_query", query_during_catalog_change)
+    GameService().count_games("chess")
+
+    assert cache_stats()["counts"]["size"] == 0
+
+
+def test_get_games_preserves_order_and_reports_missing(setup_database) -> None:
+    """Test that a batch lookup returns games in request order."""
+    result = GameService().get_games([4, 999, 1, 4])
+
+    assert [game["id"] for game in result["games"]] == [4, 1]
+    assert result["missing"] == [999]
+
+
+def test_get_games_with_too_many_ids(setup_database) -> None:
+    """Test that a batch lookup rejects more than MAX_BATCH_GAME_IDS IDs."""
+    with pytest.raises(InvalidGameIdsError):
+        GameService().get_games(list(range(MAX_BATCH_GAME_IDS + 1)))
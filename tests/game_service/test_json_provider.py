@@ -0,0 +1,119 @@
+import datetime
+import math
+import random
+
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from services.common.json_provider import (
+    OrjsonJSONProvider,
+    StreamingJSONProvider,
+    configure_json_provider,
+)
+
+pytest.importorskip("orjson")
+
+SAMPLES = [
+    {"games": [{"id": 1, "name": "Zelda"}], "page": 1, "total_pages": 3},
+    {"name": "Pokémon Ōkami 😀", "line": "\u2028", "del": "\x7f"},
+    {"name": "Pokémon ☃ 😀", "control": '\x00\x1f\t\n"\\/', "del": "\x7f "},
+    {"b": [1.5, 1e16, 1e-05, 0.0001, 1e22, -2.5e-300, 123456789.125], "a": True},
+    {"text": "1e16 0.00001", "nested": {"z": None, "y": [[], {}, ""]}},
+    {"score": math.nan, "other": math.inf},
+    {"scores": [None, (1.5, -math.inf)], "next": None},
+    {"when": datetime.datetime(2024, 5, 1, 12, 30)},
+    {"big": 2**70, "small": -(2**63)},
+    {2: "integer key", 1: "keys"},
+    [3, "mixed", None, False, {"key": 0.1}],
+]
+
+
+def encode_with(provider: DefaultJSONProvider, obj) -> bytes:
+    """
+    Encode data like jsonify does with a provider.
+
+    Args:
+        provider (DefaultJSONProvider): The JSON provider.
+        obj: The data to encode.
+
+    Returns:
+        bytes: The body of the response.
+    """
+    return provider.response(obj).get_data()
+
+
+@pytest.mark.parametrize("obj", SAMPLES)
+def test_orjson_output_matches_default_provider(obj):
+    """Test that orjson responses are byte for byte those of Flask's provider."""
+    app = Flask(__name__)
+
+    expected = encode_with(DefaultJSONProvider(app), obj)
+
+    assert encode_with(OrjsonJSONProvider(app), obj) == expected
+    assert encode_with(StreamingJSONProvider(app), obj) == expected
+
+
+def test_orjson_output_matches_for_random_floats():
+    """Test that floats in any range are written like repr() writes them."""
+    app = Flask(__name__)
+    generator = random.Random(0)
+    floats = [
+        generator.uniform(-1, 1) * 10 ** generator.randint(-30, 30) for _ in range(5000)
+    ]
+
+    expected = encode_with(DefaultJSONProvider(app), {"floats": floats})
+
+    assert encode_with(OrjsonJSONProvider(app), {"floats": floats}) == expected
+
+
+def test_orjson_encodes_nulls_without_fallback(monkeypatch):
+    """Test that data with None but finite floats is not encoded with json."""
+    app = Flask(__name__)
+    obj = {"games": [{"id": 1, "score": 0.5}], "next_cursor": None}
+    expected = encode_with(DefaultJSONProvider(app), obj)
+    provider = OrjsonJSONProvider(app)
+
+    def fail(self, obj):
+        raise AssertionError("Encoded with json.dumps")
+
+    monkeypatch.setattr(StreamingJSONProvider, "encode", fail)
+
+    assert provider.encode(obj) + b"\n" == expected
+
+
+@pytest.mark.parametrize("provider", ["orjson", "json"])
+def test_streamed_response_matches_buffered_response(provider: str):
+    """Test that long lists are streamed in chunks with the same bytes."""
+    app = Flask(__name__)
+    games = [{"id": number, "name": f"Game é{number}"} for number in range(1000)]
+    obj = {"games": games, "page": 1, "empty": []}
+    expected = encode_with(DefaultJSONProvider(app), obj)
+
+    configure_json_provider(app, provider, stream_min_items=100)
+    response = app.json.response(obj)
+
+    assert response.is_streamed
+    chunks = list(response.response)
+    assert len(chunks) > 3
+    assert b"".join(chunks) == expected
+    assert not app.json.response({"games": games[:99]}).is_streamed
+    assert encode_with(app.json, games) == encode_with(DefaultJSONProvider(app), games)
+
+
+def test_debug_responses_stay_indented():
+    """Test that responses are pretty printed in debug mode like jsonify does."""
+    app = Flask(__name__)
+    app.debug = True
+    configure_json_provider(app, "orjson", stream_min_items=1)
+
+    body = app.json.response({"games": [1, 2]}).get_data()
+
+    assert body == encode_with(DefaultJSONProvider(app), {"games": [1, 2]})
+    assert b"\n  " in body
+
+
+def test_unsupported_provider_is_rejected():
+    """Test that unknown providers are rejected."""
+    with pytest.raises(ValueError, match="ujson"):
+        configure_json_provider(Flask(__name__), "ujson", 0)
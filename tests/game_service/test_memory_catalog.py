@@ -0,0 +1,71 @@
+import pytest
+from flask.testing import FlaskClient
+
+from services.game_service.database.database import db
+from services.game_service.database.models import Game
+from services.game_service.game_service import GameService
+from services.game_service.utils.catalog_events import notify_catalog_changed
+from services.game_service.utils.memory_catalog import (
+    disable_memory_catalog,
+    enable_memory_catalog,
+    get_memory_catalog,
+)
+
+READ_PATHS = [
+    "/games/4",
+    "/games/9999",
+    "/games?page=2&limit=3",
+    "/games?name=chess&sort=name",
+    "/games?name=xyz",
+    "/games?limit=3&cursor=",
+    "/games?ids=171,2,9999",
+]
+
+
+@pytest.fixture
+def memory_catalog(setup_database):
+    """Enable the in-memory catalog for a test and disable it afterwards."""
+    enable_memory_catalog()
+    yield get_memory_catalog()
+    disable_memory_catalog()
+
+
+@pytest.mark.parametrize("path", READ_PATHS)
+def test_memory_catalog_matches_database(client: FlaskClient, path: str) -> None:
+    """Test that the in-memory catalog returns the same responses as the database."""
+    expected = client.get(path)
+    notify_catalog_changed()
+
+    enable_memory_catalog()
+    try:
+        response = client.get(path)
+    finally:
+        disable_memory_catalog()
+
+    assert response.status_code == expected.status_code
+    assert response.data == expected.data
+
+
+def test_memory_catalog_does_not_query_database(memory_catalog) -> None:
+    """Test that reads are answered from memory until the catalog changes."""
+    Game.query.filter_by(game_id=4).delete()
+    db.session.commit()
+
+    assert GameService().get_game(4) == {"id": 4, "name": "Tal der Könige"}
+    assert GameService().get_games([4, 9999]) == {
+        "games": [{"id": 4, "name": "Tal der Könige"}],
+        "missing": [9999],
+    }
+
+
+def test_memory_catalog_is_swapped_on_catalog_change(memory_catalog) -> None:
+    """Test that a reload replaces the catalog and leaves the old one intact."""
+    db.session.add(Game(game_id=7, name="Chess Deluxe"))
+    db.session.commit()
+    notify_catalog_changed()
+
+    reloaded_catalog = get_memory_catalog()
+    assert reloaded_catalog is not memory_catalog
+    assert reloaded_catalog.get(7) == {"id": 7, "name": "Chess Deluxe"}
+    assert memory_catalog.get(7) is None
+    assert GameService().count_games("chess") == 3
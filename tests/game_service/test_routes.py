@@ -1,5 +1,15 @@
+import base64
+import json
+
+import pytest
+from flask import Flask
 from flask.testing import FlaskClient
 
+from services.game_service.database.catalog_version import publish_catalog_change
+from services.game_service.database.database import db
+from services.game_service.database.models import Game
+from services.game_service.routes import configure_list_response_cache, list_games
+
 
 def test_list_games(client: FlaskClient) -> None:
     """Test listing pages with pagination."""
@@ -10,6 +20,22 @@ def test_list_games(client: FlaskClient) -> None:
     assert len(data["games"]) == 2
 
 
+def test_list_games_second_page(client: FlaskClient) -> None:
+    """Test that later pages continue where the previous page ended."""
+    response = client.get("/games?page=2&limit=5")
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["page"] == 2
+    assert data["limit"] == 5
+    assert data["total"] == 8
+    assert [game["name"] for game in data["games"]] == [
+        "Mare Mediterraneum",
+        "Buffalo Chess",
+        "Chess",
+    ]
+
+
 def test_filter_games(client: FlaskClient) -> None:
     """Test filtering games by a name query parameter."""
     response = client.get("/games?name=Chess")
@@ -49,3 +75,186 @@ def test_get_game_by_id(client: FlaskClient) -> None:
 
     assert response.status_code == 200
     assert data["name"] == "Die Macher"
+
+
+def test_list_games_with_cursor(client: FlaskClient) -> None:
+    """Test walking through all games with cursor based pagination."""
+    names = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(f"/games?cursor={cursor}&limit=3")
+        data = response.get_json()
+        assert response.status_code == 200
+        assert "page" not in data
+        names.extend(game["name"] for game in data["games"])
+        cursor = data["next_cursor"]
+
+    assert len(names) == 8
+    assert names[0] == "Die Macher"
+    assert names[-1] == "Chess"
+
+
+def test_list_games_with_cursor_sorted_by_name(client: FlaskClient) -> None:
+    """Test that a name sorted cursor listing continues in name order."""
+    first_page = client.get("/games?cursor=&limit=2&sort=name").get_json()
+    assert [game["name"] for game in first_page["games"]] == [
+        "Acquire",
+        "Buffalo Chess",
+    ]
+
+    cursor = first_page["next_cursor"]
+    second_page = client.get(f"/games?cursor={cursor}&limit=2&sort=name").get_json()
+    assert [game["name"] for game in second_page["games"]] == [
+        "Chess",
+        "Die Macher",
+    ]
+
+
+def test_list_games_sorted_by_name(client: FlaskClient) -> None:
+    """Test that page based listings can be sorted by name."""
+    response = client.get("/games?page=2&limit=3&sort=name")
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert [game["name"] for game in data["games"]] == [
+        "Die Macher",
+        "Dragonmaster",
+        "Mare Mediterraneum",
+    ]
+
+
+def test_invalid_cursor(client: FlaskClient) -> None:
+    """Test that malformed cursors and cursors of another sort are rejected."""
+    id_cursor = client.get("/games?cursor=&limit=2").get_json()["next_cursor"]
+
+    assert client.get("/games?cursor=not-a-cursor").status_code == 422
+    assert client.get(f"/games?cursor={id_cursor}&sort=name").status_code == 422
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        '{"sort":"id","after":[true]}',
+        '{"sort":"id","after":[9223372036854775808]}',
+        r'{"sort":"name","after":["\ud800",1]}',
+    ],
+)
+def test_cursor_with_unusable_key_is_rejected(client: FlaskClient, payload) -> None:
+    """Test that booleans, huge IDs and lone surrogates are rejected in cursors."""
+    cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+
+    sort = "name" if '"name"' in payload else "id"
+    response = client.get(f"/games?cursor={cursor}&sort={sort}")
+
+    assert response.status_code == 422
+
+
+def test_invalid_sort_key(client: FlaskClient) -> None:
+    """Test that unsupported sort keys are rejected."""
+    response = client.get("/games?sort=rating")
+
+    assert response.status_code == 422
+    assert "error" in response.get_json()
+
+
+def test_cache_stats(client: FlaskClient) -> None:
+    """Test that the cache stats report lookups of games."""
+    client.get("/games/1")
+    client.get("/games/1")
+
+    response = client.get("/games/cache/stats")
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert set(data) == {"games", "counts", "responses"}
+    assert data["games"]["size"] == 1
+    assert data["games"]["hits"] >= 1
+
+
+def test_list_games_response_is_cached(client: FlaskClient) -> None:
+    """Test that a repeated game list query is answered from the response cache."""
+    first = client.get("/games?name=chess&page=1&limit=10")
+    second = client.get("/games?name=Chess&page=1&limit=10")
+
+    assert second.status_code == 200
+    assert second.get_data() == first.get_data()
+    assert client.get("/games/cache/stats").get_json()["responses"]["hits"] >= 1
+
+
+def test_list_games_response_cache_is_cleared_on_catalog_change(
+    client: FlaskClient,
+) -> None:
+    """Test that cached game lists are dropped when the catalog changes."""
+    client.get("/games?name=chess")
+    db.session.add(Game(game_id=100, name="Chess Titans"))
+    db.session.commit()
+    publish_catalog_change()
+
+    response = client.get("/games?name=chess")
+
+    assert response.get_json()["total"] == 3
+
+
+@pytest.mark.parametrize("cache_size", [0, 1024])
+def test_list_games_response_is_streamed(
+    app: Flask, client: FlaskClient, cache_size: int
+) -> None:
+    """Test that long game lists are streamed and not cached."""
+    configure_list_response_cache(cache_size)
+    app.json.stream_min_items = 2
+    try:
+        # The test client always reports its responses as streamed.
+        with app.test_request_context("/games?page=1&limit=2"):
+            response, status = list_games()
+        stats = client.get("/games/cache/stats").get_json()["responses"]
+    finally:
+        app.json.stream_min_items = 0
+        configure_list_response_cache(1024)
+
+    assert status == 200
+    assert response.is_streamed
+    assert len(json.loads(response.get_data())["games"]) == 2
+    assert stats["size"] == 0
+
+
+def test_get_games_by_ids(client: FlaskClient) -> None:
+    """Test looking up several games with the ids query parameter."""
+    response = client.get("/games?ids=2,999,1")
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert [game["name"] for game in data["games"]] == ["Dragonmaster", "Die Macher"]
+    assert data["missing"] == [999]
+
+
+def test_get_games_by_invalid_ids(client: FlaskClient) -> None:
+    """Test that non-integer game IDs are rejected."""
+    response = client.get("/games?ids=1,abc")
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("ids", ["1,²", "-1", str(2**63)])
+def test_get_games_by_ids_rejects_non_decimal_ids(client: FlaskClient, ids: str):
+    """Test that digits that are not decimal and huge IDs are rejected."""
+    response = client.get(f"/games?ids={ids}")
+
+    assert response.status_code == 422
+    assert client.post("/games/batch", json={"ids": [2**64]}).status_code == 422
+
+
+def test_get_games_batch(client: FlaskClient) -> None:
+    """Test looking up several games with a POST request."""
+    response = client.post("/games/batch", json={"ids": [1, 2, 999]})
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert [game["id"] for game in data["games"]] == [1, 2]
+    assert data["missing"] == [999]
+
+
+def test_get_games_batch_without_ids(client: FlaskClient) -> None:
+    """Test that a batch request without a list of IDs is rejected."""
+    response = client.post("/games/batch", json={"ids": "1,2"})
+
+    assert response.status_code == 422
@@ -0,0 +1,96 @@
+import pytest
+
+from services.game_service.database.database import db
+from services.game_service.database.models import Game
+from services.game_service.game_service import GameService
+from services.game_service.utils.catalog_events import notify_catalog_changed
+from services.game_service.utils.search_index import (
+    NameSearchIndex,
+    disable_name_search_index,
+    enable_name_search_index,
+    get_name_search_index,
+)
+
+
+@pytest.fixture
+def search_index(setup_database):
+    """Enable the name search index for a test and disable it afterwards."""
+    enable_name_search_index()
+    yield get_name_search_index()
+    disable_name_search_index()
+
+
+@pytest.mark.parametrize("name_filter", ["", "c", "ch", "chess", "CHESS", "ss", "kö"])
+@pytest.mark.parametrize("sort", ["id", "name"])
+def test_search_index_matches_database(setup_database, name_filter, sort) -> None:
+    """Test that the index returns the same pages as the database query."""
+    expected = GameService().list_games_page(name_filter, 1, 100, sort)
+
+    enable_name_search_index()
+    try:
+        result = GameService().list_games_page(name_filter, 1, 100, sort)
+    finally:
+        disable_name_search_index()
+
+    assert result == expected
+
+
+def test_search_index_search() -> None:
+    """Test substring matching with terms shorter and longer than an n-gram."""
+    index = NameSearchIndex([(2, "Chess"), (1, "Buffalo Chess"), (3, "Go")])
+
+    assert index.games(index.search("hess")) == [
+        {"id": 1, "name": "Buffalo Chess"},
+        {"id": 2, "name": "Chess"},
+    ]
+    assert index.games(index.search("G")) == [{"id": 3, "name": "Go"}]
+    assert index.search("chessboard") == []
+
+
+def test_search_index_sorts_by_name() -> None:
+    """Test that all games, large and small results are ordered by name and ID."""
+    names = ["Go", "Chess", "Azul", "Chess", "Brass", "Catan", "Agricola", "Go", "Ra"]
+    index = NameSearchIndex(enumerate(names, start=1))
+
+    def by_name(positions):
+        return sorted(positions, key=lambda position: (names[position], position))
+
+    everything = list(range(len(names)))
+    assert index.sort(everything, "name") == by_name(everything)
+    assert index.sort(everything[1:], "name") == by_name(everything[1:])
+    assert index.sort([0, 7, 3], "name") == by_name([0, 7, 3])
+    assert index.sort([0, 7, 3], "id") == [0, 7, 3]
+
+
+def test_search_index_does_not_support_wildcards() -> None:
+    """Test that filters with LIKE wildcards are left to the database."""
+    assert NameSearchIndex.supports("chess")
+    assert not NameSearchIndex.supports("ch%ss")
+    assert not NameSearchIndex.supports("ch_ss")
+
+
+def test_search_index_cursor_pagination(search_index) -> None:
+    """Test walking through a name sorted listing served from the index."""
+    service = GameService()
+    first_page = service.list_games_after("a", "", 3, "name")
+    second_page = service.list_games_after("a", first_page["next_cursor"], 3, "name")
+
+    names = [game["name"] for game in first_page["games"] + second_page["games"]]
+    assert names == [
+        "Acquire",
+        "Buffalo Chess",
+        "Die Macher",
+        "Dragonmaster",
+        "Mare Mediterraneum",
+        "Samurai",
+    ]
+    assert second_page["next_cursor"] is not None
+
+
+def test_search_index_is_rebuilt_on_catalog_change(search_index) -> None:
+    """Test that the index picks up games added by a reseed."""
+    db.session.add(Game(game_id=7, name="Chess Deluxe"))
+    db.session.commit()
+    notify_catalog_changed()
+
+    assert GameService().count_games("chess") == 3
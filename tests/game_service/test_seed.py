@@ -0,0 +1,100 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from services.game_service.database.models import Game
+from services.game_service.database import seed
+from services.game_service.database.seed import seed_data
+
+GAMES_TEST_CSV = str(Path(__file__).parent.parent / "data" / "games_test.csv")
+
+
+def test_seed_data_in_batches(empty_database) -> None:
+    """Test that all games are inserted when seeding in several batches."""
+    seed_data(GAMES_TEST_CSV, batch_size=2)
+
+    games = Game.query.order_by(Game.game_id).all()
+    assert [game.game_id for game in games] == [1, 2, 3, 4, 5]
+    assert games[3].name == "Tal der Könige"
+
+
+def test_failed_seed_data_leaves_database_empty(empty_database, monkeypatch) -> None:
+    """Test that a seed failing midway is rolled back and can be run again."""
+
+    def failing_batches(*args):
+        yield [{"game_id": 1, "name": "Die Macher"}]
+        raise OSError("Read error")
+
+    monkeypatch.setattr(seed, "iter_game_batches", failing_batches)
+    with pytest.raises(OSError):
+        seed_data(GAMES_TEST_CSV)
+    assert Game.query.count() == 0
+
+    monkeypatch.undo()
+    seed_data(GAMES_TEST_CSV)
+    assert Game.query.count() == 5
+
+
+def test_seed_data_skips_populated_database(setup_database) -> None:
+    """Test that seeding does not touch a database that already has games."""
+    seed_data(GAMES_TEST_CSV)
+
+    assert Game.query.count() == 8
+
+
+def test_seed_data_keeps_numeric_names_as_text(empty_database, tmp_path) -> None:
+    """Test that game names consisting of digits are stored as strings."""
+    dataset = tmp_path / "games.csv"
+    dataset.write_text("BGGId,Name,YearPublished\n421,1830,1986\n")
+
+    seed_data(str(dataset))
+
+    assert Game.query.one().to_dict() == {"id": 421, "name": "1830"}
+
+
+def test_seed_data_missing_file(empty_database) -> None:
+    """Test that a missing dataset raises a FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        seed_data("does/not/exist.csv")
+
+
+def test_seed_data_skips_rows_without_name(empty_database, tmp_path) -> None:
+    """Test that games without a name are not inserted."""
+    dataset = tmp_path / "games.csv"
+    dataset.write_text("BGGId,Name\n1,Die Macher\n2,\n")
+
+    seed_data(str(dataset))
+
+    assert Game.query.count() == 1
+
+
+def test_seed_data_skips_invalid_rows(empty_database, tmp_path, caplog) -> None:
+    """Test that short rows and rows without an integer BGGId are skipped."""
+    dataset = tmp_path / "games.csv"
+    dataset.write_text(
+        "BGGId,Name\n1,Die Macher\n2\n,Nameless ID\nx3,Samurai\n4,Acquire\n",
+        encoding="utf-8-sig",
+    )
+
+    seed_data(str(dataset))
+
+    games = Game.query.order_by(Game.game_id).all()
+    assert [game.to_dict() for game in games] == [
+        {"id": 1, "name": "Die Macher"},
+        {"id": 4, "name": "Acquire"},
+    ]
+    assert "Line 3 of" in caplog.text
+    assert "Skipped line 4" in caplog.text
+    assert "Skipped line 5" in caplog.text
+
+
+def test_importing_app_does_not_import_pandas() -> None:
+    """Test that pandas stays out of the startup path of the game service."""
+    code = "import sys, services.game_service.app; print('pandas' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "False"
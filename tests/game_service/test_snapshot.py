@@ -0,0 +1,75 @@
+import os
+from pathlib import Path
+
+from services.game_service.database.models import Game
+from services.game_service.database.seed import seed_data
+from services.game_service.utils.data_loader import iter_csv_game_batches
+from services.game_service.utils.snapshot import (
+    GamesSnapshot,
+    default_snapshot_path,
+    open_fresh_snapshot,
+    write_snapshot,
+)
+
+GAMES_TEST_CSV = str(Path(__file__).parent.parent / "data" / "games_test.csv")
+
+
+def write_test_snapshot(tmp_path: Path) -> str:
+    """Write a snapshot of the games test dataset and return its path."""
+    snapshot_path = str(tmp_path / "games_test.gsnap")
+    write_snapshot(iter_csv_game_batches(GAMES_TEST_CSV), snapshot_path, GAMES_TEST_CSV)
+    return snapshot_path
+
+
+def test_default_snapshot_path() -> None:
+    """Test that the snapshot is placed next to the dataset."""
+    assert default_snapshot_path("data/games.csv") == "data/games.gsnap"
+
+
+def test_snapshot_round_trip(tmp_path) -> None:
+    """Test that a snapshot returns the games of its dataset."""
+    snapshot_path = write_test_snapshot(tmp_path)
+
+    with GamesSnapshot(snapshot_path) as snapshot:
+        assert len(snapshot) == 5
+        assert list(snapshot.game_ids) == [1, 2, 3, 4, 5]
+        assert snapshot.name_at(3) == "Tal der Könige"
+        batches = list(snapshot.iter_batches(2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0][0] == {"game_id": 1, "name": "Die Macher"}
+
+
+def test_stale_snapshot_is_ignored(tmp_path) -> None:
+    """Test that a snapshot is not used once its dataset changed."""
+    dataset = tmp_path / "games.csv"
+    dataset.write_text("BGGId,Name\n1,Die Macher\n")
+    snapshot_path = str(tmp_path / "games.gsnap")
+    write_snapshot(iter_csv_game_batches(str(dataset)), snapshot_path, str(dataset))
+
+    snapshot = open_fresh_snapshot(snapshot_path, str(dataset))
+    assert snapshot is not None
+    snapshot.close()
+
+    dataset.write_text("BGGId,Name\n1,Die Macher\n2,Dragonmaster\n")
+    assert open_fresh_snapshot(snapshot_path, str(dataset)) is None
+
+
+def test_corrupt_snapshot_is_ignored(tmp_path) -> None:
+    """Test that a damaged snapshot is not used."""
+    snapshot_path = write_test_snapshot(tmp_path)
+    with open(snapshot_path, "r+b") as snapshot_file:
+        snapshot_file.seek(-1, os.SEEK_END)
+        snapshot_file.write(b"?")
+
+    assert open_fresh_snapshot(snapshot_path, GAMES_TEST_CSV) is None
+
+
+def test_seed_data_from_snapshot(empty_database, tmp_path) -> None:
+    """Test that seeding reads a fresh snapshot instead of the dataset."""
+    snapshot_path = write_test_snapshot(tmp_path)
+    missing_dataset = str(tmp_path / "missing.csv")
+
+    seed_data(missing_dataset, snapshot_path=snapshot_path)
+
+    assert Game.query.count() == 5
@@ -0,0 +1,110 @@
+from services.game_service.database.catalog_version import (
+    CatalogVersionWatcher,
+    bump_catalog_version,
+    get_catalog_version,
+)
+from services.game_service.database.database import db
+from services.game_service.database.models import Game
+from services.game_service.database.sync import sync_catalog
+from services.game_service.game_service import GameService
+from services.game_service.utils.catalog_events import (
+    on_catalog_change,
+    remove_catalog_listener,
+)
+
+UPDATED_DATASET = """BGGId,Name
+1,Die Macher
+2,Dragonmaster
+3,Samurai
+4,Tal der Koenige
+5,Acquire
+6,Mare Mediterraneum
+171,Chess
+172,Chess Deluxe
+172,Chess Deluxe Duplicate
+"""
+
+
+def test_sync_catalog(setup_database, tmp_path) -> None:
+    """Test that only new, changed and removed games are written."""
+    dataset = tmp_path / "games.csv"
+    dataset.write_text(UPDATED_DATASET)
+    version = get_catalog_version()
+
+    result = sync_catalog(str(dataset), batch_size=3)
+
+    assert result == {
+        "inserted": 1,
+        "updated": 1,
+        "deleted": 1,
+        "unchanged": 6,
+        "skipped": 0,
+    }
+    assert get_catalog_version() == version + 1
+    assert Game.query.count() == 8
+    assert db.session.get(Game, 4).name == "Tal der Koenige"
+    assert db.session.get(Game, 32) is None
+    assert db.session.get(Game, 172).name == "Chess Deluxe"
+
+
+def test_sync_catalog_keeps_games_of_rows_without_name(setup_database, tmp_path):
+    """Test that rows without a name neither delete nor rename stored games."""
+    dataset = tmp_path / "games.csv"
+    rows = [f"{game.game_id},{game.name}" for game in Game.query.all()]
+    rows = [row for row in rows if not row.startswith(("3,", "5,"))]
+    dataset.write_text("\n".join(["BGGId,Name", *rows, "3,", "5", "999,"]))
+
+    result = sync_catalog(str(dataset))
+
+    assert result["skipped"] == 3
+    assert result["deleted"] == result["inserted"] == 0
+    assert db.session.get(Game, 3).name == "Samurai"
+    assert db.session.get(Game, 5).name == "Acquire"
+    assert db.session.get(Game, 999) is None
+
+
+def test_sync_catalog_refreshes_counts(setup_database, tmp_path) -> None:
+    """Test that cached counts are invalidated by a synchronization."""
+    dataset = tmp_path / "games.csv"
+    dataset.write_text(UPDATED_DATASET)
+    assert GameService().count_games("chess") == 2
+
+    sync_catalog(str(dataset))
+
+    assert GameService().count_games("chess") == 2
+    assert GameService().count_games("deluxe") == 1
+    assert GameService().count_games("buffalo") == 0
+
+
+def test_sync_catalog_without_changes(setup_database, tmp_path) -> None:
+    """Test that an unchanged dataset does not bump the catalog version."""
+    dataset = tmp_path / "games.csv"
+    rows = [f"{game.game_id},{game.name}" for game in Game.query.all()]
+    dataset.write_text("\n".join(["BGGId,Name", *rows]))
+    version = get_catalog_version()
+
+    result = sync_catalog(str(dataset))
+
+    assert result["unchanged"] == 8
+    assert get_catalog_version() == version
+
+
+def test_catalog_version_watcher(setup_database) -> None:
+    """Test that the watcher notifies listeners once the version changes."""
+    notifications = []
+
+    @on_catalog_change
+    def record_change() -> None:
+        notifications.append(get_catalog_version())
+
+    try:
+        watcher = CatalogVersionWatcher(interval=0)
+        watcher.check()
+        watcher.check()
+        assert notifications == []
+
+        bump_catalog_version()
+        watcher.check()
+        assert notifications == [get_catalog_version()]
+    finally:
+        remove_catalog_listener(record_change)
@@ -7,6 +7,15 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 
 from services.user_service.app import create_app, setup_database
 from services.user_service.database.database import db
+from services.user_service.utils.game_client import (
+    LocalGameClient,
+    configure_game_client,
+)
+from services.user_service.utils.recommender import (
+    RecommenderUpdater,
+    disable_recommender,
+    enable_recommender,
+)
 
 from .seed_data import seed_database
 
@@ -58,6 +67,33 @@ def isolated_db_session(app: Flask):
         session = scoped_session(session_factory)
         db.session = session
         yield
-        transaction.rollback()
+        if transaction.is_active:
+            transaction.rollback()
         connection.close()
         session.remove()
+
+
+@pytest.fixture
+def game_client() -> Generator[LocalGameClient, None, None]:
+    """
+    Look up games with a local stand-in for the game service.
+
+    Yields (LocalGameClient): The client, knowing the games 2 and 4.
+    """
+    game_client = LocalGameClient({2: "Dragonmaster", 4: "Tal der Könige"})
+    configure_game_client(game_client)
+    yield game_client
+    configure_game_client(None)
+
+
+@pytest.fixture
+def recommender(app: Flask) -> Generator[RecommenderUpdater, None, None]:
+    """
+    Serve recommendations and record favorite events during a test.
+
+    Yields (RecommenderUpdater): An updater of the recommender, which applies
+        the recorded events when called.
+    """
+    enable_recommender()
+    yield RecommenderUpdater(app, compaction_seconds=3600, poll_seconds=0.5)
+    disable_recommender()
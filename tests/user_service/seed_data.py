@@ -1,4 +1,5 @@
 from services.user_service.database.database import db
+from services.user_service.database.favorite_counts import rebuild_favorite_counts
 from services.user_service.database.models import FavoriteGame, User
 
 
@@ -47,3 +48,4 @@ def seed_database() -> None:
     """Seed the test database with initial data."""
     seed_users()
     seed_favorite_games()
+    rebuild_favorite_counts()
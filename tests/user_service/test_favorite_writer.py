@@ -0,0 +1,132 @@
+import threading
+from typing import Generator
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import select
+
+from services.user_service.database.database import db
+from services.user_service.database.models import FavoriteGame, GameFavoriteCount
+from services.user_service.exceptions import (
+    DatabaseError,
+    GameAlreadyInFavoritesError,
+    UserNotFoundError,
+)
+from services.user_service.utils.favorite_writer import (
+    FavoriteGroupWriter,
+    _PendingFavorite,
+    start_favorite_group_commit,
+    stop_favorite_group_commit,
+)
+
+
+@pytest.fixture
+def group_commit(app: Flask) -> Generator[FavoriteGroupWriter, None, None]:
+    """
+    Write favorites with the group commit writer during a test.
+
+    Yields (FavoriteGroupWriter): The running writer.
+    """
+    yield start_favorite_group_commit(app, max_batch=4, max_delay=1)
+    stop_favorite_group_commit()
+
+
+def test_batch_keeps_errors_per_favorite(app: Flask):
+    """Test that missing users and repeated favorites only fail their request."""
+    batch = [
+        _PendingFavorite(1, 3),
+        _PendingFavorite(1, 3),
+        _PendingFavorite(9999, 3),
+        _PendingFavorite(2, 2),
+        _PendingFavorite(2, 3),
+    ]
+
+    FavoriteGroupWriter(app, max_batch=10, max_delay=0).write(batch)
+
+    errors = [type(favorite.error) for favorite in batch]
+    assert errors == [
+        type(None),
+        GameAlreadyInFavoritesError,
+        UserNotFoundError,
+        GameAlreadyInFavoritesError,
+        type(None),
+    ]
+    assert all(favorite.done.is_set() for favorite in batch)
+    favorites = db.session.execute(
+        select(FavoriteGame.user_id).where(FavoriteGame.game_id == 3)
+    ).scalars()
+    assert sorted(favorites) == [1, 2]
+    assert db.session.get(GameFavoriteCount, 3).favorite_count == 2
+
+
+def test_failed_batch_answers_every_request(app: Flask, monkeypatch):
+    """Test that favorites of a batch that fails unexpectedly are not reported added."""
+    writer = FavoriteGroupWriter(app, max_batch=10, max_delay=0)
+
+    def fail(batch):
+        raise RuntimeError("lost connection")
+
+    monkeypatch.setattr(writer, "_insert", fail)
+    batch = [_PendingFavorite(1, 3)]
+
+    with pytest.raises(RuntimeError):
+        writer.write(batch)
+
+    assert isinstance(batch[0].error, DatabaseError)
+    assert batch[0].done.is_set()
+
+
+def test_submit_fails_if_the_writer_does_not_answer(app: Flask, monkeypatch):
+    """Test that requests do not wait forever for a stopped or stuck writer."""
+    writer = FavoriteGroupWriter(app, max_batch=10, max_delay=0, timeout=0.1)
+    with pytest.raises(DatabaseError):
+        writer.submit(1, 3)
+
+    release = threading.Event()
+    monkeypatch.setattr(writer, "write", lambda batch: release.wait())
+    writer.start()
+    with pytest.raises(DatabaseError):
+        writer.submit(1, 3)
+    release.set()
+
+    writer.stop()
+    with pytest.raises(DatabaseError):
+        writer.submit(1, 3)
+
+
+def test_concurrent_requests_share_a_transaction(
+    client: FlaskClient, group_commit: FavoriteGroupWriter, monkeypatch
+):
+    """Test that concurrent requests are answered like with a commit per request."""
+    batch_sizes = []
+    insert = group_commit._insert
+
+    def spy(batch):
+        batch_sizes.append(len(batch))
+        insert(batch)
+
+    monkeypatch.setattr(group_commit, "_insert", spy)
+    requests = [(1, 3), (1, 3), (9999, 3), (2, 5)]
+    statuses = [0] * len(requests)
+    ready = threading.Barrier(len(requests))
+
+    def post(number: int) -> None:
+        user_id, game_id = requests[number]
+        ready.wait()
+        response = client.post(f"/users/{user_id}/favorites", json={"game_id": game_id})
+        statuses[number] = response.status_code
+
+    threads = [
+        threading.Thread(target=post, args=(number,)) for number in range(len(requests))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert batch_sizes == [4]
+    assert sorted(statuses[:2]) == [200, 409]
+    assert statuses[2:] == [404, 200]
+    favorites = client.get("/users/2/favorites").get_json()
+    assert [favorite["game_id"] for favorite in favorites] == [2, 5]
@@ -0,0 +1,117 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Generator, List
+
+import pytest
+
+from services.user_service.utils.game_client import (
+    MAX_BATCH_GAME_IDS,
+    GameServiceUnavailableError,
+    HttpGameClient,
+)
+
+GAME_NAMES = {game_id: f"Game {game_id}" for game_id in range(1, 251)}
+
+
+class BatchHandler(BaseHTTPRequestHandler):
+    """Answers batch requests like the game service."""
+
+    protocol_version = "HTTP/1.1"
+    requests: List[List[int]] = []
+    delay = 0.0
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Return the known games of the requested batch."""
+        length = int(self.headers["Content-Length"])
+        game_ids = json.loads(self.rfile.read(length))["ids"]
+        self.requests.append(game_ids)
+        time.sleep(self.delay)
+        body = json.dumps(
+            {
+                "games": [
+                    {"id": game_id, "name": GAME_NAMES[game_id]}
+                    for game_id in game_ids
+                    if game_id in GAME_NAMES
+                ],
+                "missing": [
+                    game_id for game_id in game_ids if game_id not in GAME_NAMES
+                ],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        """Keep the test output quiet."""
+
+
+@pytest.fixture
+def game_service_url() -> Generator[str, None, None]:
+    """
+    Serve the batch endpoint of a game service on a free local port.
+
+    Yields (str): The URL of the server.
+    """
+    BatchHandler.requests = []
+    BatchHandler.delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BatchHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_game_names_in_batches(game_service_url: str) -> None:
+    """Test that game IDs are looked up in batches of MAX_BATCH_GAME_IDS."""
+    client = HttpGameClient(game_service_url)
+
+    game_names = client.get_game_names([*range(1, 251), 999])
+
+    assert game_names == GAME_NAMES
+    assert [len(batch) for batch in BatchHandler.requests] == [
+        MAX_BATCH_GAME_IDS,
+        MAX_BATCH_GAME_IDS,
+        51,
+    ]
+    client.close()
+
+
+def test_get_game_names_from_cache(game_service_url: str) -> None:
+    """Test that known names are not requested again."""
+    client = HttpGameClient(game_service_url)
+
+    client.get_game_names([1, 2])
+    game_names = client.get_game_names([2, 1, 3])
+
+    assert game_names == {1: "Game 1", 2: "Game 2", 3: "Game 3"}
+    assert BatchHandler.requests == [[1, 2], [3]]
+    assert client.cache_stats()["hits"] == 2
+    client.close()
+
+
+def test_get_game_names_without_game_service() -> None:
+    """Test that an unreachable game service raises an error."""
+    client = HttpGameClient("http://127.0.0.1:9", timeout=0.5)
+
+    with pytest.raises(GameServiceUnavailableError):
+        client.get_game_names([1])
+
+
+def test_get_game_names_within_timeout(game_service_url: str) -> None:
+    """Test that the timeout bounds a lookup over all of its batches."""
+    BatchHandler.delay = 0.3
+    client = HttpGameClient(game_service_url, timeout=0.5)
+
+    start = time.monotonic()
+    with pytest.raises(GameServiceUnavailableError):
+        client.get_game_names(range(1, 251))
+
+    assert time.monotonic() - start < 0.8
+    assert len(BatchHandler.requests) == 2
+    client.close()
@@ -0,0 +1,120 @@
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+from services.user_service.app import create_app, setup_database
+from services.user_service.database.database import (
+    db,
+    recreate_without_rowid_reuse,
+)
+from services.user_service.database.models import FavoriteEvent
+
+
+def test_setup_database_migrates_legacy_favorites(tmp_path: Path):
+    """Test that duplicates are removed and indexes and counts are created."""
+    database_url = f"sqlite:///{tmp_path / 'users.db'}"
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE users (user_id INTEGER PRIMARY KEY, "
+                "username VARCHAR(80) NOT NULL UNIQUE)"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE TABLE favorite_games (favorite_id INTEGER PRIMARY KEY, "
+                "user_id INTEGER NOT NULL REFERENCES users (user_id), "
+                "game_id INTEGER NOT NULL)"
+            )
+        )
+        connection.execute(text("INSERT INTO users VALUES (1, 'Tom')"))
+        connection.execute(
+            text("INSERT INTO favorite_games VALUES (1, 1, 4), (2, 1, 2), (3, 1, 4)")
+        )
+    engine.dispose()
+
+    app = create_app(database_url)
+    setup_database(app)
+
+    with app.app_context():
+        index_names = {
+            index["name"] for index in inspect(db.engine).get_indexes("favorite_games")
+        }
+        with db.engine.connect() as connection:
+            rows = connection.execute(
+                text("SELECT favorite_id FROM favorite_games ORDER BY favorite_id")
+            ).scalars()
+            favorite_ids = list(rows)
+            favorite_counts = connection.execute(
+                text("SELECT game_id, favorite_count FROM game_favorite_counts")
+            ).all()
+            user_index_names = connection.execute(
+                text(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type = 'index' AND tbl_name = 'users' AND sql IS NOT NULL"
+                )
+            ).scalars()
+            user_index_names = list(user_index_names)
+
+        assert index_names == {
+            "ix_favorite_games_user_id_game_id",
+            "ix_favorite_games_game_id",
+        }
+        assert user_index_names == ["ix_users_lower_username_user_id"]
+        assert favorite_ids == [1, 2]
+        assert sorted(favorite_counts) == [(2, 1), (4, 1)]
+        db.engine.dispose()
+
+
+def test_setup_database_recreates_favorite_events_with_autoincrement(
+    tmp_path: Path,
+):
+    """Test that an event table that may reuse IDs is recreated."""
+    database_url = f"sqlite:///{tmp_path / 'users.db'}"
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE favorite_events (event_id INTEGER PRIMARY KEY, "
+                "user_id INTEGER NOT NULL, added JSON NOT NULL, "
+                "removed JSON NOT NULL, favorites JSON NOT NULL, "
+                "created_at FLOAT NOT NULL)"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO favorite_events VALUES (1, 1, '[]', '[]', '[]', 0)")
+        )
+    engine.dispose()
+
+    app = create_app(database_url)
+    setup_database(app)
+
+    with app.app_context():
+        recreated_again = recreate_without_rowid_reuse(FavoriteEvent.__table__)
+    with app.app_context(), db.engine.begin() as connection:
+        sql = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE name = 'favorite_events'")
+        ).scalar()
+        connection.execute(text("DELETE FROM favorite_events"))
+        connection.execute(
+            text(
+                "INSERT INTO favorite_events (user_id, added, removed, favorites, "
+                "created_at) VALUES (1, '[]', '[]', '[]', 0)"
+            )
+        )
+        connection.execute(text("DELETE FROM favorite_events WHERE event_id = 1"))
+        connection.execute(
+            text(
+                "INSERT INTO favorite_events (user_id, added, removed, favorites, "
+                "created_at) VALUES (1, '[]', '[]', '[]', 0)"
+            )
+        )
+        event_ids = connection.execute(
+            text("SELECT event_id FROM favorite_events")
+        ).scalars()
+        event_ids = list(event_ids)
+
+    assert not recreated_again
+    assert "AUTOINCREMENT" in sql
+    assert event_ids == [2]
@@ -0,0 +1,80 @@
+import numpy as np
+
+from services.user_service.utils.recommender import ItemSimilarityRecommender
+
+
+def build_recommender() -> ItemSimilarityRecommender:
+    """Build a recommender where game 10 is mostly favored together with game 20."""
+    favorites = [
+        (1, 10),
+        (1, 20),
+        (2, 10),
+        (2, 20),
+        (3, 10),
+        (3, 30),
+        (4, 40),
+    ]
+    user_ids, game_ids = np.array(favorites).T
+    return ItemSimilarityRecommender.from_favorites(user_ids, game_ids, neighbors=2)
+
+
+def test_neighbors_are_ordered_by_similarity() -> None:
+    """Test that each game keeps its most similar games, best first."""
+    recommender = build_recommender()
+
+    neighbors = recommender.neighbor_columns[0]
+    assert list(recommender.game_ids[neighbors]) == [20, 30]
+    assert recommender.neighbor_scores[0][0] > recommender.neighbor_scores[0][1] > 0
+
+
+def test_games_without_co_occurrences_have_no_neighbors() -> None:
+    """Test that a game nobody else favors has no neighbors."""
+    recommender = build_recommender()
+
+    assert list(recommender.neighbor_columns[3]) == [-1, -1]
+
+
+def test_recommend_excludes_favorites() -> None:
+    """Test that recommendations are ranked and never contain favorites."""
+    recommender = build_recommender()
+
+    recommendations = recommender.recommend([10], limit=5)
+
+    assert [game["game_id"] for game in recommendations] == [20, 30]
+    assert recommender.recommend([10, 20, 30], limit=5) == []
+
+
+def test_recommend_ignores_unknown_games() -> None:
+    """Test that games unknown to the recommender do not fail the request."""
+    recommender = build_recommender()
+
+    assert recommender.recommend([99], limit=5) == []
+    assert recommender.recommend([20, 99], limit=1)[0]["game_id"] == 10
+
+
+def test_added_favorite_creates_neighbors() -> None:
+    """Test that a new favorite links the game with the user's other favorites."""
+    recommender = build_recommender()
+
+    assert recommender.recommend([40], limit=5) == []
+    assert recommender.apply_favorite_change(40, [10, 20], delta=1)
+
+    recommended = {game["game_id"] for game in recommender.recommend([40], limit=5)}
+    assert recommended == {10, 20}
+
+
+def test_removed_favorite_drops_neighbors() -> None:
+    """Test that removing the only co-occurrence of two games unlinks them."""
+    recommender = build_recommender()
+
+    assert recommender.apply_favorite_change(30, [10], delta=-1)
+
+    assert [game["game_id"] for game in recommender.recommend([30], limit=5)] == []
+    assert [game["game_id"] for game in recommender.recommend([10], limit=5)] == [20]
+
+
+def test_change_of_unknown_game_waits_for_rebuild() -> None:
+    """Test that games unknown to the recommender are not applied."""
+    recommender = build_recommender()
+
+    assert not recommender.apply_favorite_change(99, [10], delta=1)
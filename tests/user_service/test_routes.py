@@ -1,4 +1,23 @@
+import base64
+import time
+
+import pytest
 from flask.testing import FlaskClient
+from sqlalchemy import insert
+
+from services.user_service.database.database import db
+from services.user_service.database.models import FavoriteGame
+from services.user_service.user_service import UserService
+from services.user_service.utils.favorite_events import (
+    latest_favorite_event_id,
+    prune_favorite_events,
+)
+from services.user_service.utils.game_client import LocalGameClient
+from services.user_service.utils.recommender import (
+    RecommenderUpdater,
+    build_recommender,
+    get_recommender,
+)
 
 
 def test_create_user(client: FlaskClient):
@@ -64,3 +83,355 @@ def test_get_favorite_games(client: FlaskClient):
     assert len(response_data) == 2
     assert response_data[0]["game_id"] == 4
     assert response_data[1]["game_id"] == 2
+
+
+def test_get_hydrated_favorite_games(client: FlaskClient, game_client: LocalGameClient):
+    """Test that hydrated favorites include the names of the games."""
+    response = client.get("/users/1/favorites?hydrate=true")
+    response_data = response.get_json()
+
+    assert response.status_code == 200
+    assert response_data == [
+        {"user_id": 1, "game_id": 4, "name": "Tal der Könige"},
+        {"user_id": 1, "game_id": 2, "name": "Dragonmaster"},
+    ]
+
+
+def test_get_favorite_games_of_user_without_favorites(client: FlaskClient):
+    """Test that a user without favorite games gets an empty list."""
+    user_id = client.post("/users", json={"username": "Alex"}).get_json()["user_id"]
+
+    response = client.get(f"/users/{user_id}/favorites")
+
+    assert response.status_code == 200
+    assert response.get_json() == []
+
+
+def test_get_favorite_games_user_not_found(client: FlaskClient):
+    """Test to retrieve the favorite games of a non-existent user."""
+    response = client.get("/users/9999/favorites")
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "User with user_id '9999' not found"
+
+
+def test_update_favorite_games(client: FlaskClient):
+    """Test to add and remove many favorite games at once."""
+    payload = {"add": [5, 4, 5], "remove": [2, 7]}
+    response = client.post("/users/1/favorites/bulk", json=payload)
+    response_data = response.get_json()
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response_data["results"]] == [
+        "removed",
+        "not_in_favorites",
+        "added",
+        "already_in_favorites",
+        "already_in_favorites",
+    ]
+    favorite_games = client.get("/users/1/favorites").get_json()
+    assert [game["game_id"] for game in favorite_games] == [4, 5]
+
+
+def test_update_favorite_games_skips_concurrent_changes(
+    client: FlaskClient, monkeypatch
+):
+    """Test that favorites changed by a concurrent request are skipped."""
+    ensure_user = UserService._ensure_user
+
+    def add_and_remove_concurrently(self, user_id: int):
+        db.session.execute(insert(FavoriteGame), [{"user_id": 1, "game_id": 7}])
+        db.session.execute(
+            FavoriteGame.__table__.delete().where(FavoriteGame.game_id == 4)
+        )
+        return ensure_user(self, user_id)
+
+    monkeypatch.setattr(UserService, "_ensure_user", add_and_remove_concurrently)
+    payload = {"add": [7, 8], "remove": [4]}
+    response = client.post("/users/1/favorites/bulk", json=payload)
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.get_json()["results"]] == [
+        "not_in_favorites",
+        "already_in_favorites",
+        "added",
+    ]
+    counts = client.get("/favorites/games/counts?game_ids=7,8").get_json()["counts"]
+    assert [count["favorite_count"] for count in counts] == [0, 1]
+
+
+def test_update_favorite_games_user_not_found(client: FlaskClient):
+    """Test to update the favorite games of a non-existent user."""
+    response = client.post("/users/9999/favorites/bulk", json={"add": [1]})
+
+    assert response.status_code == 404
+
+
+def test_update_favorite_games_invalid_ids(client: FlaskClient):
+    """Test that game IDs must be integers."""
+    response = client.post("/users/1/favorites/bulk", json={"add": ["1"]})
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "add must be a list of int"
+
+
+@pytest.mark.parametrize("game_id", [2**63, -(2**63) - 1, 2**64])
+def test_update_favorite_games_out_of_range_ids(client: FlaskClient, game_id: int):
+    """Test that game IDs must fit in 64 bits."""
+    response = client.post("/users/1/favorites/bulk", json={"remove": [1, game_id]})
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "remove must be a list of int64"
+
+
+def test_get_favorite_count(client: FlaskClient):
+    """Test to retrieve how many users favor a game."""
+    response = client.get("/favorites/games/2/count")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"game_id": 2, "favorite_count": 2}
+
+
+def test_favorite_count_follows_changes(client: FlaskClient):
+    """Test that adding and removing favorites updates the favorite counts."""
+    client.post("/users/2/favorites", json={"game_id": 4})
+    client.post("/users/1/favorites/bulk", json={"add": [7], "remove": [2]})
+
+    response = client.get("/favorites/games/counts?game_ids=4,2,7,8")
+
+    assert response.status_code == 200
+    assert response.get_json()["counts"] == [
+        {"game_id": 4, "favorite_count": 2},
+        {"game_id": 2, "favorite_count": 1},
+        {"game_id": 7, "favorite_count": 1},
+        {"game_id": 8, "favorite_count": 0},
+    ]
+
+
+def test_get_favorite_counts_invalid_ids(client: FlaskClient):
+    """Test that game IDs must be integers."""
+    response = client.get("/favorites/games/counts?game_ids=1,a")
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("game_id", [2**63, -(2**63) - 1, 2**64])
+def test_get_favorite_counts_out_of_range_ids(client: FlaskClient, game_id: int):
+    """Test that game IDs must fit in 64 bits."""
+    response = client.get(f"/favorites/games/counts?game_ids=1,{game_id}")
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "game_ids must be a list of int64"
+
+
+def test_get_most_favorited_games(client: FlaskClient):
+    """Test to retrieve the games with the most favorites."""
+    response = client.get("/favorites/games/top?limit=1")
+
+    assert response.status_code == 200
+    assert response.get_json()["games"] == [{"game_id": 2, "favorite_count": 2}]
+
+
+def test_get_most_favorited_games_invalid_limit(client: FlaskClient):
+    """Test that the limit of the most favored games is bounded."""
+    response = client.get("/favorites/games/top?limit=0")
+
+    assert response.status_code == 400
+
+
+def test_get_game_favoriters(client: FlaskClient):
+    """Test to retrieve the users who favor a game."""
+    response = client.get("/favorites/games/2/users")
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "game_id": 2,
+        "favorite_count": 2,
+        "user_ids": [1, 2],
+    }
+
+
+def test_get_recommendations(client: FlaskClient, recommender: RecommenderUpdater):
+    """Test to recommend games favored together with the user's favorites."""
+    client.post("/users/2/favorites", json={"game_id": 5})
+    recommender.compact()
+
+    response = client.get("/users/1/recommendations")
+
+    assert response.status_code == 200
+    assert response.get_json()["recommendations"][0]["game_id"] == 5
+
+
+def test_get_recommendations_not_enabled(client: FlaskClient):
+    """Test that recommendations are unavailable unless enabled."""
+    response = client.get("/users/1/recommendations")
+
+    assert response.status_code == 503
+
+
+def test_get_recommendations_user_not_found(
+    client: FlaskClient, recommender: RecommenderUpdater
+):
+    """Test to recommend games to a non-existent user."""
+    response = client.get("/users/9999/recommendations")
+
+    assert response.status_code == 404
+
+
+def test_recommendations_follow_favorite_changes(
+    client: FlaskClient, recommender: RecommenderUpdater
+):
+    """Test that favorite events update the recommendations without a rebuild."""
+    before = client.get("/users/2/recommendations").get_json()
+    client.post("/users/1/favorites/bulk", json={"remove": [4]})
+    recommender.process_pending()
+    after = client.get("/users/2/recommendations").get_json()
+
+    assert [game["game_id"] for game in before["recommendations"]] == [4]
+    assert after["recommendations"] == []
+
+
+def test_incremental_recommendations_match_rebuild(
+    client: FlaskClient, recommender: RecommenderUpdater
+):
+    """Test that a bulk change counts each pair of favorites once."""
+    client.post("/users/2/favorites/bulk", json={"add": [4], "remove": [2]})
+    recommender.process_pending()
+    incremental = client.get("/users/2/recommendations").get_json()
+    recommender.compact()
+    rebuilt = client.get("/users/2/recommendations").get_json()
+
+    assert incremental == rebuilt
+
+
+def test_queued_events_of_a_user_count_each_pair_once(
+    client: FlaskClient, recommender: RecommenderUpdater
+):
+    """Test that events of one user that queue up are applied like a rebuild."""
+    client.post("/users/2/favorites/bulk", json={"add": [30, 40]})
+    recommender.compact()
+
+    client.post("/users/1/favorites", json={"game_id": 30})
+    client.post("/users/1/favorites", json={"game_id": 40})
+    assert recommender.process_pending() == 2
+    incremental = get_recommender()
+    rebuilt = build_recommender()
+
+    def co_occurrence(recommender, game_id: int, other_game_id: int) -> float:
+        row = recommender._column(game_id)
+        slot = list(recommender.neighbor_columns[row]).index(
+            recommender._column(other_game_id)
+        )
+        return recommender.neighbor_co_occurrences[row, slot]
+
+    assert co_occurrence(incremental, 30, 40) == co_occurrence(rebuilt, 30, 40) == 2
+    assert co_occurrence(incremental, 40, 30) == 2
+
+
+def test_rebuild_includes_the_committed_events(
+    client: FlaskClient, recommender: RecommenderUpdater
+):
+    """Test that events written by any worker are applied once, or rebuilt."""
+    client.post("/users/1/favorites", json={"game_id": 30})
+    client.post("/users/2/favorites", json={"game_id": 30})
+
+    recommender.compact()
+
+    assert latest_favorite_event_id() == get_recommender().last_event_id > 0
+    assert recommender.process_pending() == 0
+
+
+def test_events_after_pruning_all_events_are_applied(
+    client: FlaskClient, recommender: RecommenderUpdater
+):
+    """Test that event IDs keep growing after the event table was emptied."""
+    client.post("/users/1/favorites", json={"game_id": 30})
+    assert recommender.process_pending() == 1
+    last_event_id = get_recommender().last_event_id
+
+    assert prune_favorite_events(time.time() + 1) == 1
+    client.post("/users/2/favorites", json={"game_id": 30})
+
+    assert latest_favorite_event_id() > last_event_id
+    assert recommender.process_pending() == 1
+    assert get_recommender().last_event_id == latest_favorite_event_id()
+
+
+def test_get_user_by_username(client: FlaskClient):
+    """Test to retrieve a user by the exact username."""
+    response = client.get("/users?username=Tom")
+    assert response.status_code == 200
+    assert response.get_json() == {"user_id": 1, "username": "Tom"}
+
+
+def test_get_user_by_username_not_found(client: FlaskClient):
+    """Test that usernames are matched exactly."""
+    response = client.get("/users?username=tom")
+    assert response.status_code == 404
+    assert response.get_json()["error"] == "User with username 'tom' not found"
+
+
+def test_search_users_ignores_case(client: FlaskClient):
+    """Test that the prefix matches usernames regardless of case."""
+    response = client.get("/users/search?prefix=tO")
+    response_data = response.get_json()
+    assert response.status_code == 200
+    assert response_data["users"] == [{"user_id": 1, "username": "Tom"}]
+    assert response_data["next_cursor"] is None
+
+
+def test_search_users_folds_only_ascii_like_the_index(client: FlaskClient):
+    """Test that non-ASCII letters of the prefix are matched as they are."""
+    client.post("/users", json={"username": "Ödön"})
+
+    matching = client.get("/users/search?prefix=ÖD").get_json()["users"]
+    other_case = client.get("/users/search?prefix=öd").get_json()["users"]
+
+    assert [user["username"] for user in matching] == ["Ödön"]
+    assert other_case == []
+
+
+def test_search_users_pages_with_cursor(client: FlaskClient):
+    """Test that the pages of a prefix search follow each other without gaps."""
+    for username in ["marco", "Mara", "Marc", "mar", "Mo"]:
+        client.post("/users", json={"username": username})
+
+    first = client.get("/users/search?prefix=MAR&limit=3").get_json()
+    cursor = first["next_cursor"]
+    second = client.get(f"/users/search?prefix=MAR&limit=3&cursor={cursor}")
+
+    usernames = [user["username"] for user in first["users"]]
+    usernames += [user["username"] for user in second.get_json()["users"]]
+    assert usernames == ["mar", "Mara", "Marc", "marco", "Mark"]
+    assert second.get_json()["next_cursor"] is None
+
+
+def test_search_users_invalid_cursor(client: FlaskClient):
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/users/search?prefix=a&cursor=garbage")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid cursor: 'garbage'."
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        '{"after":["a",true]}',
+        '{"after":["a",9223372036854775808]}',
+        r'{"after":["\ud800",1]}',
+    ],
+)
+def test_search_users_rejects_unusable_cursor_keys(client: FlaskClient, payload: str):
+    """Test that cursors with keys the database cannot compare are rejected."""
+    cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+
+    response = client.get(f"/users/search?prefix=a&cursor={cursor}")
+
+    assert response.status_code == 400
+
+
+def test_search_users_requires_prefix(client: FlaskClient):
+    """Test that the prefix parameter is required."""
+    response = client.get("/users/search")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "prefix is required"